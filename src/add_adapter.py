@@ -113,7 +113,7 @@ def main():
             adapter: Adapter = matching_adapters[0]
         elif len(matching_adapters) == 0:
             adapter: Adapter = adapter_class(symbol, asset_type)
-            collection.adapters.append(adapter)
+            collection.add(adapter)
         else:
             raise MultipleMatchingAdaptersException("Only one adapter is allowed to be defined given a symbol and a "
                                                     "value type. For symbol {} found {} adapters that support value "
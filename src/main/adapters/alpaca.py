@@ -18,13 +18,13 @@
 
 from datetime import datetime, timedelta
 from os import environ
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union, FrozenSet
 
 import pandas
 from alpaca.common import RawData
 from alpaca.data import StockBarsRequest, StockHistoricalDataClient, TimeFrame, BarSet
 
-from main.application.adapter import DataType, AssetType, Adapter, insert_column
+from main.application.adapter import DataType, AssetType, Adapter, insert_columns, get_first_column_without_header
 from main.application.argument import ArgumentKey
 from main.application.converter import Converter
 from main.application.time_interval import TimeInterval
@@ -67,14 +67,14 @@ class Alpaca(Adapter):
         return api_key
 
     def get_equities_list(self) -> List[str]:
+        return sorted(self.get_equities())
+
+    def get_equities(self) -> FrozenSet[str]:
         query = {
             "apikey":   self.api_key,
             "function": "LISTING_STATUS",
         }
-        data, data_file = self.get_url_response(self.url, query, cache=True, data_type=DataType.CSV)
-        data = data[1:]  # remove header
-        data = [item[0] for item in data]
-        return data
+        return self.get_symbol_listing(self.url, query, get_first_column_without_header, DataType.CSV)
 
     def get_prices_response(self, value_type: ValueType) -> None:
         # if self.asset_type is AssetType.DIGITAL_CURRENCY:
@@ -132,8 +132,9 @@ class Alpaca(Adapter):
         if to_translate.empty:
             raise RuntimeError(
                 "There is no data (length is 0) for key: '{}' (maybe try a different time interval)".format(key))
+        columns: Dict[ValueType, Tuple[List[datetime], List[float]]] = {}
         for converter in self.converters:
-            if converter.value_type in self.data:
+            if converter.value_type in self.data or converter.value_type in columns:
                 continue  # if we've already added this value type, then don't do it again
             if converter.value_type != value_type:
                 continue
@@ -151,7 +152,8 @@ class Alpaca(Adapter):
                     # value = value * ratio
                     indexes.append(entry_datetime.to_datetime64())
                     values.append(value)
-            insert_column(self.data, converter.value_type, indexes, values)
+            columns[converter.value_type] = (indexes, values)
+        self.data = insert_columns(self.data, columns)
 
     @staticmethod
     def validate_response(data_file, raw_response, expects_meta_data=True):
@@ -167,8 +169,6 @@ class Alpaca(Adapter):
         return indicator_key
 
     def delay_requests(self, data_file: str) -> None:
-        # request_limit_with_timedelta_delay(buffer=10, historic_requests=self.get_create_times(),
-        #                                    max_timeframe=timedelta(minutes=1), max_requests=5)
         pass
 
     def get_is_digital_currency(self):
@@ -187,8 +187,6 @@ class Alpaca(Adapter):
         # return self.symbol in data
 
     def get_is_physical_currency(self):
-        data, data_file = self.get_url_response("https://www.alphavantage.co/physical_currency_list", {},
-                                                cache=True, data_type=DataType.CSV, delay=False)
-        data = data[1:]  # remove header
-        data = [item[0] for item in data]
+        data = self.get_symbol_listing("https://www.alphavantage.co/physical_currency_list", {},
+                                       get_first_column_without_header, DataType.CSV, delay=False)
         return self.base_symbol in data
@@ -19,10 +19,10 @@ import logging
 import os
 from datetime import datetime, timedelta
 from os import environ
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, FrozenSet
 
 from main.application.adapter import DataType, AssetType, Adapter, get_response_value_or_none, \
-    IntervalNotSupportedException, insert_column, request_limit_with_timedelta_delay
+    IntervalNotSupportedException, insert_columns, get_first_column_without_header
 from main.application.argument import ArgumentKey
 from main.application.converter import Converter
 from main.application.time_interval import TimeInterval
@@ -153,6 +153,7 @@ class AlphaVantage(Adapter):
                 "your account from the alphavantage.co site.")
         api_key = environ.get('ALPHA_VANTAGE_API_KEY')
         super().__init__(symbol, asset_type)
+        self.max_requests = 5  # per minute
         self.api_key = api_key
         # script_dir = os.path.dirname(os.path.realpath(__file__))
         # cache_dir = os.path.join(script_dir, '..', '..', '..', '..', '.cache', AlphaVantage.name)
@@ -212,14 +213,14 @@ class AlphaVantage(Adapter):
         ]
 
     def get_equities_list(self) -> List[str]:
+        return sorted(self.get_equities())
+
+    def get_equities(self) -> FrozenSet[str]:
         query = {
             "apikey":   self.api_key,
             "function": "LISTING_STATUS",
         }
-        data, data_file = self.get_url_response(self.url, query, cache=True, data_type=DataType.CSV)
-        data = data[1:]  # remove header
-        data = [item[0] for item in data]
-        return data
+        return self.get_symbol_listing(self.url, query, get_first_column_without_header, DataType.CSV)
 
     def get_prices_response(self, value_type: ValueType) -> None:
         if self.asset_type is AssetType.DIGITAL_CURRENCY:
@@ -300,8 +301,9 @@ class AlphaVantage(Adapter):
         if not response_data[key]:
             raise RuntimeError(
                 "There is no data (length is 0) for key: {} (maybe try a different time interval)".format(key))
+        columns: Dict[ValueType, Tuple[List[datetime], List[float]]] = {}
         for converter in self.converters:
-            if converter.value_type in self.data:
+            if converter.value_type in self.data or converter.value_type in columns:
                 continue  # if we've already added this value type, then don't do it again
             if converter.value_type != value_type:
                 continue
@@ -320,7 +322,8 @@ class AlphaVantage(Adapter):
                     value = value * ratio
                 indexes.append(datetime.fromisoformat(entry_datetime))
                 values.append(value)
-            insert_column(self.data, converter.value_type, indexes, values)
+            columns[converter.value_type] = (indexes, values)
+        self.data = insert_columns(self.data, columns)
 
     def get_macd_response(self, value_type: ValueType) -> None:
         indicator_key = self.get_indicator_key()  # e.g. BTCUSD
@@ -392,8 +395,9 @@ class AlphaVantage(Adapter):
         if not response_data[key]:
             raise RuntimeError(
                 "There is no data (length is 0) for key: {} (maybe try a different time interval)".format(key))
+        columns: Dict[ValueType, Tuple[List[datetime], List[float]]] = {}
         for converter in self.converters:
-            if converter.value_type in self.data:
+            if converter.value_type in self.data or converter.value_type in columns:
                 continue  # if we've already added this value type, then don't do it again
             if converter.value_type != value_type:
                 continue
@@ -408,7 +412,8 @@ class AlphaVantage(Adapter):
                 if value is not None:
                     indexes.append(datetime.fromisoformat(entry['fiscalDateEnding']))
                     values.append(value)
-            insert_column(self.data, converter.value_type, indexes, values)
+            columns[converter.value_type] = (indexes, values)
+        self.data = insert_columns(self.data, columns)
         assert value_type in self.data, "Parsing response data failed, was adding column for value type '{}', but " \
                                         "no data was present after getting and parsing the response. Does the " \
                                         "converter have the correct keys/locations for the raw data?".format(value_type)
@@ -564,24 +569,15 @@ class AlphaVantage(Adapter):
             indicator_key = self.symbol + self.base_symbol  # e.g. BTCUSD
         return indicator_key
 
-    def delay_requests(self, data_file: str) -> None:
-        request_limit_with_timedelta_delay(buffer=10, historic_requests=self.get_create_times(),
-                                           max_timeframe=timedelta(minutes=1), max_requests=5)
-
     def get_is_digital_currency(self):
-        data, data_file = self.get_url_response("https://www.alphavantage.co/digital_currency_list", {},
-                                                cache=True, data_type=DataType.CSV, delay=False)
-        data = data[1:]  # remove header
-        data = [item[0] for item in data]
+        data = self.get_symbol_listing("https://www.alphavantage.co/digital_currency_list", {},
+                                       get_first_column_without_header, DataType.CSV, delay=False)
         return self.symbol in data
 
     def get_is_stock(self) -> bool:
-        data = self.get_equities_list()
-        return self.symbol in data
+        return self.symbol in self.get_equities()
 
     def get_is_physical_currency(self):
-        data, data_file = self.get_url_response("https://www.alphavantage.co/physical_currency_list", {},
-                                                cache=True, data_type=DataType.CSV, delay=False)
-        data = data[1:]  # remove header
-        data = [item[0] for item in data]
+        data = self.get_symbol_listing("https://www.alphavantage.co/physical_currency_list", {},
+                                       get_first_column_without_header, DataType.CSV, delay=False)
         return self.base_symbol in data
@@ -19,9 +19,9 @@
 import logging
 from datetime import datetime
 from os import environ
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Dict, Tuple
 
-from main.application.adapter import AssetType, Adapter, insert_column
+from main.application.adapter import AssetType, Adapter, insert_columns
 from main.application.argument import ArgumentKey
 from main.application.converter import Converter
 from main.application.value_type import ValueType
@@ -280,8 +280,9 @@ class Bitcoin(Adapter):
         if not response_data[key]:
             raise RuntimeError(
                 "There is no data (length is 0) for key: {} (maybe try a different time interval)".format(key))
+        columns: Dict[ValueType, Tuple[List[datetime], List[float]]] = {}
         for converter in self.converters:
-            if converter.value_type in self.data:
+            if converter.value_type in self.data or converter.value_type in columns:
                 continue  # if we've already added this value type, then don't do it again
             if converter.value_type != value_type:
                 continue
@@ -310,7 +311,8 @@ class Bitcoin(Adapter):
             #     #     value = value * ratio
             #     indexes.append(datetime.fromisoformat(entry_datetime))
             #     values.append(value)
-            insert_column(self.data, converter.value_type, indexes, values)
+            columns[converter.value_type] = (indexes, values)
+        self.data = insert_columns(self.data, columns)
 
     @staticmethod
     def validate_json_response(data_file, raw_response, expects_result=True):
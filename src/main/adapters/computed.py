@@ -0,0 +1,155 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import logging
+from typing import Optional, List, Dict, Tuple, Callable, Union
+
+import pandas
+
+from main.application.adapter import Adapter, AssetType, get_column, insert_columns
+from main.application.argument import Argument, ArgumentKey
+from main.application.converter import Converter
+from main.application.value_type import ValueType
+from main.calculators.indicator_cache import IndicatorCache
+from main.calculators.vectorized import calculate_sma, calculate_ema, calculate_rsi, calculate_macd
+
+MACD_VALUE_TYPES = [ValueType.MACD, ValueType.MACD_SIGNAL, ValueType.MACD_HIST]
+
+
+class ComputedAdapter(Adapter):
+    """
+    Calculates indicators (SMA, EMA, RSI and MACD) locally from the close prices of another adapter (the price adapter)
+    instead of requesting them from a provider. The close prices are retrieved through the price adapter so they come
+    from the same (cached) responses as the prices of the strategy, which means no extra requests are made no matter
+    how many indicator settings are used.
+
+    To use it register it for the indicator value types, e.g.:
+
+        portfolio.add_adapter_class(AlphaVantage)
+        portfolio.add_adapter_class(ComputedAdapter, ValueType.MACD)
+
+    When added through a Strategy the price adapter class is the adapter class used for ValueType.CLOSE (unless it was
+    already set).
+    """
+    price_adapter_class: Optional[type]
+    price_adapter: Optional[Adapter]
+
+    def __init__(self, symbol: str, asset_type: Optional[AssetType] = None, price_adapter_class: Optional[type] = None):
+        super().__init__(symbol, asset_type)
+        self.price_adapter_class = price_adapter_class
+        self.price_adapter = None
+        self.data_cache = False  # calculating is about as fast as reading the columns back
+        self.converters: List[Converter] = [
+            Converter(ValueType.SMA, self.get_sma_response, []),
+            Converter(ValueType.EMA, self.get_ema_response, []),
+            Converter(ValueType.RSI, self.get_rsi_response, []),
+            Converter(ValueType.MACD, self.get_macd_response, []),
+            Converter(ValueType.MACD_SIGNAL, self.get_macd_response, []),
+            Converter(ValueType.MACD_HIST, self.get_macd_response, []),
+        ]
+
+    def set_adapter_classes(self, adapter_classes: Dict[ValueType, type]) -> None:
+        if self.price_adapter_class is None:
+            self.price_adapter_class = adapter_classes.get(ValueType.CLOSE)
+
+    def get_price_adapter(self) -> Adapter:
+        """
+        Get the adapter that the close prices are retrieved through, it is configured the same way as this adapter
+        (symbol, interval, start and end times and cache key date) so it uses the same responses as the price adapter
+        of the strategy.
+        :return: The price adapter
+        """
+        if self.price_adapter is None:
+            if self.price_adapter_class is None:
+                raise RuntimeError("The price adapter class of the {} for {} is not set".format(
+                    self.__class__.__name__, self.symbol))
+            self.price_adapter = self.price_adapter_class(self.symbol, self.asset_type)
+            self.price_adapter.base_symbol = self.base_symbol
+            self.price_adapter.cache_key_date = self.cache_key_date
+            for argument_key in [ArgumentKey.INTERVAL, ArgumentKey.START_TIME, ArgumentKey.END_TIME]:
+                value = self.get_argument_value(argument_key)
+                if value is not None:
+                    self.price_adapter.add_argument(Argument(argument_key, value))
+            self.price_adapter.add_value_type(ValueType.CLOSE)
+        return self.price_adapter
+
+    def get_closes(self) -> pandas.Series:
+        price_adapter: Adapter = self.get_price_adapter()
+        if ValueType.CLOSE not in price_adapter.data:
+            price_adapter.add_all_columns()
+        return get_column(price_adapter.data, ValueType.CLOSE).dropna()
+
+    def get_period(self, argument_key: ArgumentKey) -> int:
+        period = self.get_argument_value(argument_key)
+        if period is None:
+            raise RuntimeError("Expected one {} argument for {} (for: {})".format(argument_key.name, self.symbol,
+                                                                                  self.__class__.__name__))
+        return int(period)
+
+    def add_computed_columns(self, columns: Dict[ValueType, pandas.Series]) -> None:
+        to_insert: Dict[ValueType, Tuple[pandas.Index, pandas.Series]] = {}
+        for value_type, column in columns.items():
+            if value_type in self.data:
+                continue
+            column = column.dropna()
+            to_insert[value_type] = (column.index, column.to_numpy())
+        logging.debug("Computed {} for {}".format(', '.join([str(value_type) for value_type in to_insert]),
+                                                  self.symbol))
+        self.data = insert_columns(self.data, to_insert)
+
+    def get_indicator(self, indicator: str, params: Tuple[int, ...],
+                      calculate: Callable[..., Union[pandas.Series, pandas.DataFrame]]):
+        """
+        Get the indicator calculated from the close prices, through the IndicatorCache so that an indicator with the
+        same parameters on the same prices is only calculated once no matter how many adapters (or strategies) use it.
+        :param indicator: The name of the indicator, e.g. 'sma'
+        :param params: The parameters of the indicator (passed to calculate after the close prices)
+        :param calculate: Calculates the indicator from the close prices and the parameters
+        :return: The indicator
+        """
+        closes: pandas.Series = self.get_closes()
+        return IndicatorCache.get_instance().get(self.symbol, self.get_argument_value(ArgumentKey.INTERVAL), closes,
+                                                 indicator, params, lambda: calculate(closes, *params))
+
+    def get_sma_response(self, value_type: ValueType) -> None:
+        self.add_computed_columns({value_type: self.get_indicator('sma', (self.get_period(ArgumentKey.SMA_PERIOD),),
+                                                                  calculate_sma)})
+
+    def get_ema_response(self, value_type: ValueType) -> None:
+        self.add_computed_columns({value_type: self.get_indicator('ema', (self.get_period(ArgumentKey.EMA_PERIOD),),
+                                                                  calculate_ema)})
+
+    def get_rsi_response(self, value_type: ValueType) -> None:
+        self.add_computed_columns({value_type: self.get_indicator('rsi', (self.get_period(ArgumentKey.RSI_PERIOD),),
+                                                                  calculate_rsi)})
+
+    def get_macd_response(self, value_type: ValueType) -> None:
+        params = (self.get_period(ArgumentKey.MACD_FAST), self.get_period(ArgumentKey.MACD_SLOW),
+                  self.get_period(ArgumentKey.MACD_SIGNAL))
+        columns: pandas.DataFrame = self.get_indicator('macd', params, calculate_macd)
+        self.add_computed_columns({column: columns[column] for column in MACD_VALUE_TYPES
+                                   if column in self.request_value_types or column == value_type})
+
+    def get_is_digital_currency(self) -> bool:
+        return self.get_price_adapter().get_is_digital_currency()
+
+    def get_is_stock(self) -> bool:
+        return self.get_price_adapter().get_is_stock()
+
+    def get_is_physical_currency(self) -> bool:
+        return self.get_price_adapter().get_is_physical_currency()
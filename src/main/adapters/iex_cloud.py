@@ -17,16 +17,14 @@
 # ------------------------------------------------------------------------------
 
 import logging
-import os.path
-import time
 from datetime import datetime, timedelta
 from enum import Enum
 from os import environ
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple, FrozenSet
 
 import pandas
 
-from main.application.adapter import AssetType, Adapter, insert_column
+from main.application.adapter import AssetType, Adapter, insert_columns
 from main.application.argument import ArgumentKey
 from main.application.converter import Converter
 from main.application.time_interval import TimeInterval
@@ -55,6 +53,7 @@ class IexCloud(Adapter):
                 "your account from the alphavantage.co site.")
         self.api_key = environ.get('IEX_CLOUD_API_KEY')
         super().__init__(symbol)
+        self.max_requests = 5  # per minute
         # script_dir = os.path.dirname(os.path.realpath(__file__))
         # cache_dir = os.path.join(script_dir, '..', '..', '..', '..', '.cache', IexCloud.name)
         # self.cache_root_dir = os.path.realpath(cache_dir)
@@ -121,12 +120,14 @@ class IexCloud(Adapter):
         return contains
 
     def get_equities_list(self):
+        return sorted(self.get_equities())
+
+    def get_equities(self) -> FrozenSet[str]:
         query = {
             "token": self.api_key,
         }
-        data, data_file = self.get_url_response('{}/ref-data/symbols'.format(self.url), query)
-        data = [item['symbol'] for item in data]
-        return data
+        return self.get_symbol_listing('{}/ref-data/symbols'.format(self.url), query,
+                                       lambda response: [item['symbol'] for item in response])
 
     def get_span(self, default: timedelta = timedelta(weeks=52)) -> timedelta:
         start_time: datetime = self.get_argument_value(ArgumentKey.START_TIME)
@@ -184,8 +185,9 @@ class IexCloud(Adapter):
     #     return translated
 
     def translate(self, response_data, value_type: ValueType, data_date_format='%Y-%m-%d'):
+        columns: Dict[ValueType, Tuple[List[datetime], List[float]]] = {}
         for converter in self.converters:
-            if converter.value_type in self.data:
+            if converter.value_type in self.data or converter.value_type in columns:
                 continue  # if we've already added this value type, then don't do it again
             if converter.value_type != value_type:
                 continue
@@ -200,7 +202,8 @@ class IexCloud(Adapter):
                 if value is not None:
                     indexes.append(datetime.strptime(entry['date'], data_date_format))
                     values.append(value)
-            insert_column(self.data, converter.value_type, indexes, values)
+            columns[converter.value_type] = (indexes, values)
+        self.data = insert_columns(self.data, columns)
         assert value_type in self.data, "Parsing response data failed, was adding column for value type '{}', but " \
                                         "no data was present after getting and parsing the response. Does the " \
                                         "converter have the correct keys/locations for the raw data?".format(value_type)
@@ -319,8 +322,9 @@ class IexCloud(Adapter):
             raise RuntimeError(
                 "There is no data (length is 0) for key: {} (maybe try a different time interval)".format(
                     chart_key))
+        columns: Dict[ValueType, Tuple[List[datetime], List[float]]] = {}
         for converter in self.converters:
-            if converter.value_type in self.data:
+            if converter.value_type in self.data or converter.value_type in columns:
                 continue  # if we've already added this value type, then don't do it again
             if converter.value_type != value_type:
                 continue
@@ -336,7 +340,8 @@ class IexCloud(Adapter):
                 if value is not None:
                     indexes.append(datetime.strptime(entry['date'], data_date_format))
                     values.append(value)
-            insert_column(adapter.data, converter.value_type, indexes, values)
+            columns[converter.value_type] = (indexes, values)
+        self.data = insert_columns(self.data, columns)
         assert value_type in self.data, "Parsing response data failed, was adding column for value type '{}', but " \
                                         "no data was present after getting and parsing the response. Does the " \
                                         "converter have the correct keys/locations for the raw data?".format(value_type)
@@ -370,8 +375,9 @@ class IexCloud(Adapter):
         if not response_data[key]:
             raise RuntimeError(
                 "There is no data (length is 0) for key: {} (maybe try a different time interval)".format(key))
+        columns: Dict[ValueType, Tuple[List[datetime], List[float]]] = {}
         for converter in self.converters:
-            if converter.value_type in self.data:
+            if converter.value_type in self.data or converter.value_type in columns:
                 continue  # if we've already added this value type, then don't do it again
             indexes = []
             values = []
@@ -384,7 +390,8 @@ class IexCloud(Adapter):
                 if value is not None:
                     indexes.append(datetime.strptime(entry['fiscalDateEnding'], data_date_format))
                     values.append(value)
-            insert_column(adapter.data, converter.value_type, indexes, values)
+            columns[converter.value_type] = (indexes, values)
+        self.data = insert_columns(self.data, columns)
 
     def get_income_response(self, value_type: ValueType):
         interval: TimeInterval = self.get_argument_value(ArgumentKey.INTERVAL)
@@ -427,7 +434,7 @@ class IexCloud(Adapter):
             if value is not None:
                 indexes.append(datetime.strptime(entry['fiscalDate'], data_date_format))
                 values.append(value)
-        insert_column(adapter.data, converter.value_type, indexes, values)
+        self.data = insert_columns(self.data, {converter.value_type: (indexes, values)})
 
     # def translate_income(self, response_data, key, data_date_format='%Y-%m-%d'):
     #     if key not in response_data:
@@ -469,8 +476,9 @@ class IexCloud(Adapter):
         if not response_data[key]:
             raise RuntimeError(
                 "There is no data (length is 0) for key: {} (maybe try a different time interval)".format(key))
+        columns: Dict[ValueType, Tuple[List[datetime], List[float]]] = {}
         for converter in self.converters:
-            if converter.value_type in self.data:
+            if converter.value_type in self.data or converter.value_type in columns:
                 continue  # if we've already added this value type, then don't do it again
             indexes = []
             values = []
@@ -483,7 +491,8 @@ class IexCloud(Adapter):
                 if value is not None:
                     indexes.append(datetime.strptime(entry['fiscalDate'], data_date_format))
                     values.append(value)
-            insert_column(adapter.data, converter.value_type, indexes, values)
+            columns[converter.value_type] = (indexes, values)
+        self.data = insert_columns(self.data, columns)
 
     def get_reported_financials_response(self, value_type: ValueType):
         interval: TimeInterval = self.get_argument_value(ArgumentKey.INTERVAL)
@@ -551,7 +560,7 @@ class IexCloud(Adapter):
                 indexes.append(instance)  # these are already the same
                 updates.append(updated)
                 values.append(value)
-        insert_column(adapter.data, converter.value_type, indexes, values)
+        self.data = insert_columns(self.data, {converter.value_type: (indexes, values)})
         # max_entries = 0
         # if converter.value_type in indexes:
         #     max_entries = max(max_entries, len(indexes))
@@ -568,8 +577,9 @@ class IexCloud(Adapter):
                                         "converter have the correct keys/locations for the raw data?".format(value_type)
 
     def translate_fundamentals(self, response_data, data_date_format='%Y-%m-%d'):
+        columns: Dict[ValueType, Tuple[List[datetime], List[float]]] = {}
         for converter in self.converters:
-            if converter.value_type in self.data:
+            if converter.value_type in self.data or converter.value_type in columns:
                 continue  # if we've already added this value type, then don't do it again
             indexes = []
             values = []
@@ -582,7 +592,8 @@ class IexCloud(Adapter):
                         ratio = self.get_adjusted_ratio(entry)
                         value = value * ratio
                         values.append(value)
-            insert_column(adapter.data, converter.value_type, indexes, values)
+            columns[converter.value_type] = (indexes, values)
+        self.data = insert_columns(self.data, columns)
 
     def calculate_eps(self):
         # Represents net income available to common basic EPS before extraordinaries for the period calculated as (
@@ -651,57 +662,17 @@ class IexCloud(Adapter):
             indicator_key = self.symbol + self.base_symbol  # e.g. BTCUSD
         return indicator_key
 
-    def delay_requests(self, data_file):
-        wait = True
-        while wait:
-            # NOTE: there is a race condition here if running multi-process...
-            #       files could be created between when you read their create times and return thus allowing more than
-            #       X (i.e. 5 for this adapter) requests per allotted timeframe (i.e. minute for this)
-            #       to fix this you could create yet another lock here, but for now we limit to 1 request at a time
-            #       and that elegantly fixes this as well as prevents us from hammering servers ;)
-            historic_requests: dict = self.get_create_times()
-            wait_list = []
-            now: datetime = datetime.now()
-            closest = now + timedelta(minutes=1)
-            for key, request_time in historic_requests.items():
-                reset_time = request_time + timedelta(minutes=1)
-                if reset_time > now:
-                    wait_list.append(key)
-                    if reset_time < closest:
-                        closest = reset_time
-            if len(wait_list) >= 5:
-                sleep = closest - now
-                buffer = 10 / 1000.0
-                sleep_in_s = buffer + sleep.seconds + sleep.microseconds / 1000000.0
-                logging.info('-- Waiting for: {} = closest:{} - now:{}'.format(sleep_in_s, closest, now))
-                # logging.info('MAP: {}'.format(json.dumps(self.historicRequests, indent=2, default=str)))
-                time.sleep(sleep_in_s)
-            else:
-                wait = False
-
-    def get_create_times(self):
-        cache_requests = {}
-        date_dir = os.path.join(self.cache_root_dir, self.cache_key_date.strftime('%Y%m%d'))
-        for filename in os.listdir(date_dir):
-            file_path = os.path.join(date_dir, filename)
-            if filename.startswith(".lock"):
-                continue
-            cache_requests[file_path] = datetime.fromtimestamp(os.stat(file_path).st_ctime)
-            # modTimesinceEpoc = os.path.getmtime(file_path)
-        return cache_requests
-
     def get_is_digital_currency(self):
         query = {"token": self.api_key}
-        data, data_file = self.get_url_response('{}/ref-data/crypto/symbols'.format(self.url), query)
-        data = [item['symbol'] for item in data]
+        data = self.get_symbol_listing('{}/ref-data/crypto/symbols'.format(self.url), query,
+                                       lambda response: [item['symbol'] for item in response])
         return '{}{}'.format(self.symbol, self.base_symbol) in data
 
     def get_is_stock(self) -> bool:
-        data = self.get_equities_list()
-        return self.symbol in data
+        return self.symbol in self.get_equities()
 
     def get_is_physical_currency(self):
         query = {"token": self.api_key}
-        data, data_file = self.get_url_response('{}/ref-data/fx/symbols'.format(self.url), query)
-        data = [item['code'] for item in data['currencies']]
+        data = self.get_symbol_listing('{}/ref-data/fx/symbols'.format(self.url), query,
+                                       lambda response: [item['code'] for item in response['currencies']])
         return self.base_symbol in data
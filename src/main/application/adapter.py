@@ -23,11 +23,10 @@ import logging
 import os.path
 import re
 import shutil
-import time
 from abc import ABCMeta
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple, Callable, FrozenSet, Iterable
 from urllib.parse import urlparse
 
 import numpy
@@ -38,8 +37,13 @@ from requests.auth import HTTPBasicAuth
 
 from main.application.argument import Argument, ArgumentKey
 from main.application.converter import Converter
+from main.application.shared_data import SharedData
 from main.application.value_type import ValueType
+from main.common.file_lock import FileLock
+from main.common.http_session import SessionPool
 from main.common.locations import file_link_format
+from main.common.rate_limiter import RateLimiter
+from main.common.symbol_directory import SymbolDirectory
 
 
 class ColumnAlreadyExistsException(RuntimeError):
@@ -178,68 +182,6 @@ def sort_data(data) -> None:
     data.sort_index(ascending=True, inplace=True)
 
 
-def request_limit_with_timedelta_delay(buffer: float, historic_requests: Dict[str, datetime],
-                                       max_timeframe: timedelta, max_requests: int) -> None:
-    """
-    Handles rate limitings by accepting max requests immediately, but not more than max requests within
-    the max timeframe.
-    :param buffer: How much extra time to add in seconds
-    :param historic_requests: Allows for pre-seed so that some requests can be ignored
-    :param max_timeframe: The timeframe for which the max requests are allowed
-    :param max_requests: The max number of requests allowed within the timeframe
-    :return:
-    """
-    wait = True
-    while wait:
-        # NOTE: there is a race condition here if running multi-process...
-        #       files could be created between when you read their create times and return thus allowing more than
-        #       X (i.e. 5 for this adapter) requests per allotted timeframe (i.e. minute for this)
-        #       to fix this you could create yet another lock here, but for now we limit to 1 request at a time
-        #       and that elegantly fixes this as well as prevents us from hammering servers ;)
-        now: datetime = datetime.now()
-        wait_list = filter_to_requests_in_time_limit(historic_requests, max_timeframe, now)
-        logging.info(
-            '-- Waiting on...\n{}'.format("\n".join([f"{item}: {historic_requests[item]}" for item in wait_list])))
-        if len(wait_list) >= max_requests:
-            times = [historic_requests[item] for item in wait_list]
-            oldest_time = min(times)
-            time_waited = now - oldest_time
-            sleep = max_timeframe - time_waited
-            sleep = 0 if sleep < timedelta(0) else sleep
-            buffer = 0
-            sleep_in_s = buffer + sleep.seconds + sleep.microseconds / 1000000.0
-            logging.info(
-                '-- Waiting for: {}s = wait:{} - (now:{} - next to expire:{})'.format(sleep_in_s, max_timeframe, now,
-                                                                                      oldest_time))
-            time.sleep(sleep_in_s)
-        # wait_list = []
-        # now: datetime = datetime.now()
-        # closest = now + max_timeframe
-        # for key, request_time in historic_requests.items():
-        #     reset_time = request_time + max_timeframe
-        #     if reset_time > now:
-        #         wait_list.append(key)
-        #         if reset_time < closest:
-        #             closest = reset_time
-        # if len(wait_list) >= max_requests:
-        #     times = [historic_requests[item] for item in wait_list]
-        #     oldest_time = min(times)
-        #     sleep = now - oldest_time
-        #     sleep_in_s = buffer + sleep.seconds + sleep.microseconds / 1000000.0
-        #     logging.info('-- Waiting for: {}s = closest:{} - now:{}'.format(sleep_in_s, oldest_time, now))
-        #     time.sleep(sleep_in_s)
-        else:
-            wait = False
-
-
-def filter_to_requests_in_time_limit(historic_requests, max_timeframe, now):
-    wait_list = []
-    for key, request_time in historic_requests.items():
-        if (now - request_time) < max_timeframe:
-            wait_list.append(key)
-    return wait_list
-
-
 def get_default_cache_key_date() -> datetime:
     """
     Get the default cache key date using a central function in case we decide to change this, it is in one place.
@@ -270,9 +212,8 @@ def find_closest_instance_after(data: pandas.DataFrame, instance: datetime) -> O
     if not data.index.is_monotonic_increasing:
         raise DataNotSortedException("Adapter find methods (working on DataFrames) expects data to be sorted, "
                                      "but it was not.")
-    indexes: numpy.ndarray = data.index.to_numpy()
-    all_after = indexes[numpy.where(indexes >= instance)]
-    closest: Optional[datetime] = all_after[0] if len(all_after) > 0 else None
+    position: int = data.index.searchsorted(instance, side='left')
+    closest: Optional[datetime] = data.index[position] if position < len(data.index) else None
     return closest
 
 
@@ -286,12 +227,42 @@ def find_closest_instance_before(data: pandas.DataFrame, instance: datetime) ->
     if not data.index.is_monotonic_increasing:
         raise DataNotSortedException("Adapter find methods (working on DataFrames) expects data to be sorted, "
                                      "but it was not.")
-    indexes: numpy.ndarray = data.index.to_numpy()
-    all_before = indexes[numpy.where(indexes <= instance)]
-    closest: Optional[datetime] = all_before[-1] if len(all_before) > 0 else None
+    position: int = data.index.searchsorted(instance, side='right') - 1
+    closest: Optional[datetime] = data.index[position] if position >= 0 else None
     return closest
 
 
+def find_closest_positions_before_else_after(data: pandas.DataFrame, times: List[datetime]) -> numpy.ndarray:
+    """
+    Resolve each of the times to the row offset (position) of the closest index on or before it, if none exist before
+    then the first row is used. This matches find_closest_before_else_after, but resolves all the times at once.
+    :param data: The (sorted) data to resolve the times against
+    :param times: The sorted times to resolve
+    :return: The row offsets (one per time) into the data
+    """
+    if not data.index.is_monotonic_increasing:
+        raise DataNotSortedException("Adapter find methods (working on DataFrames) expects data to be sorted, "
+                                     "but it was not.")
+    positions: numpy.ndarray = data.index.searchsorted(pandas.DatetimeIndex(times), side='right') - 1
+    return numpy.clip(positions, 0, None)
+
+
+def get_positions_between(data: pandas.DataFrame, after: Optional[datetime], before: Optional[datetime]) -> slice:
+    """
+    Find the rows with a time between two times (inclusive) by searching the index, in O(log N) with no copies.
+    :param data: The (sorted) data to search
+    :param after: The first time to include, None to start from the first row
+    :param before: The last time to include, None to end with the last row
+    :return: The row offsets (positions) of the rows between the times
+    """
+    if not data.index.is_monotonic_increasing:
+        raise DataNotSortedException("Adapter find methods (working on DataFrames) expects data to be sorted, "
+                                     "but it was not.")
+    start: int = 0 if after is None else int(data.index.searchsorted(after, side='left'))
+    end: int = len(data.index) if before is None else int(data.index.searchsorted(before, side='right'))
+    return slice(start, max(start, end))
+
+
 def get_all_times(data: pandas.DataFrame) -> pandas.Index:
     """
     Get the time (indexes) from the table (data frame)
@@ -427,30 +398,34 @@ def write_api_response_to_file(data_file, api, args, data_type):
         raise UnknownDataTypeException("Unrecognized data type: {}".format(data_type))
 
 
-def write_url_response_to_file(data_file: str, query: Dict[Any, Any], url) -> None:
+def write_url_response_to_file(data_file: str, query: Dict[Any, Any], url,
+                               session: Optional[requests.Session] = None) -> None:
     """
     Write a URL request's response to a file location on disk.
     :param data_file: The location of the file to save the URL request's response to
     :param query: The query parameters to be passed with the URL request
     :param url: The full URL with protocol and end-point
+    :param session: The session to send the request with (reusing its connections), else a new connection is used
     :return:
     """
     url_query = '' if not query else '?' + '&'.join(['%s=%s' % (key, value) for (key, value) in query.items()])
     url = '{}{}'.format(url, url_query)
     logging.debug('Requesting data from: {}'.format(url))
-    response = requests.get(url)
+    response = requests.get(url) if session is None else session.get(url)
     logging.debug('Received response: {}'.format(response))
     response.raise_for_status()
     with open(data_file, 'w') as fd:
         fd.write(response.text)
 
 
-def write_rpc_response_to_file(data_file: str, query: Dict[Any, Any], url, user, password) -> None:
+def write_rpc_response_to_file(data_file: str, query: Dict[Any, Any], url, user, password,
+                               session: Optional[requests.Session] = None) -> None:
     """
     Write a URL request's response to a file location on disk.
     :param data_file: The location of the file to save the URL request's response to
     :param query: The query parameters to be passed with the URL request
     :param url: The full URL with protocol and end-point
+    :param session: The session to send the request with (reusing its connections), else a new connection is used
     :return:
     """
     # url_query = '' if not query else '?' + '&'.join(['%s=%s' % (key, value) for (key, value) in query.items()])
@@ -463,7 +438,8 @@ def write_rpc_response_to_file(data_file: str, query: Dict[Any, Any], url, user,
     }
     auth = HTTPBasicAuth(user, password)
     logging.debug('Headers: {}'.format(headers))
-    response = requests.post(url, json=query, headers=headers, auth=auth)
+    post = requests.post if session is None else session.post
+    response = post(url, json=query, headers=headers, auth=auth)
     logging.debug('Received response: {} ({}, {})'.format(response,
                                                           response.reason,
                                                           response.json()))
@@ -475,28 +451,52 @@ def write_rpc_response_to_file(data_file: str, query: Dict[Any, Any], url, user,
         fd.write(response.text)
 
 
-def acquire_lock(lock_dir: str) -> bool:
+def write_data_cache_file(data_file: str, columns: pandas.DataFrame) -> bool:
     """
-    Attempts to acquire a lock via a semaphore directory else waits until it does acquire that lock.
-    This is how query collisions across multiple processes are prevented.
-    :param lock_dir: The lock directory that will be used to synchronize request across the multiple processes running.
-    :return:
+    Writes translated (parsed) columns to a columnar binary file, so that later runs can load the columns directly
+    instead of parsing and translating the raw response again. Each column is stored with its own index (only the rows
+    that have values), which keeps loading the columns into existing data the same as translating them was.
+    :param data_file: The location of the file to write, this is replaced atomically so readers never see partial data
+    :param columns: The columns to write, the index must be datetimes and the columns must be numeric ValueTypes
+    :return: True if the columns were written, False if they are not supported by the format (nothing is written)
     """
-    acquired_lock = False
-    while True:
-        if os.path.exists(lock_dir):
-            logging.debug("Waiting on lock: {}".format(lock_dir))
-            time.sleep(1)  # wait for other process to finish their query
-        else:
-            try:
-                logging.debug("Attempting to lock: {}".format(lock_dir))
-                os.makedirs(lock_dir)
-                logging.debug("Acquired lock: {}".format(lock_dir))
-                acquired_lock = True
-                break
-            except OSError:  # The OSError indicates that the directory already exists, so we ignore that and try again
-                pass
-    return acquired_lock
+    if not isinstance(columns.index, pandas.DatetimeIndex):
+        return False
+    arrays: Dict[str, numpy.ndarray] = {}
+    for column in columns.columns:
+        if not isinstance(column, ValueType) or not pandas.api.types.is_numeric_dtype(columns[column]):
+            return False
+        values: pandas.Series = columns[column].dropna()
+        arrays['index.{}'.format(column.name)] = values.index.to_numpy()
+        arrays[column.name] = values.to_numpy()
+    temp_file = '{}.{}.tmp'.format(data_file, os.getpid())
+    with open(temp_file, 'wb') as fd:
+        numpy.savez(fd, **arrays)
+    os.replace(temp_file, data_file)
+    return True
+
+
+def read_data_cache_file(data_file: str) -> Dict[ValueType, Tuple[pandas.DatetimeIndex, numpy.ndarray]]:
+    """
+    Reads the columns that were written with write_data_cache_file.
+    :param data_file: The location of the file to read
+    :return: The columns keyed by ValueType, with the index and values of each, ready to pass to insert_columns
+    """
+    columns: Dict[ValueType, Tuple[pandas.DatetimeIndex, numpy.ndarray]] = {}
+    with numpy.load(data_file, allow_pickle=False) as arrays:
+        for name in arrays.files:
+            if not name.startswith('index.'):
+                columns[ValueType[name]] = (pandas.DatetimeIndex(arrays['index.{}'.format(name)]), arrays[name])
+    return columns
+
+
+def get_first_column_without_header(data: List[List[str]]) -> List[str]:
+    """
+    Get the values of the first column of CSV data, e.g. the symbols of a listing.
+    :param data: The CSV rows, the first row is the header
+    :return: The first value of each row after the header
+    """
+    return [item[0] for item in data[1:]]
 
 
 def get_response_value_or_none(time_data: Dict[str, str], key: str) -> Optional[float]:
@@ -514,7 +514,8 @@ def get_response_value_or_none(time_data: Dict[str, str], key: str) -> Optional[
 def insert_column(data: pandas.DataFrame, column: Any,
                   indexes: List[Any], values: List[Any]) -> None:
     """
-    Inserts a new column of data into the underlying DataFrame
+    Inserts a new column of data into the underlying DataFrame, in place. Indexes that are not in the data yet are
+    added one at a time, so when the data can be replaced use insert_columns, which adds all columns at once.
     :param data: The DataFrame that will have the column inserted into it
     :param column: The column will be inserted under this ValueType label (i.e. column name)
     :param indexes: The indices of the data, these do not have to match with the existing indexes (e.g. datetimes)
@@ -532,6 +533,37 @@ def insert_column(data: pandas.DataFrame, column: Any,
                                            f"{data[data.index.duplicated(keep=False)]}")
 
 
+def insert_columns(data: pandas.DataFrame, columns: Dict[Any, Tuple[List[Any], List[Any]]]) -> pandas.DataFrame:
+    """
+    Inserts all the columns (e.g. everything translated from one response) into the data at once. Instead of growing
+    the data one index at a time, the columns are aligned with the existing data using a single outer concat, then
+    the result is sorted and checked for duplicates once.
+    :param data: The DataFrame that the columns will be added to, this is not modified
+    :param columns: The columns to add, keyed by label (e.g. ValueType) with the (index-aligned) indexes and values
+    :return: A new DataFrame with the existing data and the new columns, the new columns come first (as they would
+             if each was added with insert_column)
+    """
+    if not columns:
+        return data
+    to_concat: List[pandas.Series] = []
+    for column, (indexes, values) in reversed(list(columns.items())):
+        if column in data.columns:
+            raise ValueError(f"cannot insert {column}, already exists")
+        column_values = pandas.Series(values, index=indexes, name=column)
+        if column_values.index.has_duplicates:
+            raise DuplicateRawIndexesException(f"Indexes must be unique, yet found duplicates: "
+                                               f"{column_values[column_values.index.duplicated(keep=False)]}")
+        to_concat.append(column_values)
+    if data.index.has_duplicates:
+        raise DuplicateRawIndexesException(f"Indexes must be unique, yet found duplicates: "
+                                           f"{data[data.index.duplicated(keep=False)]}")
+    if len(data.columns) > 0:
+        to_concat.append(data)
+    combined: pandas.DataFrame = pandas.concat(to_concat, axis=1)
+    combined.sort_index(ascending=True, inplace=True)
+    return combined
+
+
 class Adapter(metaclass=ABCMeta):
     """
     Adapters are used to interface with 3rd party websites.
@@ -550,22 +582,42 @@ class Adapter(metaclass=ABCMeta):
     There is an option to not use the cache for things that must be retrieved every time like order status or real-time
     data.
     """
-    symbol: str
+    lookup_changes: int = 0  # changes to the symbol or requested value types of any adapter, see find_adapter
+    _symbol: str
     asset_type = Optional[AssetType]
     base_symbol: str
     cache_key_date: Optional[datetime]
     cache_key_filter: List[str]
     content_cache = Dict[str, Any]
     arguments: List[Argument]
-    data: pandas.DataFrame
+    _data: Optional[pandas.DataFrame]
     converters: List[Converter]
-    request_value_types: List[ValueType]
+    _request_value_types: List[ValueType]
     query_args: Dict[str, str]  # for things like macd_fast, macd_slow, macd_signal, etc.
     cache_root_dir: Optional[str]
+    data_cache: bool
+    cached_responses: List[bool]
+    shared_data: Optional[SharedData]
+    lock_per_request: bool
+    max_requests: Optional[int]
+    max_requests_timeframe: timedelta
+    session_pool_size: int
+    session_timeout: float
+    session_retries: int
+    session_backoff: float
 
     def add_extra_data(self, value_type, visualizer):
         pass
 
+    def set_adapter_classes(self, adapter_classes: Dict[ValueType, type]) -> None:
+        """
+        Called when a strategy creates the adapter, with the adapter classes of the portfolio, so that adapters which
+        retrieve their data through other adapters can use the same classes as the strategy.
+        :param adapter_classes: The adapter class for each value type
+        :return:
+        """
+        pass
+
     def __init__(self, symbol: str, asset_type: Optional[AssetType] = None):
         self.symbol = symbol
         self.base_symbol = 'USD'
@@ -575,7 +627,7 @@ class Adapter(metaclass=ABCMeta):
 
         self.asset_type = asset_type
         self.arguments = []
-        self.data = pandas.DataFrame()
+        self._data = None  # created when first used, as creating a DataFrame costs more than the rest of the adapter
 
         self.request_value_types = []
         self.query_args = {}
@@ -583,6 +635,48 @@ class Adapter(metaclass=ABCMeta):
         script_dir = os.path.dirname(os.path.realpath(__file__))
         cache_dir = os.path.join(script_dir, '..', '..', '..', '.cache', self.__class__.__name__)
         self.cache_root_dir = os.path.realpath(cache_dir)
+        self.data_cache = True
+        self.cached_responses = []
+        self.shared_data = None  # when set the data is attached from shared memory instead of being retrieved
+        self.lock_per_request = True
+        self.max_requests = None  # no rate limit
+        self.max_requests_timeframe = timedelta(minutes=1)
+        self.session_pool_size = 10
+        self.session_timeout = 30.0  # seconds
+        self.session_retries = 3  # on 429 and 5xx
+        self.session_backoff = 0.5  # seconds, doubled on each retry
+
+    @property
+    def data(self) -> pandas.DataFrame:
+        if self._data is None:
+            self._data = pandas.DataFrame()
+        return self._data
+
+    @data.setter
+    def data(self, data: pandas.DataFrame) -> None:
+        self._data = data
+
+    @property
+    def symbol(self) -> str:
+        return self._symbol
+
+    @symbol.setter
+    def symbol(self, symbol: str) -> None:
+        self._symbol = symbol
+        Adapter.lookup_changes += 1
+
+    @property
+    def request_value_types(self) -> List[ValueType]:
+        """
+        :return: The value types to retrieve, use add_value_type (or set the list) to change them so that the adapter
+                 lookup tables are rebuilt
+        """
+        return self._request_value_types
+
+    @request_value_types.setter
+    def request_value_types(self, request_value_types: List[ValueType]) -> None:
+        self._request_value_types = request_value_types
+        Adapter.lookup_changes += 1
 
     def __str__(self):
         return f"{self.__class__.__name__} adapter with {self.symbol} ({self.base_symbol}) {self.asset_type} (cache " \
@@ -591,6 +685,7 @@ class Adapter(metaclass=ABCMeta):
     def add_value_type(self, value_type: ValueType):
         if value_type not in self.request_value_types:
             self.request_value_types.append(value_type)
+            Adapter.lookup_changes += 1
 
     def add_all_columns(self):
         for value_type in self.request_value_types:
@@ -608,14 +703,42 @@ class Adapter(metaclass=ABCMeta):
         self.calculate_asset_type()  # we chose to delay the asset calculation, until we are already talking to the
         # server, can this just be set on the adapter, directly?
         converter = self.get_converter(value_type)
-        # Consider passing the converter so the function gets it. Without this 3rd party adapters will write one
-        # function per type, which might be a good thing, so perhaps we leave it? e.g.
-        # converter.get_response_callback(converter)
-        converter.get_response_callback(value_type)
+        data_file = self.get_data_cache_file(value_type)
+        if self.data_cache and os.path.exists(data_file):
+            logging.debug('Using cached data file: {}'.format(file_link_format(data_file)))
+            columns = read_data_cache_file(data_file)
+            self.data = insert_columns(self.data, {column: (indexes, values) for column, (indexes, values) in
+                                                   columns.items() if column not in self.data})
+        else:
+            existing_columns = list(self.data.columns)
+            self.cached_responses = []
+            # Consider passing the converter so the function gets it. Without this 3rd party adapters will write one
+            # function per type, which might be a good thing, so perhaps we leave it? e.g.
+            # converter.get_response_callback(converter)
+            converter.get_response_callback(value_type)
+            # only keep the translated data if everything it came from is cached (e.g. not real-time or order data)
+            if self.data_cache and self.cached_responses and all(self.cached_responses):
+                new_columns = [column for column in self.data.columns if column not in existing_columns]
+                if write_data_cache_file(data_file, self.data[new_columns]):
+                    logging.debug('Data saved to: {}'.format(file_link_format(data_file)))
         assert value_type in self.data, "Parsing response data failed, was adding column for value type " \
                                         f"'{value_type}', but no data was present after getting and parsing the " \
                                         "response. Does the converter have the correct keys/locations for the raw data?"
 
+    def get_data_cache_file(self, value_type: ValueType) -> str:
+        """
+        Get the file that the translated data for a value type is cached in. This lives next to the raw responses (in
+        the cache key date directory), and the name holds everything that the translated data depends on.
+        :param value_type: The value type that is being added
+        :return: The data cache file location
+        """
+        arguments = sorted(['{}={}'.format(argument.argument_key.name, argument.value) for argument in self.arguments])
+        query_args = ['{}={}'.format(key, value) for key, value in sorted(self.query_args.items())]
+        asset_type = None if self.asset_type is None else self.asset_type.name
+        data_key = sanitize_response('_'.join([str(item) for item in [self.symbol, self.base_symbol, asset_type,
+                                                                       value_type.name] + arguments + query_args]))
+        return os.path.join(self.get_cache_dir(), 'columns.{}.npz'.format(data_key))
+
     def get_converter(self, value_type):
         converters = [converter for converter in self.converters if value_type == converter.value_type]
         assert len(converters) == 1, "Found {} converters for value type '{}', one and only one converter is " \
@@ -626,12 +749,12 @@ class Adapter(metaclass=ABCMeta):
 
     def get_api_response(self, api, args, cache: bool = True, data_type: DataType = DataType.JSON) -> (Any, str):
         """
-        The data file will be generated by the current query. If the lock directory doesn't exist, then a check is
-        performed to see if the data file exists. If the data file does exist, then we have a cache hit, and we don't
-        need to wait nor do we need to acquire the lock. However, if the data file does not exist, then we need to
-        wait and try to acquire the lock. By trying to acquire the lock the current process will either be: 1. The
-        process that gets the lock and will create the cache the file 2. A process that waits on the lock directory,
-        and after it is acquired finds out the cache file was already created
+        The data file will be generated by the current query. A check is performed to see if the data file exists. If
+        the data file does exist, then we have a cache hit, and we don't need to wait nor do we need to acquire the
+        lock. However, if the data file does not exist, then we need to wait and try to acquire the lock. By trying to
+        acquire the lock the current process will either be: 1. The process that gets the lock and will create the
+        cache the file 2. A process that waits on the lock, and after it is acquired finds out the cache file was
+        already created
         :param api: The function (API) to be called
         :param args: The arguments to be passed into the function
         :param cache: A boolean defining if the cache should be used (True) or if the it should always be called (False)
@@ -640,26 +763,46 @@ class Adapter(metaclass=ABCMeta):
         """
         data_key = get_key_for_api_request(api, args)
         add_timestamp = not cache
-        cache_file, lock_dir = self.get_lock_dir_and_data_file(data_key, add_timestamp, data_type)
-        acquired_lock = False
-        try:
-            acquired_lock = False if os.path.exists(cache_file) else acquire_lock(lock_dir)
-            if not os.path.exists(cache_file):  # only download files once per data_id - includes cache_key (e.g.daily)
-                self.delay_requests(cache_file)
-                write_api_response_to_file(cache_file, api, args, data_type)
-                logging.debug('Data saved to: {} ({})'.format(file_link_format(cache_file), datetime.now()))
-            else:
-                logging.debug('Using cached file: {}'.format(file_link_format(cache_file)))
-        except Exception:
-            raise
-        finally:
-            if acquired_lock and os.path.exists(lock_dir):
-                logging.debug("Released lock: {}".format(lock_dir))
-                os.rmdir(lock_dir)
+        cache_file, lock_file = self.get_lock_file_and_data_file(data_key, add_timestamp, data_type)
+        self.write_cache_file(cache_file, lock_file, lambda data_file: write_api_response_to_file(data_file, api, args,
+                                                                                                   data_type))
         data = self.read_cache_file(cache_file, data_type, cache)
         self.validate_data(data)
+        self.cached_responses.append(cache)
         return data, cache_file
 
+    def write_cache_file(self, cache_file: str, lock_file: str, write_response: Callable[[str], None],
+                         delay: bool = True) -> None:
+        """
+        If the cache file doesn't exist then we have a cache miss, so the lock is acquired and the response is written
+        to the cache file. The lock is what prevents multiple processes from requesting the same data, if another
+        process was already writing the cache file, then once the lock is acquired the cache file is found to exist and
+        the request is skipped. The response is written to a temporary file and moved in place, so readers that don't
+        wait on the lock (because the cache file exists) never see a partially written file.
+        :param cache_file: The cache file location
+        :param lock_file: The lock file to hold while checking for and writing the cache file
+        :param write_response: The function that requests the data and writes the response to the file it is given
+        :param delay: If True, then the delay (i.e. rate limiting) is applied before requesting the data
+        :return:
+        """
+        if os.path.exists(cache_file):  # only download files once per data_id - includes cache_key (e.g.daily)
+            logging.debug('Using cached file: {}'.format(file_link_format(cache_file)))
+            return
+        with FileLock(lock_file):
+            if os.path.exists(cache_file):  # another process wrote the file while we were waiting on the lock
+                logging.debug('Using cached file: {}'.format(file_link_format(cache_file)))
+                return
+            if delay:
+                self.delay_requests(cache_file)
+            temp_file = '{}.{}.tmp'.format(cache_file, os.getpid())
+            try:
+                write_response(temp_file)
+                os.replace(temp_file, cache_file)
+            finally:
+                if os.path.exists(temp_file):
+                    os.remove(temp_file)
+            logging.debug('Data saved to: {} ({})'.format(file_link_format(cache_file), datetime.now()))
+
     def get_indicator_key(self):
         self.calculate_asset_type()
         indicator_key = self.symbol
@@ -670,50 +813,55 @@ class Adapter(metaclass=ABCMeta):
     def get_url_response(self, url, query, cache: bool = True, data_type: DataType = DataType.JSON, delay: bool = True):
         data_key = self.get_key_for_url_request(query, url)
         add_timestamp = not cache
-        cache_file, lock_dir = self.get_lock_dir_and_data_file(data_key, add_timestamp, data_type)
-        acquired_lock = False
-        try:
-            acquired_lock = False if os.path.exists(cache_file) else acquire_lock(lock_dir)
-            if not os.path.exists(cache_file):  # only download files once per data_id - includes cache_key (e.g.daily)
-                if delay:
-                    self.delay_requests(cache_file)
-                write_url_response_to_file(cache_file, query, url)
-                logging.debug('Data saved to: {} ({})'.format(file_link_format(cache_file), datetime.now()))
-            else:
-                logging.debug('Using cached file: {}'.format(file_link_format(cache_file)))
-        except Exception:
-            raise
-        finally:
-            if acquired_lock and os.path.exists(lock_dir):
-                os.rmdir(lock_dir)
+        cache_file, lock_file = self.get_lock_file_and_data_file(data_key, add_timestamp, data_type)
+        self.write_cache_file(cache_file, lock_file,
+                              lambda data_file: write_url_response_to_file(data_file, query, url, self.get_session()),
+                              delay)
         data = self.read_cache_file(cache_file, data_type, cache)
         self.validate_data(data)
+        self.cached_responses.append(cache)
         return data, cache_file
 
     def get_rpc_response(self, url, query, user, password, cache: bool = True, data_type: DataType = DataType.JSON,
                          delay: bool = True):
         data_key = self.get_key_for_url_request(query, url)
         add_timestamp = not cache
-        cache_file, lock_dir = self.get_lock_dir_and_data_file(data_key, add_timestamp, data_type)
-        acquired_lock = False
-        try:
-            acquired_lock = False if os.path.exists(cache_file) else acquire_lock(lock_dir)
-            if not os.path.exists(cache_file):  # only download files once per data_id - includes cache_key (e.g.daily)
-                if delay:
-                    self.delay_requests(cache_file)
-                write_rpc_response_to_file(cache_file, query, url, user, password)
-                logging.debug('Data saved to: {} ({})'.format(file_link_format(cache_file), datetime.now()))
-            else:
-                logging.debug('Using cached file: {}'.format(file_link_format(cache_file)))
-        except Exception:
-            raise
-        finally:
-            if acquired_lock and os.path.exists(lock_dir):
-                os.rmdir(lock_dir)
+        cache_file, lock_file = self.get_lock_file_and_data_file(data_key, add_timestamp, data_type)
+        self.write_cache_file(cache_file, lock_file,
+                              lambda data_file: write_rpc_response_to_file(data_file, query, url, user, password,
+                                                                           self.get_session()), delay)
         data = self.read_cache_file(cache_file, data_type, cache)
         self.validate_data(data)
+        self.cached_responses.append(cache)
         return data, cache_file
 
+    def get_session(self) -> requests.Session:
+        """
+        Get the session that is shared by all adapters of this class, so that connections are kept open and reused.
+        :return: The session to send URL and RPC requests with
+        """
+        return SessionPool.get_instance().get_session(self.__class__.__name__, self.session_pool_size,
+                                                      self.session_timeout, self.session_retries, self.session_backoff)
+
+    def get_symbol_listing(self, url, query, get_symbols: Callable[[Any], Iterable[str]],
+                           data_type: DataType = DataType.JSON, delay: bool = True) -> FrozenSet[str]:
+        """
+        Get the symbols of a listing (e.g. all listed stocks). Listings are loaded once per process and cache date,
+        then shared by all adapters through the SymbolDirectory, so checking if a symbol is listed is a set lookup.
+        :param url: The full URL with protocol and end-point of the listing
+        :param query: The query parameters to be passed with the URL request
+        :param get_symbols: Called with the response data to extract the symbols
+        :param data_type: The type of the response data
+        :param delay: If the request should be delayed (rate limited)
+        :return: The symbols in the listing
+        """
+        if self.cache_key_date is None:
+            self.cache_key_date = get_default_cache_key_date()
+        data_key = self.get_key_for_url_request(query, url)
+        symbols_file = os.path.join(self.get_cache_dir(), 'symbols.{}.txt'.format(data_key))
+        return SymbolDirectory.get_instance().get_symbols(symbols_file, lambda: get_symbols(
+            self.get_url_response(url, query, cache=True, data_type=data_type, delay=delay)[0]))
+
     def get_key_for_url_request(self, query, url):
         """
         NOTE: Some adapters (e.g. AlphaVantage) don't use a start and end time, and are fully controlled by interval.
@@ -758,21 +906,16 @@ class Adapter(metaclass=ABCMeta):
             self.content_cache[content_cache_key] = data
         return data
 
-    def get_lock_dir_and_data_file(self, data_key: str, timestamp: bool, data_type: DataType) -> (str, str):
+    def get_lock_file_and_data_file(self, data_key: str, timestamp: bool, data_type: DataType) -> (str, str):
         """
-        Get the lock directory and data file given the data key, time stamp, and data type.
-        :param data_key: The data key (string) to get the lock directory and data file for
-        :param timestamp: The timestamp to get the lock directory and data file for
-        :param data_type: The DataType to get the lock directory and data file for
-        :return: The (data_file, lock_dir) as calculated from the inputs
+        Get the data file and lock file given the data key, time stamp, and data type.
+        :param data_key: The data key (string) to get the lock file and data file for
+        :param timestamp: The timestamp to get the lock file and data file for
+        :param data_type: The DataType to get the lock file and data file for
+        :return: The (data_file, lock_file) as calculated from the inputs
         """
         self.cache_root_dir = os.path.realpath(self.cache_root_dir)
         self.clean_cache_dirs()
-        # only letting one query run at a time makes the file timestamps work, and doesn't hammer the servers
-        lock_dir = self.get_single_query_lock_dir()
-        # can be used to lock per request, but then race conditions exist with file timestamps
-        #       see AlphaVantageAdapter.delay_requests
-        # lock_dir = os.path.join(date_dir, '.lock_{}'.format(id))
         file_id = "{}.{}".format(data_key, datetime.now().strftime("%Y%m%d_%H%M%S_%f")) if timestamp else data_key
         if data_type == DataType.JSON:
             ext = 'json'
@@ -786,10 +929,15 @@ class Adapter(metaclass=ABCMeta):
         data_file = os.path.join(cache_dir, 'data.{}.{}'.format(file_id, ext))
         if not os.path.exists(cache_dir):
             os.makedirs(cache_dir)
-        return data_file, lock_dir
+        if self.lock_per_request:
+            lock_file = os.path.join(cache_dir, '.lock.{}'.format(os.path.basename(data_file)))
+        else:
+            # only letting one query run at a time doesn't hammer the servers
+            lock_file = self.get_single_query_lock_file()
+        return data_file, lock_file
 
-    def get_single_query_lock_dir(self):
-        return os.path.join(self.cache_root_dir, '.lock.single_query')
+    def get_single_query_lock_file(self):
+        return os.path.join(self.cache_root_dir, '.single_query.lock')
 
     def get_cache_dir(self):
         return os.path.join(self.cache_root_dir, self.cache_key_date.strftime('%Y%m%d'))
@@ -797,7 +945,8 @@ class Adapter(metaclass=ABCMeta):
     def clean_cache_dirs(self, keep: int = 3):
         if not os.path.exists(self.cache_root_dir):
             return
-        for filename in sorted(os.listdir(self.cache_root_dir))[:-keep]:
+        cache_dirs = [filename for filename in os.listdir(self.cache_root_dir) if not filename.startswith('.')]
+        for filename in sorted(cache_dirs)[:-keep]:
             path = os.path.join(self.cache_root_dir, filename)
             shutil.rmtree(path, ignore_errors=True)
 
@@ -813,10 +962,17 @@ class Adapter(metaclass=ABCMeta):
     def delay_requests(self, data_file: str) -> None:
         """
         Some APIs limit number of requests, this enables client requests for specific providers to match those limits.
+        Adapters set max_requests (per max_requests_timeframe) and all processes share the rate limit for the adapter.
         :param data_file:
         :return:
         """
-        pass
+        if self.max_requests is not None:
+            RateLimiter(self.get_rate_limit_file(), self.max_requests, self.max_requests_timeframe).acquire()
+
+    def get_rate_limit_file(self) -> str:
+        if not os.path.exists(self.cache_root_dir):
+            os.makedirs(self.cache_root_dir, exist_ok=True)
+        return os.path.join(self.cache_root_dir, '.rate_limit')
 
     # def get_sma_data(self, symbol, time_period, series_type):
     #     if symbol not in self.cachedData:
@@ -889,6 +1045,17 @@ class Adapter(metaclass=ABCMeta):
             value_type, instance)
         return self.data.loc[instance, value_type]
 
+    def get_value_at_position(self, position: int, value_type: ValueType) -> float:
+        """
+        Get a value using the row offset instead of the time (index) label.
+        :param position: The row offset into the data
+        :param value_type: The value type (column) to get the value from
+        :return: The value
+        """
+        assert value_type in self.data, 'The value type {} does not exist in the dataset for position: {}'.format(
+            value_type, position)
+        return self.data[value_type].to_numpy()[position]
+
     def get_all_values(self, value_type: ValueType) -> pandas.Series:
         return self.data[value_type]
 
@@ -896,17 +1063,38 @@ class Adapter(metaclass=ABCMeta):
         return self.data.loc[instance, :]
 
     def get_column_on_or_before(self, before: datetime, value_type: ValueType) -> pandas.Series:
-        filtered: pandas.DataFrame = self.data[self.data.index <= before]
-        return filtered[value_type] if value_type in filtered.columns else pandas.Series()
+        return self.get_column_between(None, before, value_type)
 
     def get_column_on_or_after(self, after: datetime, value_type: ValueType) -> pandas.Series:
-        filtered: pandas.DataFrame = self.data[self.data.index >= after]
-        return filtered[value_type] if value_type in filtered.columns else pandas.Series()
+        return self.get_column_between(after, None, value_type)
 
-    def get_column_between(self, after: datetime, before: datetime, value_type: ValueType) -> pandas.Series:
-        filtered: pandas.DataFrame = self.data[self.data.index >= after]
-        filtered = filtered[filtered.index <= before]
-        return filtered[value_type] if value_type in filtered.columns else pandas.Series()
+    def get_column_between(self, after: Optional[datetime], before: Optional[datetime],
+                           value_type: ValueType) -> pandas.Series:
+        """
+        Get the values of a column between two times (inclusive). The rows are found by searching the (sorted) index,
+        and the result is a view of the adapter data (not a copy) so it must not be modified.
+        :param after: The first time to include, None to start from the first row
+        :param before: The last time to include, None to end with the last row
+        :param value_type: The value type (column) to get the values from
+        :return: The values between the times, an empty Series if there is no such column
+        """
+        if value_type not in self.data.columns:
+            return pandas.Series(dtype=float)
+        return self.data[value_type].iloc[get_positions_between(self.data, after, before)]
+
+    def get_column_last(self, before: datetime, count: int, value_type: ValueType) -> pandas.Series:
+        """
+        Get the last values of a column up to a time (inclusive), e.g. the last few bars for a candle pattern. The
+        result is a view of the adapter data (not a copy) so it must not be modified.
+        :param before: The last time to include
+        :param count: The max number of values to get, fewer are returned if there are not enough rows before
+        :param value_type: The value type (column) to get the values from
+        :return: The (up to count) values on or before the time, an empty Series if there is no such column
+        """
+        if value_type not in self.data.columns:
+            return pandas.Series(dtype=float)
+        end: int = get_positions_between(self.data, None, before).stop
+        return self.data[value_type].iloc[max(end - count, 0):end]
 
     def retrieve(self, value_type: ValueType) -> None:
         converter: Converter = self.get_converter(value_type)
@@ -923,13 +1111,3 @@ class Adapter(metaclass=ABCMeta):
         values = list(set([argument.value for argument in self.arguments if argument.argument_key == arg_type]))
         return values[0] if len(values) == 1 else None
 
-    def get_create_times(self) -> Dict[str, datetime]:
-        cache_requests = {}
-        date_dir = os.path.join(self.cache_root_dir, self.cache_key_date.strftime('%Y%m%d'))
-        for filename in os.listdir(date_dir):
-            if filename.startswith(".lock"):
-                continue
-            file_path = os.path.join(date_dir, filename)
-            cache_requests[file_path] = datetime.fromtimestamp(os.stat(file_path).st_ctime)
-            # modTimesinceEpoc = os.path.getmtime(file_path)
-        return cache_requests
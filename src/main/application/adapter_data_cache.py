@@ -0,0 +1,110 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+from typing import OrderedDict as OrderedDictType
+
+import pandas
+
+from main.application.adapter import Adapter, AssetType
+
+
+def get_adapter_data_key(adapter: Adapter) -> Optional[Tuple[str, ...]]:
+    """
+    Get the key of the data an adapter retrieves, this is the data cache files of its requested value types, which
+    hold everything the data depends on (the adapter class, symbol, arguments, cache key date, etc.).
+    :param adapter: The adapter to get the key for
+    :return: The key, or None if the data of the adapter is not cached (e.g. computed or real-time data)
+    """
+    if not adapter.data_cache or adapter.cache_key_date is None or not adapter.request_value_types:
+        return None
+    return tuple([adapter.get_data_cache_file(value_type) for value_type in adapter.request_value_types])
+
+
+class AdapterDataCache:
+    """
+    Is singleton (per process) so that the data retrieved by an adapter can be reused by later adapters that retrieve
+    the same data in the same process, e.g. when a worker runs many strategies on the same symbol. The data is kept for
+    the max_entries most recently used keys, it is disabled (0) unless a max is set.
+    """
+    instance = None
+    pid: int
+    max_entries: int
+    entries: OrderedDictType[Tuple[str, ...], Tuple[Optional[AssetType], pandas.DataFrame]]
+    hits: int
+    misses: int
+    mutex: threading.Lock
+
+    def __init__(self):
+        raise RuntimeError('Use get_instance() instead')
+
+    @classmethod
+    def get_instance(cls):
+        if cls.instance is None or cls.instance.pid != os.getpid():
+            cls.instance = cls.__new__(cls)
+            cls.instance.pid = os.getpid()
+            cls.instance.max_entries = 0
+            cls.instance.entries = OrderedDict()
+            cls.instance.hits = 0
+            cls.instance.misses = 0
+            cls.instance.mutex = threading.Lock()
+        return cls.instance
+
+    def retrieve(self, adapter: Adapter) -> None:
+        """
+        Retrieve the data for all the columns of the adapter, reusing the data if it was already retrieved.
+        :param adapter: The adapter to retrieve the data for
+        :return:
+        """
+        key = get_adapter_data_key(adapter) if self.max_entries > 0 else None
+        if key is None:
+            adapter.add_all_columns()
+            return
+        with self.mutex:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.entries.move_to_end(key)
+                self.hits += 1
+        if entry is not None:
+            logging.debug('Reusing data retrieved in this process for: {}'.format(adapter))
+            adapter.asset_type, data = entry
+            adapter.data = data.copy()
+            return
+        adapter.add_all_columns()
+        if all(adapter.cached_responses):  # only keep the data if the responses it came from were cached
+            with self.mutex:
+                self.entries[key] = (adapter.asset_type, adapter.data.copy())
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+
+    def get_hit_rate(self) -> float:
+        with self.mutex:
+            total = self.hits + self.misses
+            return 0.0 if total == 0 else self.hits / total
+
+    def reset(self) -> None:
+        with self.mutex:
+            self.entries = OrderedDict()
+            self.hits = 0
+            self.misses = 0
@@ -28,6 +28,7 @@ class ArgumentKey(Enum):
     RSI_PERIOD = auto()
     # SMA_INTERVAL = auto()
     SMA_PERIOD = auto()
+    EMA_PERIOD = auto()
     MACD_SLOW = auto()
     MACD_FAST = auto()
     MACD_SIGNAL = auto()
@@ -44,6 +45,7 @@ def get_argument_type(argument_key: ArgumentKey):
         ArgumentKey.END_TIME: datetime,
         ArgumentKey.RSI_PERIOD: float,
         ArgumentKey.SMA_PERIOD: float,
+        ArgumentKey.EMA_PERIOD: float,
         ArgumentKey.MACD_SLOW: float,
         ArgumentKey.MACD_FAST: float,
         ArgumentKey.MACD_SIGNAL: float,
@@ -18,6 +18,9 @@
 
 import inspect
 from abc import ABCMeta, abstractmethod
+from typing import Optional
+
+from main.calculators.rolling_window import RollingWindow
 
 
 class Calculator(metaclass=ABCMeta):
@@ -31,3 +34,51 @@ class Calculator(metaclass=ABCMeta):
     @abstractmethod
     def calc(self, prices_list):
         raise NotImplementedError("Implement: {}".format(inspect.currentframe().f_code.co_name))
+
+
+class IncrementalCalculator(Calculator, metaclass=ABCMeta):
+    """
+    Indicator that can also be updated one value (bar) at a time. The rolling state (e.g. running sums, the values in
+    the window) is kept between updates, so each update is O(1) instead of recalculating over a list of prices.
+    """
+
+    @abstractmethod
+    def update(self, value: float) -> Optional[float]:
+        """
+        Add the newest value.
+        :param value: The newest value (e.g. the close of the latest bar)
+        :return: The same as calc would return for all of the values so far (the newest first), i.e. None until there
+                 are enough values
+        """
+        raise NotImplementedError("Implement: {}".format(inspect.currentframe().f_code.co_name))
+
+    @abstractmethod
+    def reset(self) -> None:
+        """
+        Drop all of the values (and rolling state) added with update.
+        :return:
+        """
+        raise NotImplementedError("Implement: {}".format(inspect.currentframe().f_code.co_name))
+
+
+class RollingAverageCalculator(IncrementalCalculator, metaclass=ABCMeta):
+    """
+    Incremental indicator that is the average of the last length values, the values are kept in a RollingWindow so each
+    update is O(1).
+    """
+    averaging_length: float
+    window: RollingWindow
+
+    def __init__(self, length: float):
+        """
+        :param length: The number of values to average
+        """
+        self.averaging_length = length
+        self.window = RollingWindow(length)
+
+    def update(self, value: float) -> Optional[float]:
+        self.window.append(value)
+        return self.window.total / self.window.length if self.window.is_full() else None
+
+    def reset(self) -> None:
+        self.window.clear()
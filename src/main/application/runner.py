@@ -28,7 +28,10 @@ from typing import Dict, Any, Optional, Type, List
 import yaml
 
 from main.application.adapter import AssetType
+from main.calculators.indicator_cache import IndicatorCache
 from main.common.locations import Locations, file_link_format, get_and_clean_timestamp_dir
+from main.common.file_lock import LockMetrics
+from main.common.http_session import SessionPool
 from main.common.profiler import Profiler
 from main.common.report import Report
 
@@ -95,6 +98,9 @@ class Runner(metaclass=ABCMeta):
             # profile_log = os.path.join(cache_dir, 'profile.log')
             Profiler.get_instance().disable_and_report()
             Profiler.get_instance().dump_stats()
+            LockMetrics.get_instance().report()
+            SessionPool.get_instance().report()
+            IndicatorCache.get_instance().report()
         return success
 
     @abstractmethod
@@ -141,6 +147,16 @@ def get_adapter_class(class_name: str) -> Type:
     return adapter_class
 
 
+def get_portfolio_class(class_name: str) -> Type:
+    """
+    Converts a string representation of a portfolio class (e.g. ArrayPortfolio) into the portfolio class.
+    :param class_name: The string representation of the class
+    :return: The class type
+    """
+    module = importlib.import_module(f'main.portfolio.{Report.camel_to_snake(class_name)}')
+    return getattr(module, class_name)
+
+
 def get_asset_type_overrides(asset_type_overrides: Dict[str, str]) -> Dict[str, AssetType]:
     """
     Converts a dictionary of symbol string paired with AssetType string representations into a dictionary of symbol
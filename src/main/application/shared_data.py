@@ -0,0 +1,148 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import logging
+from datetime import tzinfo
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional, List, Any
+
+import numpy
+import pandas
+from pandas.core.dtypes.dtypes import DatetimeTZDtype
+
+
+class SharedData:
+    """
+    A handle to the data of an adapter that is held in shared memory. The handle is small, so it is cheap to send to
+    worker processes, and each worker attaches to the same memory instead of loading its own copy of the data.
+
+    The shared memory holds the times (as int64 nanoseconds) followed by the values of each column (as float64), so
+    the DataFrame that is attached is a read-only view of the shared memory, nothing is copied. Writing to it raises a
+    ValueError (instead of changing the data of every other process), so code that modifies the values of the data
+    (or of the columns taken from it) has to copy them first. Adding or replacing whole columns is fine, as that
+    creates new arrays.
+    """
+    name: str
+    rows: int
+    columns: List[Any]
+    index_name: Optional[str]
+    tz: Optional[tzinfo]
+    memory: Optional[SharedMemory]
+
+    def __init__(self, name: str, rows: int, columns: List[Any], index_name: Optional[str], tz: Optional[tzinfo]):
+        self.name = name
+        self.rows = rows
+        self.columns = columns
+        self.index_name = index_name
+        self.tz = tz
+        self.memory = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['memory'] = None  # each process attaches to the shared memory itself
+        return state
+
+    def get_size(self) -> int:
+        return numpy.dtype(numpy.int64).itemsize * self.rows * (len(self.columns) + 1)
+
+    def get_arrays(self) -> (numpy.ndarray, numpy.ndarray):
+        """
+        :return: (times, values) Views of the shared memory, the values are one row per column
+        """
+        times = numpy.ndarray((self.rows,), dtype=numpy.int64, buffer=self.memory.buf)
+        values = numpy.ndarray((len(self.columns), self.rows), dtype=numpy.float64, buffer=self.memory.buf,
+                               offset=times.nbytes)
+        return times, values
+
+    def attach(self) -> pandas.DataFrame:
+        """
+        Attach to the shared memory (the first time) and get the data.
+
+        Attaching registers the memory with the resource tracker (on Python < 3.13), it is not unregistered here as
+        the workers of a multiprocessing pool share the resource tracker of the process that created the memory, so
+        unregistering it would also drop the registration of the creator (and the tracker would report an error when
+        the creator unlinks it). The memory is only unlinked by the SharedDataStore that created it.
+        :return: A DataFrame backed by the shared memory, its values cannot be written to
+        """
+        if self.memory is None:
+            self.memory = SharedMemory(name=self.name)
+        times, values = self.get_arrays()
+        times.flags.writeable = False
+        values.flags.writeable = False
+        dtype = numpy.dtype('M8[ns]') if self.tz is None else DatetimeTZDtype(tz=self.tz)
+        index = pandas.DatetimeIndex(pandas.arrays.DatetimeArray(times.view('M8[ns]'), dtype=dtype),
+                                     name=self.index_name)
+        return pandas.DataFrame(values.T, index=index, columns=self.columns, copy=False)
+
+
+class SharedDataStore:
+    """
+    Owns the shared memory that data is published to, the memory is released (unlinked) when the store is released, so
+    the store should outlive every process that attaches to it.
+
+        with SharedDataStore() as store:
+            shared_data = store.publish(adapter.data)
+            ...
+    """
+    shared: List[SharedData]
+
+    def __init__(self):
+        self.shared = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def publish(self, data: pandas.DataFrame) -> Optional[SharedData]:
+        """
+        Copy the data into shared memory.
+        :param data: The data to share, the index must be datetimes and the columns must be floats
+        :return: The handle to the shared data, or None if the data is not supported (nothing is shared)
+        """
+        if data.empty or not isinstance(data.index, pandas.DatetimeIndex) or data.columns.has_duplicates:
+            return None
+        if not all([pandas.api.types.is_float_dtype(dtype) for dtype in data.dtypes]):
+            return None
+        shared_data = SharedData('', len(data.index), list(data.columns), data.index.name, data.index.tz)
+        shared_data.memory = SharedMemory(create=True, size=shared_data.get_size())
+        shared_data.name = shared_data.memory.name
+        times, values = shared_data.get_arrays()
+        times[:] = data.index.asi8
+        values[:] = data.to_numpy(dtype=numpy.float64).T
+        del times, values  # the memory cannot be closed while there are views of it
+        self.shared.append(shared_data)
+        logging.debug('Shared {} rows of {} in: {}'.format(shared_data.rows, shared_data.columns, shared_data.name))
+        return shared_data
+
+    def get_size(self) -> int:
+        """
+        :return: The total size (in bytes) of the shared data
+        """
+        return sum([shared_data.get_size() for shared_data in self.shared])
+
+    def release(self) -> None:
+        for shared_data in self.shared:
+            memory, shared_data.memory = shared_data.memory, None
+            memory.unlink()
+            try:
+                memory.close()
+            except BufferError:  # still attached in this process, it is unmapped once the last view is gone
+                pass
+        self.shared = []
@@ -34,9 +34,14 @@
 #
 #
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple, Callable
 
+import pandas
+
+from main.application.argument import ArgumentKey
 from main.application.strategy import Strategy
+from main.application.value_type import ValueType
+from main.calculators.indicator_cache import IndicatorCache, Indicator
 from main.portfolio.portfolio import Portfolio
 
 
@@ -53,6 +58,21 @@ class SingleSymbolStrategy(Strategy):
         # string += "" if self.portfolio.end_time is None else " ending {}".format(self.portfolio.end_time)
         return string
 
+    def get_indicator(self, values: pandas.Series, indicator: str, params: Tuple,
+                      calculate: Callable[..., Indicator]) -> Indicator:
+        """
+        Get an indicator of the values (e.g. closes) of the symbol through the IndicatorCache, so that strategies that
+        use the same indicator on the same values (e.g. a sweep over the other parameters) only calculate it once.
+        :param values: The values to calculate the indicator from
+        :param indicator: The name of the indicator, e.g. 'sma'
+        :param params: The parameters of the indicator (passed to calculate after the values)
+        :param calculate: Calculates the indicator from the values and the parameters
+        :return: The indicator
+        """
+        interval = self.collection.get_adapter(self.symbol, ValueType.CLOSE).get_argument_value(ArgumentKey.INTERVAL)
+        return IndicatorCache.get_instance().get(self.symbol, interval, values, indicator, params,
+                                                 lambda: calculate(values, *params))
+
     def build_price_collection(self, cache_key_date: Optional[datetime] = None):
         self.add_price_collection(self.symbol, cache_key_date)
 
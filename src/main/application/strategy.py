@@ -72,14 +72,14 @@ class Strategy:
         # key_date = self.portfolio.end_time if self.portfolio.end_time is not None else datetime.now(TimeZones.get_tz())
         set_all_cache_key_dates(self.collection.adapters, key_date)
         self.collection.retrieve_all_data()
+        self.prepare()
         self.portfolio.set_remaining_times(self.collection)
         logging.info("-- Starting strategy: {}".format(self))
         while True:
-            remaining_times = self.portfolio.get_remaining_times()
-            if not remaining_times:
+            if not self.portfolio.has_remaining_times():
                 logging.info("No more dates left - ending")
                 break
-            current_time = remaining_times[0]
+            current_time = self.portfolio.get_present_time(self.collection)
             self.portfolio.run_to(self.collection, current_time)
             self.next_step(current_time)
         self.portfolio.summarize()
@@ -88,6 +88,14 @@ class Strategy:
     def add_collections(self) -> None:
         raise RuntimeError("Implement: {}".format(inspect.currentframe().f_code.co_name))
 
+    def prepare(self) -> None:
+        """
+        Called once after the data is retrieved and before the first step, override this to work on all of the data up
+        front, e.g. to calculate an indicator column once instead of recalculating it on every step.
+        :return:
+        """
+        pass
+
     def next_step(self, current_time: datetime) -> None:
         raise RuntimeError("Implement: {}".format(inspect.currentframe().f_code.co_name))
 
@@ -127,9 +135,10 @@ class Strategy:
         elif len(matching_adapters) == 0:
             adapter: Adapter = adapter_class(symbol, asset_type)
             # adapter.add_value_type(value_type)
+            adapter.set_adapter_classes(self.portfolio.adapter_classes)
             if cache_key_date is not None:
                 adapter.cache_key_date = cache_key_date
-            self.collection.adapters.append(adapter)
+            self.collection.add(adapter)
         else:
             raise MultipleMatchingAdaptersException("Only one adapter is allowed to be defined given a symbol and a "
                                                     "value type. For symbol {} found {} adapters that support value "
@@ -170,6 +179,17 @@ class Strategy:
             adapter.arguments.append(Argument(ArgumentKey.SMA_PERIOD, period))
             adapter.add_value_type(value_type)
 
+    def add_ema_collection(self, symbol: str, period: float, cache_key_date: Optional[datetime] = None) -> None:
+        asset_type = self.collection.asset_type_overrides[symbol] if symbol in \
+                                                                     self.collection.asset_type_overrides else None
+        adapter_class = self.portfolio.get_adapter_class(ValueType.EMA)
+        adapter: Adapter = self.get_adapter(symbol, adapter_class, ValueType.EMA, asset_type, cache_key_date)
+        adapter.arguments.append(Argument(ArgumentKey.INTERVAL, self.portfolio.interval))
+        adapter.arguments.append(Argument(ArgumentKey.START_TIME, self.portfolio.start_time))
+        adapter.arguments.append(Argument(ArgumentKey.END_TIME, self.portfolio.end_time))
+        adapter.arguments.append(Argument(ArgumentKey.EMA_PERIOD, period))
+        adapter.add_value_type(ValueType.EMA)
+
     def add_macd_collection(self, symbol, slow, fast, signal, cache_key_date: Optional[datetime] = None):
         asset_type = self.collection.asset_type_overrides[symbol] if symbol in \
                                                                      self.collection.asset_type_overrides else None
@@ -0,0 +1,121 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+from datetime import datetime
+from typing import Optional, Dict, Callable, Tuple, Any
+
+import numpy
+
+from main.application.adapter_collection import NotExactlyOneAdapterException
+from main.application.strategy import Strategy
+from main.application.value_type import ValueType
+from main.portfolio.trade_journal import TradeJournal
+
+
+class StrategySummary:
+    """
+    The results of a strategy run, without the data that was used to run it (i.e. the adapters and their responses),
+    so it is small enough to be sent back from a worker process cheaply. It has what the runners report on: the
+    titles, the CAGR and ROI, the value of the portfolio for each completed time, the times of the data and the trade
+    journal.
+
+    The full strategy is only materialized on request (e.g. for the Visualizer) by running it again in this process,
+    which reads the same (cached) responses as the worker did.
+    """
+    title: str
+    portfolio_title: str
+    portfolio_description: str
+    cagr: float
+    roi: float
+    times: numpy.ndarray
+    values: numpy.ndarray
+    first_completed_date: Optional[str]
+    last_completed_date: Optional[str]
+    data_times: Dict[str, Tuple[Optional[datetime], Optional[datetime]]]
+    journal: TradeJournal
+    run: Optional[Tuple[Callable[..., Strategy], Tuple[Any, ...]]]
+    strategy: Optional[Strategy]
+
+    def __init__(self, strategy: Strategy):
+        """
+        :param strategy: The strategy that was run
+        """
+        portfolio = strategy.portfolio
+        self.title = str(strategy)
+        self.portfolio_title = portfolio.title
+        self.portfolio_description = str(portfolio)
+        self.cagr = portfolio.calculate_cagr()
+        self.roi = portfolio.calculate_roi()
+        data = portfolio.data
+        self.times = data.index.to_numpy()
+        self.values = data[ValueType.CLOSE.value].to_numpy(dtype=float) if not data.empty else numpy.empty(0)
+        self.first_completed_date = portfolio.get_first_completed_date()
+        self.last_completed_date = portfolio.get_last_completed_date()
+        self.data_times = {}
+        for symbol in strategy.collection.get_symbols():
+            try:
+                self.data_times[symbol] = (strategy.collection.get_start_time(symbol, ValueType.CLOSE),
+                                           strategy.collection.get_end_time(symbol, ValueType.CLOSE))
+            except NotExactlyOneAdapterException:
+                continue
+        self.journal = portfolio.journal
+        self.run = None
+        self.strategy = None
+
+    def __str__(self):
+        return self.title
+
+    def has_results(self) -> bool:
+        return len(self.values) > 0
+
+    def get_start_time(self, symbol: str) -> Optional[datetime]:
+        return self.data_times.get(symbol, (None, None))[0]
+
+    def get_end_time(self, symbol: str) -> Optional[datetime]:
+        return self.data_times.get(symbol, (None, None))[1]
+
+    def set_run(self, function: Callable[..., Strategy], args: Tuple[Any, ...]) -> None:
+        """
+        Set how to run the strategy again, so that it can be materialized.
+        :param function: The function that runs the strategy (and returns it), e.g. strategy.run
+        :param args: The arguments to the function
+        :return:
+        """
+        self.run = (function, args)
+
+    def get_strategy(self) -> Strategy:
+        """
+        Get the full strategy (with its collection and portfolio), running it in this process the first time.
+        :return: The strategy
+        """
+        if self.strategy is None:
+            if self.run is None:
+                raise RuntimeError("The strategy for {} cannot be materialized, it has no run set".format(self.title))
+            function, args = self.run
+            self.strategy = function(*args)
+        return self.strategy
+
+
+def run_and_summarize(function: Callable[..., Strategy], *args) -> StrategySummary:
+    """
+    Run a strategy and summarize the results, use this as the job function to only send back the summary.
+    :param function: The function that runs the strategy (and returns it), e.g. strategy.run
+    :param args: The arguments to the function
+    :return: The summary of the results
+    """
+    return StrategySummary(function(*args))
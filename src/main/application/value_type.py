@@ -39,6 +39,7 @@ class ValueType(Enum):
     MACD_SIGNAL = auto()
     RSI = auto()
     SMA = auto()
+    EMA = auto()
     BOOK = auto()
     EPS = auto()  # Reported EPS
     ESTIMATED_EPS = auto()
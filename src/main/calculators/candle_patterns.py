@@ -0,0 +1,91 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import numpy
+
+
+def get_runs(matches: numpy.ndarray, count: int) -> numpy.ndarray:
+    """
+    Find the bars that end a run of matching bars.
+    :param matches: True for each bar that matches
+    :param count: The number of bars in a run
+    :return: True for each bar where it and the count - 1 bars before it all match
+    """
+    misses: numpy.ndarray = numpy.concatenate([[0], numpy.cumsum(~matches)])
+    runs: numpy.ndarray = numpy.zeros(len(matches), dtype=bool)
+    if 0 < count <= len(matches):
+        runs[count - 1:] = (misses[count:] - misses[:-count]) == 0
+    return runs
+
+
+def get_white_soldiers(opens: numpy.ndarray, closes: numpy.ndarray, count: int) -> numpy.ndarray:
+    """
+    Find the bars that end count white soldiers, i.e. bars that did not close lower than they opened.
+    :param opens: The open price of each bar
+    :param closes: The close price of each bar
+    :param count: The number of soldiers
+    :return: True for each bar that ends count soldiers
+    """
+    return get_runs(~(opens > closes), count)
+
+
+def get_black_crows(opens: numpy.ndarray, closes: numpy.ndarray, count: int) -> numpy.ndarray:
+    """
+    Find the bars that end count black crows, i.e. bars that did not close higher than they opened.
+    :param opens: The open price of each bar
+    :param closes: The close price of each bar
+    :param count: The number of crows
+    :return: True for each bar that ends count crows
+    """
+    return get_runs(~(opens < closes), count)
+
+
+def get_bounces_up(opens: numpy.ndarray, closes: numpy.ndarray, ratio: float, threshold: float) -> numpy.ndarray:
+    """
+    Find the bars that bounced up, i.e. the bar before closed down, this bar closed up above the last close (by more
+    than the threshold) and this bar moved more than ratio times as much as the bar before.
+    :param opens: The open price of each bar
+    :param closes: The close price of each bar
+    :param ratio: 2.0 means this bar must move more than double the bar before
+    :param threshold: 0.01 means this close must be more than 1% above the last close
+    :return: True for each bar that bounced up from the bar before (the first bar never does)
+    """
+    bounces: numpy.ndarray = numpy.zeros(len(opens), dtype=bool)
+    previous_opens, previous_closes, current_opens, current_closes = opens[:-1], closes[:-1], opens[1:], closes[1:]
+    bounces[1:] = (previous_closes < previous_opens) & (current_closes > current_opens) & \
+        (current_closes > previous_closes * (1 + threshold)) & \
+        (numpy.abs(previous_closes - previous_opens) * ratio < numpy.abs(current_closes - current_opens))
+    return bounces
+
+
+def get_bounces_down(opens: numpy.ndarray, closes: numpy.ndarray, ratio: float, threshold: float) -> numpy.ndarray:
+    """
+    Find the bars that bounced down, i.e. the bar before closed up, this bar closed down below the last close (by more
+    than the threshold) and this bar moved more than ratio times as much as the bar before.
+    :param opens: The open price of each bar
+    :param closes: The close price of each bar
+    :param ratio: 2.0 means this bar must move more than double the bar before
+    :param threshold: 0.01 means this close must be more than 1% below the last close
+    :return: True for each bar that bounced down from the bar before (the first bar never does)
+    """
+    bounces: numpy.ndarray = numpy.zeros(len(opens), dtype=bool)
+    previous_opens, previous_closes, current_opens, current_closes = opens[:-1], closes[:-1], opens[1:], closes[1:]
+    bounces[1:] = (previous_closes > previous_opens) & (current_closes < current_opens) & \
+        (current_closes < previous_closes * (1 - threshold)) & \
+        (numpy.abs(previous_closes - previous_opens) * ratio < numpy.abs(current_closes - current_opens))
+    return bounces
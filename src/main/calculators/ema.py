@@ -16,10 +16,11 @@
 #  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
 # ------------------------------------------------------------------------------
 
-from main.application.calculator import Calculator
+from main.application.calculator import IncrementalCalculator
+from main.calculators.rolling_window import RollingWindow
 
 
-class EMA(Calculator):
+class EMA(IncrementalCalculator):
     """
     Exponential Moving Average
     """
@@ -28,6 +29,8 @@ class EMA(Calculator):
     def __init__(self, length):
         self.averaging_length = length
         self.SMOOTHING_COEFFICIENT = 2 / (self.averaging_length + 1)
+        self.window = RollingWindow(length)
+        self.weighted_total = 0.0
 
     # You should be using the closing price
     #   ValueType.CLOSE
@@ -81,3 +84,25 @@ class EMA(Calculator):
 
         # price 1 is the [0] in the small_price_list
         return ema_total
+
+    def update(self, value):
+        """
+        calc folds the window from the newest price back to the oldest, so the price at position i (0 is the newest) of
+        a window of N prices is weighted by (1 - α)^(N-1-i), times α for all but the newest. The weighted total of the
+        window is kept, when a price is added every other price moves one position back, so the total is divided by
+        (1 - α), the dropped price is removed and the new price is added with the smallest weight.
+        """
+        dropped = self.window.append(value)
+        if not self.window.is_full():
+            return None
+        decay = 1 - self.SMOOTHING_COEFFICIENT
+        if dropped is None or self.window.is_refresh_due():
+            self.weighted_total = sum([decay ** (self.window.length - 1 - position) * price
+                                       for position, price in enumerate(self.window.get_newest_first())])
+        else:
+            self.weighted_total = (decay ** (self.window.length - 1)) * value + (self.weighted_total - dropped) / decay
+        return self.SMOOTHING_COEFFICIENT * self.weighted_total + decay ** self.window.length * value
+
+    def reset(self):
+        self.window.clear()
+        self.weighted_total = 0.0
@@ -0,0 +1,151 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple, Any, Callable, Union
+from typing import OrderedDict as OrderedDictType
+
+import pandas
+
+from main.calculators.sparse_table import SparseTable
+
+Indicator = Union[pandas.Series, pandas.DataFrame, SparseTable]
+
+
+def get_data_fingerprint(values: Union[pandas.Series, pandas.DataFrame]) -> str:
+    """
+    Get a fingerprint of the data (index and values), so that indicators calculated from the same data share a key
+    while any change to the data (e.g. a newer bar, or an adjusted price) gives a different key.
+    :param values: The data the indicator is calculated from
+    :return: The fingerprint (hex digest)
+    """
+    return hashlib.sha1(pandas.util.hash_pandas_object(values, index=True).to_numpy().tobytes()).hexdigest()
+
+
+class IndicatorCache:
+    """
+    Is singleton so that indicators are only calculated once per run and then shared by all calculators and strategies
+    that need them, e.g. many strategies in a sweep use the same SMA (or local high/low range table) of the same symbol.
+    Entries are content addressed, the key is (symbol, interval, data fingerprint, indicator, params) so an entry is
+    never stale. Results are kept in memory, and if a cache dir is set they are also written to disk so that other
+    processes (e.g. parallel workers) read them instead of calculating them again. Only the max_entries most recently
+    used results are kept in memory, so long-lived workers don't keep every indicator they ever calculated.
+
+    The cached results are shared and must not be modified by callers.
+    """
+    instance = None
+    results: OrderedDictType[Tuple, Indicator]
+    max_entries: int
+    cache_dir: Optional[str]
+    hits: int
+    disk_hits: int
+    misses: int
+    mutex: threading.Lock
+
+    def __init__(self):
+        raise RuntimeError('Use get_instance() instead')
+
+    @classmethod
+    def get_instance(cls):
+        if cls.instance is None:
+            cls.instance = cls.__new__(cls)
+            cls.instance.max_entries = 256
+            cls.instance.cache_dir = None
+            cls.instance.mutex = threading.Lock()
+            cls.instance.reset()
+        return cls.instance
+
+    def get(self, symbol: str, interval: Any, values: Union[pandas.Series, pandas.DataFrame], indicator: str,
+            params: Tuple, calculate: Callable[[], Indicator]) -> Indicator:
+        """
+        Get the indicator from the cache, calculating (and caching) it if it isn't cached yet.
+        :param symbol: The symbol the data is for
+        :param interval: The interval of the data (e.g. a TimeInterval)
+        :param values: The data the indicator is calculated from, this is fingerprinted for the key
+        :param indicator: The name of the indicator, e.g. 'macd'
+        :param params: The parameters of the indicator, e.g. (fast, slow, signal)
+        :param calculate: Called to calculate the indicator on a miss
+        :return: The indicator
+        """
+        key: Tuple = (symbol, str(interval), get_data_fingerprint(values), indicator, tuple(params))
+        with self.mutex:
+            result: Optional[Indicator] = self.results.get(key)
+            if result is not None:
+                self.results.move_to_end(key)
+                self.hits += 1
+                return result
+        cache_file: Optional[str] = self.get_cache_file(key)
+        if cache_file is not None and os.path.exists(cache_file):
+            with open(cache_file, 'rb') as fd:
+                result = pickle.load(fd)
+            with self.mutex:
+                self.disk_hits += 1
+                self.add_result(key, result)
+            return result
+        result = calculate()
+        with self.mutex:
+            self.misses += 1
+            self.add_result(key, result)
+        if cache_file is not None:
+            write_indicator_file(cache_file, result)
+        return result
+
+    def add_result(self, key: Tuple, result: Indicator) -> None:
+        self.results[key] = result
+        self.results.move_to_end(key)
+        while len(self.results) > self.max_entries:
+            self.results.popitem(last=False)
+
+    def get_cache_file(self, key: Tuple) -> Optional[str]:
+        if self.cache_dir is None:
+            return None
+        digest: str = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, 'indicator.{}.{}.pickle'.format(key[3], digest))
+
+    def report(self) -> None:
+        with self.mutex:
+            logging.info("Indicator cache has {} entries with {} hits ({} from disk) and {} misses".format(
+                len(self.results), self.hits + self.disk_hits, self.disk_hits, self.misses))
+
+    def reset(self) -> None:
+        with self.mutex:
+            self.results = OrderedDict()
+            self.hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+
+
+def write_indicator_file(cache_file: str, result: Indicator) -> None:
+    """
+    Write the indicator to disk, replacing the file atomically so readers never see a partially written file.
+    :param cache_file: The location of the file to write
+    :param result: The indicator to write
+    :return:
+    """
+    cache_dir: str = os.path.dirname(cache_file)
+    if not os.path.exists(cache_dir):
+        os.makedirs(cache_dir, exist_ok=True)
+    tmp_file: str = '{}.{}.{}.tmp'.format(cache_file, os.getpid(), threading.get_ident())
+    with open(tmp_file, 'wb') as fd:
+        pickle.dump(result, fd, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file, cache_file)
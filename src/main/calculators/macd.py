@@ -16,8 +16,11 @@
 #  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
 # ------------------------------------------------------------------------------
 
+import pandas
+
 from main.application.calculator import Calculator
-from main.calculators.ema import EMA
+from main.application.value_type import ValueType
+from main.calculators.vectorized import calculate_macd
 
 
 class MACD(Calculator):
@@ -28,77 +31,9 @@ class MACD(Calculator):
         self.slow_length = slow_length
         self.macd_length = macd_length
 
-        self.fast_ema = EMA(self.fast_length)
-        self.slow_ema = EMA(self.slow_length)
-        self.average_ema = EMA(self.macd_length)
-
     # You should be using the closing price
     #   ValueType.CLOSE
-
-    def make_ema_list(self, ema_obj, prices_list, length):
-
-        ema_list = []
-        position = 0
-
-        # we keep increasing the index into the position array
-        #   we keep appending the new Weighted Moving Average onto the results array
-        #   the WMA_obj knows he will always only calculate a WMA of the same length it was originally designed to
-        #   finally, we return the result
-        while (position + length) < len(prices_list):
-            ema_list.append(ema_obj(prices_list[position:]))
-            position += 1
-
-        return ema_list
-
-    def find_difference(self, fast_list, slow_list):
-        """
-        Value = MovingAverage(averageType, close, fastLength) - MovingAverage(averageType, close, slowLength);
-        Avg = MovingAverage(averageType, Value, MACDLength);
-
-        Diff = Value - Avg;
-        """
-        value_list = []
-        difference_list = []
-
-        for fast_price, slow_price in zip(fast_list, slow_list):
-            value_list.append(fast_price - slow_price)
-
-        average = self.average_ema.calc(value_list)
-
-        for value_price, average_price in zip(value_list, average):
-            difference_list.append(value_price - average_price)
-
-        return difference_list
-
     def calc(self, prices_list):
-        # plot        SMA = Average(price[-displace], length);
-        if not prices_list:
-            # print an error?
-            return None
-
-        if len(prices_list) < self.slow_length:
-            # print an error?
-            return None
-
-        # should make sure prices_list is only the last "self.averaging_length" elements
-        #   might want a common "price_list trim" function?
-
-        # most recent prices are guaranteed to be at the start of the list
-
-        small_price_list = []
-
-        for price in prices_list:
-
-            small_price_list.append(price)
-
-            if len(small_price_list) >= self.slow_length:
-                break
-
-        fast_list = self.make_ema_list(self.fast_ema, small_price_list, self.fast_length)
-        slow_list = self.make_ema_list(self.slow_ema, small_price_list, self.slow_length)
-
-        difference_list = self.find_difference(fast_list, slow_list)
-
         """
         Value = MovingAverage(averageType, close, fastLength) - MovingAverage(averageType, close, slowLength);
         Avg = MovingAverage(averageType, Value, MACDLength);
@@ -108,6 +43,13 @@ class MACD(Calculator):
 
         UpSignal = if Diff crosses above ZeroLine then ZeroLine else Double.NaN;
         DownSignal = if Diff crosses below ZeroLine then ZeroLine else Double.NaN;
-        """
 
-        return difference_list
+        This recalculates the whole series, when stepping through a series use calculate_macd once up front instead.
+        :param prices_list: The prices, the most recent first
+        :return: The latest Diff (histogram) value, or None if there aren't enough prices
+        """
+        if not prices_list or len(prices_list) < self.slow_length:
+            return None
+        prices = pandas.Series(list(reversed(prices_list)), dtype=float)
+        difference = calculate_macd(prices, self.fast_length, self.slow_length, self.macd_length)[ValueType.MACD_HIST]
+        return None if pandas.isna(difference.iloc[-1]) else difference.iloc[-1]
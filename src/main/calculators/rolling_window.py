@@ -0,0 +1,72 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import math
+from collections import deque
+from typing import Optional, Deque, List
+
+
+class RollingWindow:
+    """
+    The last values added (up to the length of the window) and their running sum. The running sum is recalculated
+    exactly once every length updates, so rounding errors don't build up over long runs (this keeps updates O(1)).
+    """
+    length: int
+    values: Deque[float]
+    total: float
+    updates: int
+
+    def __init__(self, length: float):
+        """
+        :param length: The number of values in the window, a fractional length is rounded up
+        """
+        self.length = math.ceil(length)
+        self.values = deque(maxlen=self.length)
+        self.total = 0.0
+        self.updates = 0
+
+    def append(self, value: float) -> Optional[float]:
+        """
+        Add the newest value to the window.
+        :param value: The value to add
+        :return: The oldest value, which dropped out of the window, else None if the window wasn't full
+        """
+        dropped: Optional[float] = self.values[0] if self.is_full() else None
+        self.values.append(value)
+        self.total += value - (0.0 if dropped is None else dropped)
+        self.updates += 1
+        if self.is_refresh_due():
+            self.total = math.fsum(self.values)
+        return dropped
+
+    def is_full(self) -> bool:
+        return len(self.values) == self.length
+
+    def is_refresh_due(self) -> bool:
+        """
+        :return: True once every length updates, when running state should be recalculated exactly from the values
+        """
+        return self.updates % self.length == 0
+
+    def get_newest_first(self) -> List[float]:
+        return list(reversed(self.values))
+
+    def clear(self) -> None:
+        self.values.clear()
+        self.total = 0.0
+        self.updates = 0
@@ -18,16 +18,12 @@
 
 from statistics import mean
 
-from main.application.calculator import Calculator
+from main.application.calculator import RollingAverageCalculator
 
 
-class SMA(Calculator):
+class SMA(RollingAverageCalculator):
     # Simple Moving Average
 
-    # when you start, declare the length of the SMA you want to be using
-    def __init__(self, length):
-        self.averaging_length = length
-
     # You should be using the closing price
     #   ValueType.CLOSE
     def calc(self, prices_list):
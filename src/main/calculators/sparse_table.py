@@ -0,0 +1,64 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+from typing import List, Callable
+
+import numpy
+
+
+class SparseTable:
+    """
+    Answers range queries (e.g. the max or the min of the values between two positions) in O(1) after an O(N log N)
+    build. Level k holds the result for each run of 2^k values, so any range is covered by two (overlapping) runs of
+    the same level. This works for any function where overlapping doesn't change the result (max, min, gcd, ...).
+
+    Missing (NaN) values are skipped when using numpy.fmax or numpy.fmin, a range that only has missing values is NaN.
+    """
+    function: Callable[[numpy.ndarray, numpy.ndarray], numpy.ndarray]
+    levels: List[numpy.ndarray]
+
+    def __init__(self, values: numpy.ndarray, function: Callable[[numpy.ndarray, numpy.ndarray], numpy.ndarray]):
+        """
+        :param values: The values to query ranges of
+        :param function: Combines two arrays element-wise, e.g. numpy.fmax
+        """
+        self.function = function
+        self.levels = [numpy.asarray(values, dtype=float)]
+        width = 1
+        while width * 2 <= len(self.levels[0]):
+            previous: numpy.ndarray = self.levels[-1]
+            self.levels.append(function(previous[:-width], previous[width:]))
+            width *= 2
+
+    def __len__(self) -> int:
+        return len(self.levels[0])
+
+    def query(self, start: int, end: int) -> float:
+        """
+        Get the result over a range of the values.
+        :param start: The position of the first value in the range
+        :param end: The position of the last value in the range (inclusive)
+        :return: The result for the range, NaN if the range is empty
+        """
+        start = max(start, 0)
+        end = min(end, len(self) - 1)
+        if end < start:
+            return numpy.nan
+        level: int = (end - start + 1).bit_length() - 1
+        values: numpy.ndarray = self.levels[level]
+        return float(self.function(values[start], values[end - (1 << level) + 1]))
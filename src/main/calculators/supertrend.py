@@ -18,14 +18,10 @@
 
 from statistics import mean
 
-from main.application.calculator import Calculator
+from main.application.calculator import RollingAverageCalculator
 
 
-class SUPERTREND(Calculator):
-
-    # when you start, declare the length of the SMA you want to be using
-    def __init__(self, length):
-        self.averaging_length = length
+class SUPERTREND(RollingAverageCalculator):
 
     # You should be using the closing price
     #   ValueType.CLOSE
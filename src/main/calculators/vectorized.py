@@ -0,0 +1,113 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import math
+
+import numpy
+import pandas
+
+from main.application.value_type import ValueType
+
+
+def calculate_sma(values: pandas.Series, length: int) -> pandas.Series:
+    """
+    Calculate the simple moving average for every time in the series, using a rolling window in O(N).
+    :param values: The values (e.g. closes) with the oldest first
+    :param length: The length of the average
+    :return: The averages (aligned with the values), NaN until there are length values
+    """
+    return values.rolling(length).mean()
+
+
+def calculate_ema(values: pandas.Series, length: int) -> pandas.Series:
+    """
+    Calculate the exponential moving average for every time in the series, in O(N) for the whole series. The average is
+    seeded with the first value, then EMA = α * price + (1 - α) * previous EMA where α is 2 / (length + 1).
+    :param values: The values (e.g. closes) with the oldest first
+    :param length: The length of the average
+    :return: The averages (aligned with the values), NaN until there are length values
+    """
+    return values.ewm(span=length, adjust=False, min_periods=length).mean()
+
+
+def calculate_rsi(values: pandas.Series, length: int) -> pandas.Series:
+    """
+    Calculate the relative strength index for every time in the series, the average gains and losses use Wilder's
+    smoothing (an EMA where α is 1 / length):
+
+        RSI = 100 - 100 / (1 + average gain / average loss)
+
+    :param values: The values (e.g. closes) with the oldest first
+    :param length: The length (period) of the index
+    :return: The index (aligned with the values), NaN until there are length changes
+    """
+    changes: pandas.Series = values.diff()
+    gains: pandas.Series = changes.clip(lower=0.0).ewm(alpha=1 / length, adjust=False, min_periods=length).mean()
+    losses: pandas.Series = (-changes.clip(upper=0.0)).ewm(alpha=1 / length, adjust=False, min_periods=length).mean()
+    return 100.0 - 100.0 / (1.0 + gains / losses)
+
+
+def calculate_wma(values: pandas.Series, length: int) -> pandas.Series:
+    """
+    Calculate the weighted moving average for every time in the series, the newest value is weighted by length, the
+    one before by length - 1 and so on. This is a single convolution over the whole series.
+    :param values: The values (e.g. closes) with the oldest first
+    :param length: The length of the average
+    :return: The averages (aligned with the values), NaN until there are length values
+    """
+    averages: numpy.ndarray = numpy.full(len(values), numpy.nan)
+    if len(values) >= length:
+        weights: numpy.ndarray = numpy.arange(length, 0, -1, dtype=float)  # convolve flips these, newest gets length
+        averages[length - 1:] = numpy.convolve(values.to_numpy(dtype=float), weights, 'valid') / weights.sum()
+    return pandas.Series(averages, index=values.index)
+
+
+def calculate_hull(values: pandas.Series, length: int) -> pandas.Series:
+    """
+    Calculate the Hull moving average for every time in the series:
+
+        Raw HMA = (2 * WMA(n/2) of price) - WMA(n) of price
+        HMA = WMA(sqrt(n)) of Raw HMA
+
+    :param values: The values (e.g. closes) with the oldest first
+    :param length: The length (n) of the average
+    :return: The averages (aligned with the values), NaN until there are enough values
+    """
+    raw: pandas.Series = 2 * calculate_wma(values, max(int(length / 2), 1)) - calculate_wma(values, length)
+    return calculate_wma(raw, max(round(math.sqrt(length)), 1))
+
+
+def calculate_macd(values: pandas.Series, fast_length: int, slow_length: int, signal_length: int) -> pandas.DataFrame:
+    """
+    Calculate the MACD for every time in the series:
+
+        Value = EMA(fast) of price - EMA(slow) of price
+        Avg = EMA(signal) of Value
+        Diff = Value - Avg
+
+    :param values: The values (e.g. closes) with the oldest first
+    :param fast_length: The length of the fast average
+    :param slow_length: The length of the slow average
+    :param signal_length: The length of the average of the MACD (the signal)
+    :return: The MACD (Value), the signal (Avg) and the histogram (Diff) columns aligned with the values, this can be
+             added to adapter data with insert_columns
+    """
+    macd: pandas.Series = calculate_ema(values, fast_length) - calculate_ema(values, slow_length)
+    signal: pandas.Series = calculate_ema(macd.dropna(), signal_length).reindex(values.index)
+    return pandas.DataFrame({ValueType.MACD: macd, ValueType.MACD_SIGNAL: signal, ValueType.MACD_HIST: macd - signal},
+                            index=values.index)
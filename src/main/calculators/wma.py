@@ -16,15 +16,19 @@
 #  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
 # ------------------------------------------------------------------------------
 
-from main.application.calculator import Calculator
+from main.application.calculator import IncrementalCalculator
+from main.calculators.rolling_window import RollingWindow
 
 
-class WMA(Calculator):
+class WMA(IncrementalCalculator):
     # Weighted Moving Average
 
     # when you start, declare the length of the EMA you want to be using
     def __init__(self, length):
         self.averaging_length = length
+        self.window = RollingWindow(length)
+        self.weighted_total = 0.0
+        self.total_weight = sum([length - position for position in range(self.window.length)])
 
     # You should be using the closing price
     #   ValueType.CLOSE
@@ -80,3 +84,20 @@ class WMA(Calculator):
 
         # price 1 is the [0] in the small_price_list
         return wma_total / total_weight
+
+    def update(self, value):
+        # every value moves one position back so its weight drops by one, which is the same as subtracting the sum
+        total = self.window.total
+        dropped = self.window.append(value)
+        if self.window.is_refresh_due():
+            self.weighted_total = sum([(self.averaging_length - position) * price
+                                       for position, price in enumerate(self.window.get_newest_first())])
+        else:
+            self.weighted_total += self.averaging_length * value - total
+            if dropped is not None:
+                self.weighted_total -= (self.averaging_length - self.window.length) * dropped
+        return self.weighted_total / self.total_weight if self.window.is_full() else None
+
+    def reset(self):
+        self.window.clear()
+        self.weighted_total = 0.0
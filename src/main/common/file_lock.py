@@ -0,0 +1,157 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import fcntl
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from main.common.locations import file_link_format
+
+
+class LockStatistics:
+    """
+    The wait statistics for a single lock file.
+    """
+    acquired: int
+    contended: int
+    total_wait: float
+    max_wait: float
+
+    def __init__(self):
+        self.acquired = 0
+        self.contended = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class LockMetrics:
+    """
+    Is singleton so that the time spent waiting on locks can be collected from anywhere in the code base and then
+    reported, e.g. to see how long parallel workers are blocked on each other.
+    """
+    instance = None
+    statistics: Dict[str, LockStatistics]
+    mutex: threading.Lock
+
+    def __init__(self):
+        raise RuntimeError('Use get_instance() instead')
+
+    @classmethod
+    def get_instance(cls):
+        if cls.instance is None:
+            cls.instance = cls.__new__(cls)
+            cls.instance.statistics = {}
+            cls.instance.mutex = threading.Lock()
+        return cls.instance
+
+    def record(self, lock_file: str, wait: float, contended: bool) -> None:
+        """
+        Record that a lock was acquired.
+        :param lock_file: The lock file that was acquired
+        :param wait: How long (in seconds) it took to acquire the lock
+        :param contended: True if the lock was held by someone else when it was requested
+        :return:
+        """
+        with self.mutex:
+            statistics: LockStatistics = self.statistics.setdefault(lock_file, LockStatistics())
+            statistics.acquired += 1
+            statistics.contended += 1 if contended else 0
+            statistics.total_wait += wait
+            statistics.max_wait = max(statistics.max_wait, wait)
+
+    def get_statistics(self, lock_file: str) -> LockStatistics:
+        with self.mutex:
+            return self.statistics.get(lock_file, LockStatistics())
+
+    def get_total_wait(self) -> float:
+        with self.mutex:
+            return sum([statistics.total_wait for statistics in self.statistics.values()])
+
+    def report(self) -> None:
+        with self.mutex:
+            for lock_file, statistics in sorted(self.statistics.items(), key=lambda item: -item[1].total_wait):
+                logging.info("Lock {} acquired {} times ({} contended) waited {:0.3f}s total (max {:0.3f}s)".format(
+                    file_link_format(lock_file), statistics.acquired, statistics.contended, statistics.total_wait,
+                    statistics.max_wait))
+
+    def reset(self) -> None:
+        with self.mutex:
+            self.statistics = {}
+
+
+class FileLock:
+    """
+    An exclusive lock that works across processes (and threads), using an advisory lock (flock) on a lock file.
+
+    Waiting for the lock blocks in the kernel (no polling) and the waiter wakes up as soon as the holder releases it.
+    The kernel releases the lock when the holder closes the file, including when the holding process crashes or is
+    killed, so a lock can never be left stale. The lock file itself is left in place, it is only a handle to lock on.
+
+        with FileLock(lock_file):
+            ...
+    """
+    lock_file: str
+    fd: Optional[int]
+
+    def __init__(self, lock_file: str):
+        self.lock_file = lock_file
+        self.fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def acquire(self) -> float:
+        """
+        Acquire the lock, waiting until it is released if another process (or thread) holds it.
+        :return: The time waited (in seconds) to acquire the lock
+        """
+        lock_dir = os.path.dirname(self.lock_file)
+        if lock_dir and not os.path.exists(lock_dir):
+            os.makedirs(lock_dir, exist_ok=True)
+        fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+        start = time.perf_counter()
+        contended = False
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                contended = True
+                logging.debug("Waiting on lock: {}".format(self.lock_file))
+                fcntl.flock(fd, fcntl.LOCK_EX)
+        except BaseException:  # e.g. interrupted while waiting, the lock is not held so the file is not kept open
+            os.close(fd)
+            raise
+        self.fd = fd
+        wait = time.perf_counter() - start
+        LockMetrics.get_instance().record(self.lock_file, wait, contended)
+        logging.debug("Acquired lock: {} (waited {:0.3f}s)".format(self.lock_file, wait))
+        return wait
+
+    def release(self) -> None:
+        if self.fd is not None:
+            fd, self.fd = self.fd, None
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+            logging.debug("Released lock: {}".format(self.lock_file))
@@ -0,0 +1,207 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import Retry
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class SessionStatistics:
+    """
+    The request statistics for a single session.
+    """
+    requests: int
+    connections: int
+    retries: int
+    connect_time: float
+    total_time: float
+    mutex: threading.Lock
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self.retries = 0
+        self.connect_time = 0.0
+        self.total_time = 0.0
+        self.mutex = threading.Lock()
+
+    def record_connect(self, connect_time: float) -> None:
+        with self.mutex:
+            self.connections += 1
+            self.connect_time += connect_time
+
+    def record_request(self, total_time: float, retries: int) -> None:
+        with self.mutex:
+            self.requests += 1
+            self.retries += retries
+            self.total_time += total_time
+
+    def get_reused(self) -> int:
+        """
+        :return: The number of requests that were sent over a connection that was already open
+        """
+        return max(self.requests + self.retries - self.connections, 0)
+
+    def get_transfer_time(self) -> float:
+        """
+        :return: The time (in seconds) spent sending requests and receiving responses, i.e. not opening connections
+        """
+        return max(self.total_time - self.connect_time, 0.0)
+
+
+def create_timed_pool_class(pool_class: type, statistics: SessionStatistics) -> type:
+    """
+    Create a connection pool class that records the number of connections opened and the time spent opening them.
+    :param pool_class: The urllib3 connection pool class to extend (i.e. HTTP or HTTPS)
+    :param statistics: The statistics to record the connections into
+    :return: The new connection pool class
+    """
+    class TimedConnection(pool_class.ConnectionCls):
+        def connect(self):
+            start = time.perf_counter()
+            super().connect()
+            statistics.record_connect(time.perf_counter() - start)
+
+    return type('Timed' + pool_class.__name__, (pool_class,), {'ConnectionCls': TimedConnection})
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    Keeps the connections to each host open between requests (keep-alive), retries with an exponential backoff when
+    the server is busy (429) or fails (5xx) and applies a default timeout to every request. Only idempotent requests
+    (e.g. GET) are retried, a POST (e.g. an RPC) that failed is never silently sent again.
+    """
+    timeout: float
+    statistics: SessionStatistics
+
+    def __init__(self, statistics: SessionStatistics, pool_size: int, timeout: float, retries: int, backoff: float):
+        """
+        :param statistics: The statistics to record the connections into
+        :param pool_size: The max number of connections kept open to each host
+        :param timeout: The default time (in seconds) to wait on a connection or a response
+        :param retries: The max number of times a request is retried
+        :param backoff: The backoff factor (in seconds) retries wait backoff * 2 ^ (retry - 1) between attempts
+        """
+        self.statistics = statistics
+        self.timeout = timeout
+        max_retries = Retry(total=retries, backoff_factor=backoff, status_forcelist=RETRY_STATUSES,
+                            raise_on_status=False)
+        super().__init__(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=max_retries)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': create_timed_pool_class(HTTPConnectionPool, self.statistics),
+            'https': create_timed_pool_class(HTTPSConnectionPool, self.statistics),
+        }
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=self.timeout if timeout is None else timeout, **kwargs)
+
+
+class PooledSession(requests.Session):
+    """
+    A session that records how many requests are made and how long they take (including reading the response).
+    """
+    statistics: SessionStatistics
+
+    def __init__(self, pool_size: int, timeout: float, retries: int, backoff: float):
+        super().__init__()
+        self.statistics = SessionStatistics()
+        adapter = PooledHTTPAdapter(self.statistics, pool_size, timeout, retries, backoff)
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        start = time.perf_counter()
+        response = super().request(method, url, *args, **kwargs)
+        retries = getattr(response.raw, 'retries', None)
+        self.statistics.record_request(time.perf_counter() - start, 0 if retries is None else len(retries.history))
+        return response
+
+
+class SessionPool:
+    """
+    Is singleton so that all adapters of the same class share one session (and its open connections) in a process,
+    instead of opening a new connection for every request. Connections are never shared across processes, a forked
+    (worker) process starts with no sessions.
+    """
+    instance = None
+    pid: int
+    sessions: Dict[str, PooledSession]
+    mutex: threading.Lock
+
+    def __init__(self):
+        raise RuntimeError('Use get_instance() instead')
+
+    @classmethod
+    def get_instance(cls):
+        if cls.instance is None or cls.instance.pid != os.getpid():
+            cls.instance = cls.__new__(cls)
+            cls.instance.pid = os.getpid()
+            cls.instance.sessions = {}
+            cls.instance.mutex = threading.Lock()
+        return cls.instance
+
+    def get_session(self, name: str, pool_size: int = 10, timeout: float = 30.0, retries: int = 3,
+                    backoff: float = 0.5) -> PooledSession:
+        """
+        Get the session with the given name, creating it the first time it is asked for. The configuration is only
+        used when the session is created.
+        :param name: The name of the session, e.g. the adapter class name
+        :param pool_size: The max number of connections kept open to each host
+        :param timeout: The default time (in seconds) to wait on a connection or a response
+        :param retries: The max number of times a request is retried when the server is busy (429) or fails (5xx)
+        :param backoff: The backoff factor (in seconds) retries wait backoff * 2 ^ (retry - 1) between attempts
+        :return: The session
+        """
+        with self.mutex:
+            session: Optional[PooledSession] = self.sessions.get(name)
+            if session is None:
+                session = PooledSession(pool_size, timeout, retries, backoff)
+                self.sessions[name] = session
+            return session
+
+    def get_statistics(self, name: str) -> SessionStatistics:
+        with self.mutex:
+            session: Optional[PooledSession] = self.sessions.get(name)
+            return SessionStatistics() if session is None else session.statistics
+
+    def report(self) -> None:
+        with self.mutex:
+            for name, session in sorted(self.sessions.items()):
+                statistics: SessionStatistics = session.statistics
+                logging.info("Session {} made {} requests ({} reused a connection, {} retries) opened {} connections "
+                             "in {:0.3f}s and transferred for {:0.3f}s".format(
+                                 name, statistics.requests, statistics.get_reused(), statistics.retries,
+                                 statistics.connections, statistics.connect_time, statistics.get_transfer_time()))
+
+    def reset(self) -> None:
+        with self.mutex:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions = {}
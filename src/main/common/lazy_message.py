@@ -0,0 +1,45 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+from typing import Callable, Optional
+
+
+class LazyMessage:
+    """
+    A log message that is only formatted if a handler emits it. Logging only turns the message into a string when a
+    record passes the level of the logger and of a handler, so an expensive message costs nothing when it is filtered
+    out (e.g. INFO messages in workers that only log warnings):
+
+        logging.info(LazyMessage(lambda: "Closing {}".format(order)))
+
+    The message is formatted while the logging call runs, so it sees the same state as an eager message would.
+    """
+    format_message: Callable[[], str]
+    message: Optional[str]
+
+    def __init__(self, format_message: Callable[[], str]):
+        """
+        :param format_message: Called (at most once) to format the message
+        """
+        self.format_message = format_message
+        self.message = None
+
+    def __str__(self) -> str:
+        if self.message is None:
+            self.message = self.format_message()
+        return self.message
@@ -0,0 +1,99 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import logging
+import os
+import time
+from datetime import timedelta
+from typing import List
+
+from main.common.file_lock import FileLock
+
+
+class RateLimiter:
+    """
+    A token bucket that is shared by all processes (and threads) using the same state file, so that concurrent workers
+    can use the full request quota of a provider without going over it.
+
+    The bucket holds max_requests tokens and each request takes one. A token is returned to the bucket one timeframe
+    after it was taken, so no more than max_requests requests are ever made within any timeframe. The times the tokens
+    were taken are kept in the state file, which is only read and written while holding its lock.
+    """
+    state_file: str
+    max_requests: int
+    timeframe: timedelta
+    buffer: float
+
+    def __init__(self, state_file: str, max_requests: int, timeframe: timedelta, buffer: float = 0.0):
+        """
+        :param state_file: The file that the bucket is kept in, all users of the same file share the bucket
+        :param max_requests: The max number of requests allowed within the timeframe (i.e. the size of the bucket)
+        :param timeframe: The timeframe for which the max requests are allowed
+        :param buffer: How much extra time (in seconds) to wait, beyond when a token is returned, before using it
+        """
+        self.state_file = state_file
+        self.max_requests = max_requests
+        self.timeframe = timeframe
+        self.buffer = buffer
+
+    def acquire(self) -> float:
+        """
+        Take a token from the bucket, sleeping until one is returned if the bucket is empty.
+        :return: The time waited (in seconds) for a token
+        """
+        waited = 0.0
+        while True:
+            sleep = self.try_acquire()
+            if sleep <= 0.0:
+                return waited
+            logging.info('-- Waiting for: {:0.3f}s (rate limit of {} requests per {})'.format(sleep, self.max_requests,
+                                                                                             self.timeframe))
+            time.sleep(sleep)
+            waited += sleep
+
+    def try_acquire(self) -> float:
+        """
+        Take a token from the bucket if there is one.
+        :return: 0.0 if a token was taken, else the time (in seconds) until the next token is returned
+        """
+        with FileLock(self.get_lock_file()):
+            now = time.time()
+            timeframe = self.timeframe.total_seconds()
+            taken = [taken_time for taken_time in self.read_taken_times() if taken_time + timeframe > now]
+            if len(taken) >= self.max_requests:
+                return max(min(taken) + timeframe + self.buffer - now, 0.001)
+            taken.append(now)
+            self.write_taken_times(taken)
+            return 0.0
+
+    def get_lock_file(self) -> str:
+        return os.path.join(os.path.dirname(self.state_file), '.lock.{}'.format(os.path.basename(self.state_file)))
+
+    def read_taken_times(self) -> List[float]:
+        if not os.path.exists(self.state_file):
+            return []
+        try:
+            with open(self.state_file, 'r') as fd:
+                return [float(line) for line in fd.read().split()]
+        except ValueError:
+            logging.warning("Ignoring unreadable rate limit state: {}".format(self.state_file))
+            return []
+
+    def write_taken_times(self, taken: List[float]) -> None:
+        with open(self.state_file, 'w') as fd:
+            fd.write('\n'.join(['{:.6f}'.format(taken_time) for taken_time in taken]))
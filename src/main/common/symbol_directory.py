@@ -0,0 +1,99 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import logging
+import os
+import threading
+from typing import Dict, FrozenSet, Callable, Iterable
+
+from main.common.locations import file_link_format
+
+
+def write_symbols_file(symbols_file: str, symbols: FrozenSet[str]) -> None:
+    """
+    Write the symbols, one per line (sorted), replacing the file atomically so readers never see a partial listing.
+    :param symbols_file: The location of the file to write
+    :param symbols: The symbols to write
+    :return:
+    """
+    os.makedirs(os.path.dirname(symbols_file), exist_ok=True)
+    tmp_file = '{}.{}.tmp'.format(symbols_file, os.getpid())
+    with open(tmp_file, 'w') as fd:
+        fd.write('\n'.join(sorted(symbols)))
+    os.replace(tmp_file, symbols_file)
+
+
+def read_symbols_file(symbols_file: str) -> FrozenSet[str]:
+    with open(symbols_file, 'r') as fd:
+        return frozenset(fd.read().split('\n')) - {''}
+
+
+class SymbolDirectory:
+    """
+    Is singleton so that each symbol listing (e.g. all listed stocks, or all digital currencies of a provider) is only
+    loaded once per process and then shared by all adapters and runners. Listings are held as frozensets, so checking
+    if a symbol is listed doesn't scan the listing. Each listing is also saved as a compact symbols file (one symbol per
+    line) next to the raw response it was extracted from, so other processes (and later runs using the same cache
+    date) only read the symbols and don't parse the full response again.
+    """
+    instance = None
+    listings: Dict[str, FrozenSet[str]]
+    loading: Dict[str, threading.Lock]
+    mutex: threading.Lock
+
+    def __init__(self):
+        raise RuntimeError('Use get_instance() instead')
+
+    @classmethod
+    def get_instance(cls):
+        if cls.instance is None:
+            cls.instance = cls.__new__(cls)
+            cls.instance.listings = {}
+            cls.instance.loading = {}
+            cls.instance.mutex = threading.Lock()
+        return cls.instance
+
+    def get_symbols(self, symbols_file: str, get_symbols: Callable[[], Iterable[str]]) -> FrozenSet[str]:
+        """
+        Get the symbols of a listing, loading it the first time it is asked for in this process.
+        :param symbols_file: The file the listing is saved in, this is also the key of the listing
+        :param get_symbols: Called to get the symbols (e.g. from the raw response) if the listing isn't saved yet
+        :return: The symbols in the listing
+        """
+        symbols = self.listings.get(symbols_file)
+        if symbols is not None:
+            return symbols
+        with self.mutex:
+            loading: threading.Lock = self.loading.setdefault(symbols_file, threading.Lock())
+        with loading:  # only one thread loads a listing, without blocking threads that are loading other listings
+            symbols = self.listings.get(symbols_file)
+            if symbols is None:
+                if os.path.exists(symbols_file):
+                    logging.debug('Using symbols file: {}'.format(file_link_format(symbols_file)))
+                    symbols = read_symbols_file(symbols_file)
+                else:
+                    symbols = frozenset(get_symbols())
+                    write_symbols_file(symbols_file, symbols)
+                    logging.debug('Symbols saved to: {}'.format(file_link_format(symbols_file)))
+                self.listings[symbols_file] = symbols
+        return symbols
+
+    def reset(self) -> None:
+        with self.mutex:
+            self.listings = {}
+            self.loading = {}
@@ -54,7 +54,7 @@ class Job:
     function: Callable
     # args
     state: JobState
-    exception: Optional[Exception]
+    exception: Optional[BaseException]
     # fileHandler
     # mainFilters
     key_override: str
@@ -17,22 +17,91 @@
 import logging
 import multiprocessing
 import os
+import signal
 import threading
 import traceback
 from datetime import timedelta, datetime
 from multiprocessing.pool import ApplyResult
-from typing import Dict
+from typing import Dict, Any, Optional, Tuple, Iterator, List
 
 from main.executors.executor import Executor
 from main.executors.job import Job, JobState
 
 
+PARALLEL_OPTIONS = ['streaming', 'affinity', 'chunk_size', 'max_chunk_size', 'max_in_flight', 'job_timeout_seconds',
+                    'max_tasks_per_child']
+
+
+class JobTimeoutException(BaseException):
+    """
+    Raised in a worker when a job runs for longer than the job timeout. This is not an Exception (like
+    KeyboardInterrupt) so that it is not caught by the jobs themselves, e.g. by an except Exception around a request.
+    """
+    pass
+
+
+class UnknownParallelOptionException(RuntimeError):
+    pass
+
+
+def raise_job_timeout(signum, frame):
+    raise JobTimeoutException("The job did not finish within the job timeout")
+
+
 class ParallelExecutor(Executor):
+    """
+    Runs the jobs in a pool of worker processes.
+
+    By default every job is submitted up front and the results are collected in the order the jobs were added. With
+    streaming set the jobs are instead fed to the workers in chunks of chunk_size, no more than max_in_flight chunks are
+    submitted ahead of the results that have been processed, and each result is processed as soon as it completes (in
+    completion order), so a large number of jobs runs in constant memory. In this mode job_timeout_seconds limits the
+    run time of each job (in the worker) and max_tasks_per_child recycles the workers after that many chunks.
+
+    With affinity set (and streaming) the jobs of the same group (see get_group) are sent to a worker together, so the
+    worker can reuse what it loaded for the first job of the group in the rest of them. Large groups are split so that
+    there are still enough chunks for all the workers, and so that no chunk has more than max_chunk_size jobs (unless
+    chunk_size is larger), which keeps the window and the work lost to a failed worker small however many jobs there
+    are.
+    """
     timeout_seconds: float
+    processes: int
+    streaming: bool
+    affinity: bool
+    chunk_size: int
+    max_chunk_size: int
+    max_in_flight: Optional[int]
+    job_timeout_seconds: Optional[float]
+    max_tasks_per_child: Optional[int]
 
     def __init__(self, log_dir):
         super(ParallelExecutor, self).__init__(log_dir)
         self.timeout_seconds: int = 30  # WARNING: This is the time from one result check to the not total job time
+        self.processes = multiprocessing.cpu_count()
+        self.streaming = False
+        self.affinity = False
+        self.chunk_size = 1
+        self.max_chunk_size = 16
+        self.max_in_flight = None  # defaults to a few chunks per process
+        self.job_timeout_seconds = None
+        self.max_tasks_per_child = None
+
+    def set_options(self, options: Dict[str, Any]) -> None:
+        """
+        Set the scheduling options, e.g. from the parallel_options of a runner config.
+        :param options: The name (one of the PARALLEL_OPTIONS) and value of each option to set
+        :return:
+        """
+        for name, value in options.items():
+            if name not in PARALLEL_OPTIONS:
+                raise UnknownParallelOptionException("Unknown parallel option '{}', expected one of: {}".format(
+                    name, ', '.join(PARALLEL_OPTIONS)))
+            setattr(self, name, value)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['jobs'] = []  # the executor is sent with every job, the workers only need the job they are running
+        return state
 
     @staticmethod
     def start_process():
@@ -54,8 +123,12 @@ class ParallelExecutor(Executor):
         self.configure_logging()
         if not os.path.exists(self.log_dir):
             os.makedirs(self.log_dir)
+        if self.streaming:
+            all_passed = self.stream_results()
+            self.restore_logging()
+            return all_passed
         pool = multiprocessing.Pool(
-            processes=multiprocessing.cpu_count(),
+            processes=self.processes,
             initializer=self.start_process
         )
         results: Dict[Job, ApplyResult] = {}
@@ -110,7 +183,7 @@ class ParallelExecutor(Executor):
         start_printing: datetime = datetime.now() + timedelta(seconds=10)
         for job, result in results.items():
             try:
-                job.state = JobState.PASSED if result.get(timeout=self.timeout_seconds) else JobState.FAILED
+                self.process_result(job, result.get(timeout=self.timeout_seconds))
                 done += 1
                 if datetime.now() > start_printing:
                     logging.info("Complete: {}/{}".format(done, total))
@@ -128,6 +201,142 @@ class ParallelExecutor(Executor):
                 all_passed = False
         return all_passed
 
+    def process_result(self, job: Job, returned: Any) -> None:
+        """
+        Process the value that a job returned (in this process), override this to keep what the jobs return.
+        :param job: The job that completed
+        :param returned: The value the job returned
+        :return:
+        """
+        job.state = JobState.PASSED if returned else JobState.FAILED
+
+    def get_group(self, job: Job) -> Optional[str]:
+        """
+        Get the group of a job, jobs of the same group are run by the same worker when using affinity.
+        :param job: The job
+        :return: The group, or None if the job is not in a group
+        """
+        return None
+
+    def get_chunks(self) -> List[List[int]]:
+        """
+        Split the jobs into the chunks that are sent to the workers.
+        :return: The indexes of the jobs in each chunk, in the order the chunks are sent
+        """
+        indexes = list(range(len(self.jobs)))
+        if not self.affinity:
+            return [indexes[start:start + self.chunk_size] for start in range(0, len(indexes), self.chunk_size)]
+        groups: Dict[Optional[str], List[int]] = {}
+        for index in indexes:
+            groups.setdefault(self.get_group(self.jobs[index]), []).append(index)
+        # split large groups so that all the workers get some, and so that the chunks stay small with many jobs
+        size = max(min(-(-len(indexes) // self.processes), self.max_chunk_size), self.chunk_size)
+        chunks: List[List[int]] = []
+        for group_indexes in groups.values():
+            chunks += [group_indexes[start:start + size] for start in range(0, len(group_indexes), size)]
+        return chunks
+
+    def get_max_in_flight(self) -> int:
+        """
+        :return: The max number of chunks that are submitted ahead of the results that have been processed
+        """
+        max_in_flight = self.processes * 4 if self.max_in_flight is None else self.max_in_flight
+        return max(max_in_flight, 1)  # at least one chunk, else the feed would wait on itself
+
+    def stream_results(self) -> bool:
+        """
+        Run the jobs, processing the result of each as it completes.
+        :return: True if all the jobs passed
+        """
+        all_passed = True
+        done = 0
+        total = len(self.jobs)
+        start_printing: datetime = datetime.now() + timedelta(seconds=10)
+        for job, returned, exception in self.imap_jobs():
+            if exception is None:
+                try:
+                    self.process_result(job, returned)
+                except Exception as process_exception:
+                    exception = process_exception
+            if isinstance(exception, JobTimeoutException):
+                logging.error("EXCEPTION: Timeout while running job {} (after {}s)".format(job.get_key(),
+                                                                                         self.job_timeout_seconds))
+                job.exception = exception
+                job.state = JobState.TIMEOUT
+            elif exception is not None:
+                logging.error("Caught exception while getting result - the job should've handled reporting of this "
+                              "exception: {} (see log for debug which has stacktrace)".format(exception))
+                job.exception = exception
+                job.state = JobState.EXCEPTION
+            done += 1
+            if datetime.now() > start_printing:
+                logging.info("Complete: {}/{}".format(done, total))
+            if job.state != JobState.PASSED:
+                all_passed = False
+        return all_passed
+
+    def imap_jobs(self) -> Iterator[Tuple[Job, Any, Optional[BaseException]]]:
+        """
+        Run the jobs in the workers and get the results as they complete. The chunks of jobs are only fed to the
+        workers while fewer than max_in_flight of them have results that were not taken yet.
+        :return: (job, returned, exception) For each job in completion order, where exception is what the job raised
+        """
+        chunks = self.get_chunks()
+        window = threading.Semaphore(self.get_max_in_flight())
+        stopped = threading.Event()
+        pool = multiprocessing.Pool(
+            processes=self.processes,
+            initializer=self.start_process,
+            maxtasksperchild=self.max_tasks_per_child
+        )
+        try:
+            for results in pool.imap_unordered(self.run_indexed_jobs, self.feed_jobs(chunks, window, stopped)):
+                window.release()
+                for index, returned, exception in results:
+                    yield self.jobs[index], returned, exception
+            pool.close()
+            pool.join()
+        finally:
+            stopped.set()
+            window.release()  # wake the feed if it is waiting, so that the pool can be terminated
+            pool.terminate()
+
+    def feed_jobs(self, chunks: List[List[int]], window: threading.Semaphore,
+                  stopped: threading.Event) -> Iterator[List[Tuple[int, Job]]]:
+        for chunk in chunks:
+            window.acquire()
+            if stopped.is_set():
+                return
+            for index in chunk:
+                self.jobs[index].state = JobState.PENDING
+            yield [(index, self.jobs[index]) for index in chunk]
+
+    def run_indexed_jobs(self, indexed_jobs: List[Tuple[int, Job]]) -> List[Tuple[int, Any, Optional[BaseException]]]:
+        """
+        Run a chunk of jobs in a worker, one after the other.
+        :param indexed_jobs: (index, job) The index of each job in the jobs and the job to run
+        :return: (index, returned, exception) The index of each job, what it returned and what it raised
+        """
+        return [self.run_indexed_job(indexed_job) for indexed_job in indexed_jobs]
+
+    def run_indexed_job(self, indexed_job: Tuple[int, Job]) -> Tuple[int, Any, Optional[BaseException]]:
+        """
+        Run a job in a worker, this catches what the job raises so that the result can still be matched to the job.
+        :param indexed_job: (index, job) The index of the job in the jobs and the job to run
+        :return: (index, returned, exception) The index of the job, what it returned and what it raised
+        """
+        index, job = indexed_job
+        if self.job_timeout_seconds is not None:
+            signal.signal(signal.SIGALRM, raise_job_timeout)
+            signal.setitimer(signal.ITIMER_REAL, self.job_timeout_seconds)
+        try:
+            return index, self.run_job(job), None
+        except (Exception, JobTimeoutException) as exception:
+            return index, None, exception
+        finally:
+            if self.job_timeout_seconds is not None:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+
     def run_job(self, job: Job):
         try:
             job.start_logging(self.log_dir)
@@ -139,7 +348,7 @@ class ParallelExecutor(Executor):
             job.state = JobState.RUNNING
             returned = job.function(*job.args)
             logging.debug("Job returned: {}".format(returned))
-        except Exception:
+        except (Exception, JobTimeoutException):
             logging.error("Exception was {}\nEXCEPTION: Caught while running job".format(traceback.format_exc()))
             raise
         finally:
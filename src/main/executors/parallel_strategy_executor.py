@@ -15,16 +15,15 @@
 #  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
 
 import logging
-import multiprocessing
 import os
-import traceback
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Union, Tuple
 
+from main.application.adapter_data_cache import AdapterDataCache
 from main.common.locations import file_link_format
 from main.executors.job import Job, JobState
 from main.executors.parallel_executor import ParallelExecutor
 from main.application.strategy import Strategy
+from main.application.strategy_summary import StrategySummary, run_and_summarize
 
 
 class StrategyJob(Job):
@@ -36,54 +35,103 @@ class StrategyJob(Job):
 
 
 class ParallelStrategyExecutor(ParallelExecutor):
+    """
+    Runs strategies in worker processes. By default each worker sends the whole strategy back, including the data of
+    all of its adapters. With summarize set the workers only send back a StrategySummary, which is much smaller for
+    large matrices, and the full strategy is only materialized (run again) in this process if it is asked for.
+
+    With streaming the results are processed in the order they complete, they are put back in the order the
+    strategies were added when all are done. Streaming bounds the jobs that are in flight, but what each job returns is
+    still kept in processed_strategies, so use it with summarize for large runs (else every full strategy is kept).
+
+    Each worker keeps the adapter data it retrieved for the last data_cache_size requests (see AdapterDataCache), so
+    later strategies on the same symbol in the same worker skip reading and parsing the data. Streaming and affinity
+    are on by default, so the strategies of the same group (symbol) are run in the same worker and reuse the data. The
+    hits are reported at the end.
+    """
     timeout_seconds: Optional[float]
-    processed_strategies: Dict[str, List[Strategy]]
+    processed_strategies: Dict[str, List[Union[Strategy, StrategySummary]]]
+    processed_jobs: Dict[str, List[Job]]
+    summarize: bool
+    data_cache_size: int
+    data_hits: int
+    data_misses: int
 
-    def __init__(self, log_dir):
+    def __init__(self, log_dir, summarize: bool = False):
         super().__init__(log_dir)
         self.timeout_seconds = None
         self.processed_strategies = {}
+        self.processed_jobs = {}
+        self.streaming = True
+        self.affinity = True
+        self.summarize = summarize
+        self.data_cache_size = 16
+        self.data_hits = 0
+        self.data_misses = 0
 
     def add_strategy(self, function, args, group: str, key: str):
-        self.add_job(StrategyJob(function, args, group, key))
+        if self.summarize:
+            self.add_job(StrategyJob(run_and_summarize, (function,) + tuple(args), group, key))
+        else:
+            self.add_job(StrategyJob(function, args, group, key))
 
     def get_log_file(self):
         log_file = os.path.join(self.log_dir, 'strategyRunner.log')
         return log_file
 
-    def process_results(self, results):
-        all_passed = True
-        done = 0
-        total = len(results)
-        start_printing: datetime = datetime.now() + timedelta(seconds=10)
-        for job, result in results.items():
-            try:
-                strategy: Strategy = result.get(timeout=self.timeout_seconds)
-                group = job.group
-                if group not in self.processed_strategies:
-                    self.processed_strategies[group] = []
-                self.processed_strategies[group].append(strategy)
-                # expect data to be present
-                job.state = JobState.PASSED if not strategy.portfolio.data.empty else JobState.FAILED
-                done += 1
-                if datetime.now() > start_printing:
-                    logging.info("Complete: {}/{}".format(done, total))
-            except multiprocessing.TimeoutError:
-                logging.error(
-                    "Exception was {}\nEXCEPTION: Timeout while getting job result".format(traceback.format_exc()))
-                job.state = JobState.TIMEOUT
-            except Exception as exception:
-                logging.error("Caught exception while getting result - the job should've handled reporting of this "
-                              "exception: {} (see log for debug which has stacktrace)".format(exception))
-                logging.debug("Exception was {}\nEXCEPTION: Caught while getting result".format(traceback.format_exc()))
-                job.exception = exception
-                job.state = JobState.EXCEPTION
-            if job.state != JobState.PASSED:
-                all_passed = False
-        return all_passed
+    def __getstate__(self):
+        state = super().__getstate__()
+        state['processed_strategies'] = {}
+        state['processed_jobs'] = {}
+        return state
+
+    def get_group(self, job: StrategyJob) -> Optional[str]:
+        return job.group
+
+    def run_job(self, job: StrategyJob) -> Tuple[Union[Strategy, StrategySummary], int, int]:
+        """
+        Run a job in a worker, keeping the adapter data that is retrieved for the next jobs of the worker.
+        :param job: The job to run
+        :return: (returned, hits, misses) What the job returned and the adapter data cache hits and misses of the job
+        """
+        cache: AdapterDataCache = AdapterDataCache.get_instance()
+        cache.max_entries = self.data_cache_size
+        hits, misses = cache.hits, cache.misses
+        returned = super().run_job(job)
+        return returned, cache.hits - hits, cache.misses - misses
+
+    def process_result(self, job: StrategyJob, returned: Tuple[Union[Strategy, StrategySummary], int, int]) -> None:
+        strategy, hits, misses = returned
+        self.data_hits += hits
+        self.data_misses += misses
+        group = job.group
+        if group not in self.processed_strategies:
+            self.processed_strategies[group] = []
+            self.processed_jobs[group] = []
+        self.processed_strategies[group].append(strategy)
+        self.processed_jobs[group].append(job)
+        # expect data to be present
+        if isinstance(strategy, StrategySummary):
+            strategy.set_run(job.args[0], job.args[1:])  # the strategy in this process was not run
+            job.state = JobState.PASSED if strategy.has_results() else JobState.FAILED
+        else:
+            job.state = JobState.PASSED if not strategy.portfolio.data.empty else JobState.FAILED
+
+    def sort_processed_strategies(self) -> None:
+        """
+        Put the processed strategies of each group in the order their jobs were added.
+        :return:
+        """
+        positions: Dict[Job, int] = {job: position for position, job in enumerate(self.jobs)}
+        for group, jobs in self.processed_jobs.items():
+            order = sorted(range(len(jobs)), key=lambda index: positions[jobs[index]])
+            strategies = self.processed_strategies[group]
+            self.processed_strategies[group] = [strategies[index] for index in order]
+            self.processed_jobs[group] = [jobs[index] for index in order]
 
     def start(self):
         success = super().start()
+        self.sort_processed_strategies()
         logging.info('-- Strategies Complete - results follow... {}'.format(file_link_format(self.get_log_file())))
         (passed, failed) = self.get_results()
         passed_count = len(passed)
@@ -100,4 +148,8 @@ class ParallelStrategyExecutor(ParallelExecutor):
             logging.info('Strategies - ALL PASSED ({}/{})'.format(passed_count, total))
         else:
             logging.error('Strategies - {}/{} FAILED'.format(failed_count, total))
+        if self.data_hits + self.data_misses > 0:
+            logging.info('Adapter data reused {} of {} times in the workers ({:0.1f}% hit rate)'.format(
+                self.data_hits, self.data_hits + self.data_misses,
+                100.0 * self.data_hits / (self.data_hits + self.data_misses)))
         return success
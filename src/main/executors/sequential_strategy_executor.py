@@ -17,12 +17,13 @@
 import logging
 import os
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Union
 
 from main.common.locations import file_link_format
 from main.executors.job import Job, JobState
 from main.executors.sequential_executor import SequentialExecutor
 from main.application.strategy import Strategy
+from main.application.strategy_summary import StrategySummary
 
 
 class StrategyJob(Job):
@@ -34,11 +35,17 @@ class StrategyJob(Job):
 
 
 class SequentialStrategyExecutor(SequentialExecutor):
-    processed_strategies: Dict[str, List[Strategy]]
+    """
+    Runs strategies one after the other in this process. With summarize set the processed strategies are
+    StrategySummary objects (the same as the ParallelStrategyExecutor), which hold on to the strategies that were run.
+    """
+    processed_strategies: Dict[str, List[Union[Strategy, StrategySummary]]]
+    summarize: bool
 
-    def __init__(self, log_dir):
+    def __init__(self, log_dir, summarize: bool = False):
         super().__init__(log_dir)
         self.processed_strategies = {}
+        self.summarize = summarize
 
     def add_strategy(self, function, args, group: str, key: str):
         self.add_job(StrategyJob(function, args, group, key))
@@ -57,9 +64,14 @@ class SequentialStrategyExecutor(SequentialExecutor):
             group = job.group
             if group not in self.processed_strategies:
                 self.processed_strategies[group] = []
-            self.processed_strategies[group].append(strategy)
             # expect data to be present
             job.state = JobState.PASSED if strategy is not None and not strategy.portfolio.data.empty else JobState.FAILED
+            if self.summarize and strategy is not None:
+                summary: StrategySummary = StrategySummary(strategy)
+                summary.strategy = strategy  # already run in this process
+                self.processed_strategies[group].append(summary)
+            else:
+                self.processed_strategies[group].append(strategy)
             done += 1
             if datetime.now() > start_printing:
                 logging.info("Complete: {}/{}".format(done, total))
@@ -0,0 +1,170 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+from datetime import datetime
+from typing import Optional, List, Dict
+
+import numpy
+import pandas
+
+from main.application.adapter import Adapter
+from main.application.adapter_collection import AdapterCollection
+from main.application.value_type import ValueType
+from main.portfolio.portfolio import Portfolio, filter_list_times
+
+
+class ArrayPortfolio(Portfolio):
+    """
+    A Portfolio that runs the bar loop over preallocated NumPy arrays instead of growing the data DataFrame one row per
+    bar. The timeline, the close prices, the quantities and the value for each bar are allocated once when the
+    remaining times are set, bars are then walked with an integer cursor, and the data DataFrame is only materialized
+    when it is asked for (i.e. once at the end of a run).
+
+    The results are the same as the Portfolio, so it can be used anywhere a Portfolio is used.
+    """
+    times: List[datetime]
+    time_index: pandas.DatetimeIndex
+    cursor: int
+    symbols: List[str]
+    close_values: numpy.ndarray
+    quantity_values: numpy.ndarray
+    values: numpy.ndarray
+    _data: Optional[pandas.DataFrame]
+
+    def __init__(self, title: str, quantities: Dict[str, float],
+                 start_time: Optional[datetime] = None, end_time: Optional[datetime] = None):
+        super().__init__(title, quantities, start_time, end_time)
+        self.times = []
+        self.time_index = pandas.DatetimeIndex([])
+        self.cursor = 0
+        self.symbols = []
+        self.close_values = numpy.empty((0, 0))
+        self.quantity_values = numpy.empty((0, len(quantities)))
+        self.values = numpy.empty(0)
+
+    @property
+    def data(self) -> pandas.DataFrame:
+        if self._data is None:
+            self._data = pandas.DataFrame({ValueType.CLOSE.value: self.values[:self.cursor]},
+                                          index=self.get_completed_times())
+        return self._data
+
+    @data.setter
+    def data(self, data: pandas.DataFrame) -> None:
+        if not data.empty:
+            raise RuntimeError("The data of an ArrayPortfolio is built from the bars that were run and cannot be set")
+        self._data = None
+
+    def get_original_value(self) -> float:
+        if self.cursor == 0:
+            raise IndexError("There is no original value as no bars have been completed")
+        return self.values[0]
+
+    def get_latest_value(self) -> float:
+        if self.cursor == 0:
+            raise IndexError("There is no latest value as no bars have been completed")
+        return self.values[self.cursor - 1]
+
+    def get_completed_time_from_index(self, index: int) -> Optional[datetime]:
+        time_from_index = None
+        if self.cursor > 0:
+            if not -self.cursor <= index < self.cursor:
+                raise IndexError("Completed time index {} is out of range for {} times".format(index, self.cursor))
+            time_from_index = self.times[index % self.cursor]
+        return time_from_index
+
+    def get_completed_times(self) -> pandas.DatetimeIndex:
+        """
+        :return: The sorted times of the completed bars, this is a view (not a copy) so it is cheap to call every step
+        """
+        return self.time_index[:self.cursor]
+
+    def calculate_roi(self, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None):
+        completed_times: pandas.DatetimeIndex = self.get_completed_times()
+        first = 0 if start_time is None else completed_times.searchsorted(start_time, side='left')
+        last = self.cursor if end_time is None else completed_times.searchsorted(end_time, side='right')
+        roi = 0.0
+        if first < last:
+            roi = (self.values[last - 1] / self.values[first]) - 1.0
+        return roi
+
+    def set_remaining_times(self, collection: AdapterCollection) -> None:
+        completed_times: List[datetime] = self.times[:self.cursor]
+        remaining_times = set(collection.get_all_times()) - set(completed_times)
+        remaining_times = filter_list_times(self.start_time, self.end_time, list(remaining_times))
+        self.times = completed_times + sorted(remaining_times)
+        self.time_index = pandas.DatetimeIndex(self.times)
+        collection.set_timeline(self.times)
+        count = len(self.times)
+        self.symbols = collection.get_symbols()
+        self.close_values = numpy.empty((count, len(self.symbols)))
+        for column, symbol in enumerate(self.symbols):
+            adapter: Adapter = collection.get_adapter(symbol, ValueType.CLOSE)
+            closes: numpy.ndarray = adapter.data[ValueType.CLOSE].to_numpy()
+            self.close_values[:, column] = closes[collection.get_timeline_positions(adapter)]
+        values = numpy.empty(count)
+        values[:self.cursor] = self.values[:self.cursor]
+        self.values = values
+        quantity_values = numpy.zeros((count, len(self.quantities)))
+        quantity_values[:self.cursor, :self.quantity_values.shape[1]] = self.quantity_values[:self.cursor]
+        self.quantity_values = quantity_values
+
+    def get_remaining_times(self) -> List[datetime]:
+        return self.times[self.cursor:]
+
+    def has_remaining_times(self) -> bool:
+        return self.cursor < len(self.times)
+
+    def get_present_time(self, collection: AdapterCollection):
+        return self.times[self.cursor]
+
+    def run_to(self, collection: AdapterCollection, to_date: datetime):
+        base_symbol = collection.get_base_symbol()
+        while self.cursor < len(self.times) and self.times[self.cursor] <= to_date:
+            time = self.times[self.cursor]
+            if self.report_collection:
+                collection.report(time)
+            value = 0.0
+            for order in self.order_book.get_satisfied(time, collection):
+                self.close_order(base_symbol, order, time, collection)
+            for column, symbol in enumerate(self.symbols):
+                value += self.close_values[self.cursor, column] * self.quantities[symbol]
+            if len(self.quantities) > self.quantity_values.shape[1]:
+                self.add_quantity_columns()
+            self.quantity_values[self.cursor] = list(self.quantities.values())
+            self.values[self.cursor] = value + self.quantities[base_symbol]
+            self.cursor += 1
+        self._data = None
+
+    def add_quantity_columns(self) -> None:
+        """
+        Add a column for each asset that was added to the quantities (e.g. by an order for a new symbol) since the
+        quantities were allocated, the asset had no quantity in the bars before it was added.
+        :return:
+        """
+        quantity_values = numpy.zeros((len(self.quantity_values), len(self.quantities)))
+        quantity_values[:, :self.quantity_values.shape[1]] = self.quantity_values
+        self.quantity_values = quantity_values
+
+    def get_quantity_data(self) -> pandas.DataFrame:
+        """
+        Get the quantities of each of the assets held for every completed bar.
+        :return: A DataFrame with the completed times as the index and a column per asset
+        """
+        return pandas.DataFrame(self.quantity_values[:self.cursor], index=self.get_completed_times(),
+                                columns=list(self.quantities.keys())[:self.quantity_values.shape[1]])
@@ -0,0 +1,97 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+from datetime import datetime
+from typing import Optional, Any
+
+import numpy
+import pandas
+from pandas.api.types import DatetimeTZDtype
+
+
+class CompletedTimes:
+    """
+    The sorted times of the bars that a portfolio has completed. Bars are completed in order, so times are appended
+    to the end of a preallocated array (growing it by doubling when full), which makes appending, the first, the last
+    and the k-th from the end all O(1) and the whole timeline available as an index without copying.
+
+    A time that is before the last time is inserted in order, this copies the times but is never expected in a run.
+    """
+    values: numpy.ndarray
+    count: int
+    dtype: Any
+
+    def __init__(self, capacity: int = 256):
+        """
+        :param capacity: The number of times to allocate space for up front
+        """
+        self.values = numpy.empty(capacity, dtype='datetime64[ns]')
+        self.count = 0
+        self.dtype = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, time: datetime) -> None:
+        """
+        Add the time of a completed bar, adding a time that was already completed does nothing.
+        :param time: The time of the bar
+        :return:
+        """
+        timestamp: pandas.Timestamp = pandas.Timestamp(time)
+        if self.dtype is None:
+            self.dtype = numpy.dtype('datetime64[ns]') if timestamp.tz is None else DatetimeTZDtype(tz=timestamp.tz)
+        value: numpy.datetime64 = numpy.datetime64(timestamp.value, 'ns')
+        if self.count == 0 or value > self.values[self.count - 1]:
+            if self.count == len(self.values):
+                values = numpy.empty(max(2 * len(self.values), 1), dtype='datetime64[ns]')
+                values[:self.count] = self.values[:self.count]
+                self.values = values
+            self.values[self.count] = value
+            self.count += 1
+        else:
+            position: int = int(numpy.searchsorted(self.values[:self.count], value))
+            if self.values[position] != value:  # a new array so that indexes returned earlier don't change
+                self.values = numpy.insert(self.values[:self.count], position, value)
+                self.count += 1
+
+    def get(self, index: int) -> Optional[pandas.Timestamp]:
+        """
+        Get a completed time by its position, negative positions count from the end (e.g. -1 is the last time).
+        :param index: The position of the time
+        :return: The time, None if no bars are completed
+        """
+        if self.count == 0:
+            return None
+        if not -self.count <= index < self.count:
+            raise IndexError("Completed time index {} is out of range for {} times".format(index, self.count))
+        value: int = int(self.values[index % self.count].astype('int64'))
+        return pandas.Timestamp(value, tz=getattr(self.dtype, 'tz', None))
+
+    def get_index(self) -> pandas.DatetimeIndex:
+        """
+        :return: All of the completed times, this is a view of the times (not a copy)
+        """
+        if self.count == 0:
+            return pandas.DatetimeIndex([])
+        return pandas.DatetimeIndex(pandas.arrays.DatetimeArray(self.values[:self.count], dtype=self.dtype))
+
+    def clear(self) -> None:
+        self.values = numpy.empty(len(self.values), dtype='datetime64[ns]')
+        self.count = 0
+        self.dtype = None
@@ -19,11 +19,12 @@ import inspect
 import logging
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Optional, Tuple
 
 import pandas
 
 from main.application.adapter_collection import AdapterCollection
+from main.common.lazy_message import LazyMessage
 from main.common.time_zones import TimeZones
 from main.application.value_type import ValueType
 
@@ -96,12 +97,34 @@ class Order:
             satisfied = self.attempt_to_fill_buy(instance, collection)
         return satisfied
 
+    def get_fill_condition(self) -> Optional[Tuple[ValueType, float]]:
+        """
+        Describe when the order is satisfied as a price condition, so that an order book can find all of the satisfied
+        orders with a range query instead of asking each order. The order is satisfied on a bar when
+        direction * price <= direction * value (of the bar), e.g. (ValueType.LOW, -1.0) is satisfied when the low of the
+        bar is at or below the price. The price must not change while the order is open.
+        :return: The value type of the bar and the direction, None if is_satisfied must be asked (e.g. market orders)
+        """
+        return None
+
     def attempt_to_fill_sell(self, time: datetime, collection: AdapterCollection) -> type(None):
         raise RuntimeError("Implement: {}".format(inspect.currentframe().f_code.co_name))
 
     def attempt_to_fill_buy(self, time: datetime, collection: AdapterCollection) -> type(None):
         raise RuntimeError("Implement: {}".format(inspect.currentframe().f_code.co_name))
 
+    def log_adjustment(self, adjusted: str, to: str, price: float) -> None:
+        """
+        Log that the price is being adjusted before the order is closed, the message is only formatted if it is emitted.
+        :param adjusted: What is adjusted, e.g. 'close price'
+        :param to: What it is adjusted to, e.g. 'high'
+        :param price: The price it is adjusted to
+        :return:
+        """
+        from_price: float = self.price
+        logging.info(LazyMessage(lambda: "Adjusting {} from {:0.3f} to {} {:0.3f} for: {}".format(
+            adjusted, from_price, to, price, self)))
+
     def place(self, data_adapter):
         raise RuntimeError("Implement: {}".format(inspect.currentframe().f_code.co_name))
 
@@ -133,10 +156,10 @@ class MarketOrder(Order):
 
     def adjust_price_before_close(self, high, low, open_price, close_price):
         if high < self.price:
-            logging.info("Adjusting close price from {:0.3f} to high {:0.3f} for: {}".format(self.price, high, self))
+            self.log_adjustment('close price', 'high', high)
             self.price = high
         elif low > self.price:
-            logging.info("Adjusting close price from {:0.3f} to low {:0.3f} for: {}".format(self.price, low, self))
+            self.log_adjustment('close price', 'low', low)
             self.price = low
 
 
@@ -146,6 +169,9 @@ class LimitOrder(Order):
         self.price = price
         self.enumeration = "l"
 
+    def get_fill_condition(self) -> Optional[Tuple[ValueType, float]]:
+        return (ValueType.LOW, -1.0) if self.order_side == OrderSide.BUY else (ValueType.HIGH, 1.0)
+
     def attempt_to_fill_buy(self, time: datetime, collection: AdapterCollection):
         low_price: float = collection.get_value(self.symbol, time, ValueType.LOW)
         satisfied = (low_price <= self.price)
@@ -171,9 +197,7 @@ class LimitOrder(Order):
                     "Limit sell order attempted to close at price {:0.3f} but high was {:0.3f} for: {}".format(
                         self.price, high, self))
             elif self.order_side == OrderSide.BUY:
-                logging.info(
-                    "Adjusting limit buy order price from {:0.3f} to the high {:0.3f} for: {}".format(self.price, high,
-                                                                                                      self))
+                self.log_adjustment('limit buy order price', 'the high', high)
                 self.price = high
         elif low > self.price:
             if self.order_side == OrderSide.BUY:
@@ -181,9 +205,7 @@ class LimitOrder(Order):
                     "Limit buy order attempted to close at price {:0.3f} but low was {:0.3f} for: {}".format(self.price,
                                                                                                              low, self))
             elif self.order_side == OrderSide.SELL:
-                logging.info(
-                    "Adjusting limit sell order price from {:0.3f} to the low {:0.3f} for: {}".format(self.price, low,
-                                                                                                      self))
+                self.log_adjustment('limit sell order price', 'the low', low)
                 self.price = low
 
 
@@ -193,6 +215,9 @@ class StopOrder(Order):
         self.price = price
         self.enumeration = "t"
 
+    def get_fill_condition(self) -> Optional[Tuple[ValueType, float]]:
+        return (ValueType.HIGH, 1.0) if self.order_side == OrderSide.BUY else (ValueType.LOW, -1.0)
+
     def attempt_to_fill_buy(self, time: datetime, collection: AdapterCollection):
         high_price: float = collection.get_value(self.symbol, time, ValueType.HIGH)
         satisfied = (high_price >= self.price)
@@ -213,17 +238,15 @@ class StopOrder(Order):
 
     def adjust_price_before_close(self, high, low, open_price, close_price):
         if high < self.price:
-            logging.info("Adjusting close price from {:0.3f} to high {:0.3f} for: {}".format(self.price, high, self))
+            self.log_adjustment('close price', 'high', high)
             self.price = high
         elif low > self.price:
-            logging.info("Adjusting close price from {:0.3f} to low {:0.3f} for: {}".format(self.price, low, self))
+            self.log_adjustment('close price', 'low', low)
             self.price = low
         # if the day opens at a price that would trigger the order, then it should execute at open price
         if self.order_side == OrderSide.BUY and open_price > self.price:
-            logging.info(
-                "Adjusting close price from {:0.3f} to open {:0.3f} for: {}".format(self.price, open_price, self))
+            self.log_adjustment('close price', 'open', open_price)
             self.price = open_price
         elif self.order_side == OrderSide.SELL and open_price < self.price:
-            logging.info(
-                "Adjusting close price from {:0.3f} to open {:0.3f} for: {}".format(self.price, open_price, self))
+            self.log_adjustment('close price', 'open', open_price)
             self.price = open_price
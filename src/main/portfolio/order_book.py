@@ -0,0 +1,143 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import math
+from bisect import insort, bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, List, Tuple, Optional
+
+from main.application.adapter_collection import AdapterCollection
+from main.application.value_type import ValueType
+from main.portfolio.order import Order, OrderSide
+
+QueueKey = Tuple[str, ValueType, float]
+QueueEntry = Tuple[float, int, Order]
+
+
+class OrderBook:
+    """
+    The open orders of a portfolio, indexed by symbol and by when they are satisfied so that checking for fills on a
+    bar doesn't ask every open order.
+
+    Orders with a fill condition (limit and stop orders) are kept in queues, one per (symbol, value type, direction),
+    sorted by direction * price. The satisfied orders in a queue are then a prefix of the queue found with one search
+    against the high (or low) of the bar. Other orders (e.g. market orders) are asked one by one. The satisfied orders
+    are returned in the order they were opened, so they are closed in the same order as when every order was asked.
+    """
+    orders: Dict[int, Order]
+    sequences: Dict[int, int]
+    symbol_orders: Dict[str, Dict[int, Order]]
+    queues: Dict[QueueKey, List[QueueEntry]]
+    unconditional: Dict[str, Dict[int, Order]]
+    next_sequence: int
+    open_orders: Optional[List[Order]]
+
+    def __init__(self):
+        self.orders = {}
+        self.sequences = {}
+        self.symbol_orders = {}
+        self.queues = {}
+        self.unconditional = {}
+        self.next_sequence = 0
+        self.open_orders = None
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def add(self, order: Order) -> None:
+        """
+        Add an open order to the book.
+        :param order: The order, its price must not change while it is in the book
+        :return:
+        """
+        sequence: int = self.next_sequence
+        self.next_sequence += 1
+        self.orders[sequence] = order
+        self.sequences[id(order)] = sequence
+        self.symbol_orders.setdefault(order.symbol, {})[sequence] = order
+        condition: Optional[Tuple[ValueType, float]] = order.get_fill_condition()
+        if condition is None:
+            self.unconditional.setdefault(order.symbol, {})[sequence] = order
+        else:
+            value_type, direction = condition
+            insort(self.queues.setdefault((order.symbol, value_type, direction), []),
+                   (direction * order.price, sequence, order))
+        self.open_orders = None
+
+    def remove(self, order: Order) -> None:
+        """
+        Remove an order from the book (e.g. it was closed or canceled).
+        :param order: The order to remove
+        :return:
+        """
+        sequence: int = self.sequences.pop(id(order))
+        del self.orders[sequence]
+        del self.symbol_orders[order.symbol][sequence]
+        condition: Optional[Tuple[ValueType, float]] = order.get_fill_condition()
+        if condition is None:
+            del self.unconditional[order.symbol][sequence]
+        else:
+            value_type, direction = condition
+            queue: List[QueueEntry] = self.queues[(order.symbol, value_type, direction)]
+            del queue[bisect_left(queue, (direction * order.price, sequence))]
+        self.open_orders = None
+
+    def get_open_orders(self) -> List[Order]:
+        """
+        :return: The open orders in the order they were opened, this list must not be modified
+        """
+        if self.open_orders is None:
+            self.open_orders = list(self.orders.values())
+        return self.open_orders
+
+    def get_symbol_orders(self, symbol: str) -> List[Order]:
+        """
+        :param symbol: The symbol to get the orders for
+        :return: The open orders for the symbol in the order they were opened
+        """
+        return list(self.symbol_orders.get(symbol, {}).values())
+
+    def get_side_orders(self, symbol: str, order_side: OrderSide) -> List[Order]:
+        """
+        :param symbol: The symbol to get the orders for
+        :param order_side: The side (buy or sell) to get the orders for
+        :return: The open orders for the symbol and side in the order they were opened
+        """
+        return [order for order in self.symbol_orders.get(symbol, {}).values() if order.order_side == order_side]
+
+    def get_satisfied(self, instance: datetime, collection: AdapterCollection) -> List[Order]:
+        """
+        Find the open orders that are satisfied on a bar, this doesn't remove them from the book.
+        :param instance: The time of the bar
+        :param collection: The collection to get the values of the bar from
+        :return: The satisfied orders in the order they were opened
+        """
+        satisfied: Dict[int, Order] = {}
+        for (symbol, value_type, direction), queue in self.queues.items():
+            if len(queue) == 0:
+                continue
+            value: float = collection.get_value(symbol, instance, value_type)
+            if math.isnan(value):
+                continue
+            for _, sequence, order in queue[:bisect_right(queue, (direction * value, math.inf))]:
+                satisfied[sequence] = order
+        for orders in self.unconditional.values():
+            for sequence, order in orders.items():
+                if order.is_satisfied(instance, collection):
+                    satisfied[sequence] = order
+        return [satisfied[sequence] for sequence in sorted(satisfied)]
@@ -26,7 +26,11 @@ from main.application.adapter import AssetType
 from main.application.adapter_collection import AdapterCollection
 from main.application.time_interval import TimeInterval
 from main.application.value_type import ValueType
+from main.common.lazy_message import LazyMessage
+from main.portfolio.completed_times import CompletedTimes
 from main.portfolio.order import OrderSide, Order
+from main.portfolio.order_book import OrderBook
+from main.portfolio.trade_journal import TradeJournal, TradeEventType
 
 
 def filter_list_times(start_time: Optional[datetime], end_time: Optional[datetime],
@@ -74,12 +78,15 @@ class Portfolio:
     quantities: Dict[str, float]
     end_time: Optional[datetime]
     start_time: Optional[datetime]
-    data: pandas.DataFrame
+    _data: Optional[pandas.DataFrame]
+    completed_times: CompletedTimes
     indicator_data: Dict[str, pandas.DataFrame]
     canceled_orders: List[Order]
     closed_orders: List[Order]
     opened_orders: List[Order]
-    open_orders: List[Order]
+    order_book: OrderBook
+    last_closed_order: Optional[Order]
+    journal: TradeJournal
     remaining_times = List[datetime]
     report_collection: bool = False  # WARNING: fairly large run-time hit when this is enabled
     base_symbol: str
@@ -94,12 +101,15 @@ class Portfolio:
         self.quantities = quantities
         self.end_time = end_time
         self.start_time = start_time
-        self.data = pandas.DataFrame()
+        self._data = None  # created when first used, as creating a DataFrame costs more than the rest of the portfolio
+        self.completed_times = CompletedTimes()
         self.indicator_data = {}
         self.canceled_orders = []
         self.closed_orders = []
         self.opened_orders = []
-        self.open_orders = []
+        self.order_book = OrderBook()
+        self.last_closed_order = None
+        self.journal = TradeJournal()
         self.remaining_times = []
         self.base_symbol = 'USD'
         self.interval = TimeInterval.DAY
@@ -110,6 +120,16 @@ class Portfolio:
             'LTC': AssetType.DIGITAL_CURRENCY,
         }
 
+    @property
+    def data(self) -> pandas.DataFrame:
+        if self._data is None:
+            self._data = pandas.DataFrame()
+        return self._data
+
+    @data.setter
+    def data(self, data: pandas.DataFrame) -> None:
+        self._data = data
+
     def __str__(self):
         as_str = "CAGR = {:8.2f} %".format(self.calculate_cagr() * 100.0)
         as_str += "  ROI = {:8.2f} %".format(self.calculate_roi() * 100.0)
@@ -148,13 +168,18 @@ class Portfolio:
     #         current_value += self.quantities[symbol] * collection.get_value(symbol, instance, ValueType.CLOSE)
     #     return current_value
     #
+    @property
+    def open_orders(self) -> List[Order]:
+        """
+        :return: The open orders in the order they were opened, use open_order, cancel_order and close_order to change
+        """
+        return self.order_book.get_open_orders()
+
     def get_tradable_quantity(self, symbol):
         held_for_trade: float = 0.0
-        for order in self.open_orders:
-            if (symbol == self.base_symbol or symbol == order.symbol) and order.order_side == OrderSide.SELL:
-                held_for_trade += order.amount
-            elif (symbol == self.base_symbol or symbol == order.symbol) and order.order_side == OrderSide.BUY:
-                held_for_trade += order.amount
+        orders = self.open_orders if symbol == self.base_symbol else self.order_book.get_symbol_orders(symbol)
+        for order in orders:
+            held_for_trade += order.amount
         return self.quantities[symbol] - held_for_trade
 
     # def calculate_span(self) -> timedelta:
@@ -190,21 +215,22 @@ class Portfolio:
         :param order: The order to open
         :return:
         """
-        self.open_orders.append(order)
+        self.order_book.add(order)
         self.opened_orders.append(order)
-        order_message = "Opening {}.".format(str(order))
-        portfolio = "Portfolio {}".format(str(self))
-        logging.info("{:<205}{}".format(order_message, portfolio))
+        self.journal.record(TradeEventType.OPENED, order.open_time, order)
+        logging.info(LazyMessage(lambda: "{:<205}{}".format("Opening {}.".format(str(order)),
+                                                            "Portfolio {}".format(str(self)))))
 
     def cancel_order(self, order: Order, instance: datetime):
         order.close_time = instance
-        self.open_orders.remove(order)
+        self.order_book.remove(order)
         self.canceled_orders.append(order)
-        order_message = "Canceling {}.".format(str(order))
-        portfolio = "Portfolio {}".format(str(self))
-        logging.info("{:<205}{}".format(order_message, portfolio))
+        self.journal.record(TradeEventType.CANCELED, instance, order)
+        logging.info(LazyMessage(lambda: "{:<205}{}".format("Canceling {}.".format(str(order)),
+                                                            "Portfolio {}".format(str(self)))))
 
     def close_order(self, base_symbol: str, order: Order, instance: datetime, collection: AdapterCollection):
+        self.order_book.remove(order)  # before adjusting the price, as the order book sorts orders by price
         order.close_time = instance
         high: float = collection.get_value(order.symbol, instance, ValueType.HIGH)
         low: float = collection.get_value(order.symbol, instance, ValueType.LOW)
@@ -237,13 +263,14 @@ class Portfolio:
             raise RuntimeError("After closing order '{}' symbol '{}' was left with a negative balance ({}), add some "
                                "way to protect against this in the strategy.".format(order, order.symbol,
                                                                                      self.quantities[order.symbol]))
-        order_message = "Closing {} on {}.".format(str(order), instance)
-        portfolio = "Portfolio {}  Value = {:12.2f}".format(str(self),
-                                                            get_current_value(instance, collection, self.quantities,
-                                                                              ValueType.CLOSE))
-        logging.info("{:<205}{}".format(order_message, portfolio))
-        self.open_orders.remove(order)
+        self.journal.record(TradeEventType.CLOSED, instance, order)
+        logging.info(LazyMessage(lambda: "{:<205}{}".format(
+            "Closing {} on {}.".format(str(order), instance),
+            "Portfolio {}  Value = {:12.2f}".format(str(self), get_current_value(instance, collection, self.quantities,
+                                                                                 ValueType.CLOSE)))))
         self.closed_orders.append(order)
+        if self.last_closed_order is None or order.close_time > self.last_closed_order.close_time:
+            self.last_closed_order = order
 
     def filter_dict_times(self, data: pandas.Series) -> pandas.Series:
         filtered = data[data.index >= self.start_time] if self.start_time is not None else data
@@ -251,11 +278,10 @@ class Portfolio:
         return filtered
 
     def get_last_closed_order(self) -> Optional[Order]:
-        last_closed_order: Optional[Order] = None
-        for closed_order in self.closed_orders:
-            if last_closed_order is None or (closed_order.close_time > last_closed_order.close_time):
-                last_closed_order = closed_order
-        return last_closed_order
+        """
+        :return: The first order closed on the latest close time, None if no orders are closed
+        """
+        return self.last_closed_order
 
     def get_last_completed_time(self) -> Optional[datetime]:  # this is effectively the current time - 1 index
         last_completed = self.get_completed_time_from_index(-1)
@@ -278,15 +304,14 @@ class Portfolio:
         return first_time
 
     def get_completed_time_from_index(self, index: int) -> Optional[datetime]:
-        time_from_index = None
-        if len(self.data.index) > 0:
-            times_completed = self.get_completed_times()
-            time_from_index = times_completed[index]
+        time_from_index = self.completed_times.get(index)
         return time_from_index
 
-    def get_completed_times(self) -> List[datetime]:
-        times: List[datetime] = sorted(self.data.index)
-        return times
+    def get_completed_times(self) -> pandas.DatetimeIndex:
+        """
+        :return: The sorted times of the completed bars, this is a view (not a copy) so it is cheap to call every step
+        """
+        return self.completed_times.get_index()
 
     def set_remaining_times(self, collection: AdapterCollection) -> None:
         times: List[datetime] = collection.get_all_times()
@@ -296,10 +321,14 @@ class Portfolio:
         remaining_times = filter_list_times(self.start_time, self.end_time, list(remaining_times))
         sorted_remaining = sorted(remaining_times)
         self.remaining_times = sorted_remaining
+        collection.set_timeline(sorted_remaining)
 
     def get_remaining_times(self) -> List[datetime]:
         return self.remaining_times
 
+    def has_remaining_times(self) -> bool:
+        return len(self.remaining_times) > 0
+
     def get_present_time(self, collection: AdapterCollection):
         remaining_times: List[datetime] = self.get_remaining_times()
         present_time = remaining_times[0]
@@ -315,11 +344,7 @@ class Portfolio:
             if self.report_collection:
                 collection.report(time)
             value = 0.0
-            orders_to_close = []  # don't modify the open_orders while iterating...
-            for order in self.open_orders:
-                if order.is_satisfied(time, collection):
-                    orders_to_close.append(order)
-            for order in orders_to_close:
+            for order in self.order_book.get_satisfied(time, collection):
                 self.close_order(collection.get_base_symbol(), order, time, collection)
             for symbol in collection.get_symbols():
                 close_price: float = collection.get_value_closest_before_else_after(symbol, time, ValueType.CLOSE)
@@ -329,6 +354,7 @@ class Portfolio:
             # values.append(value + self.quantities[collection.get_base_symbol()])
             close_value = value + self.quantities[collection.get_base_symbol()]
             self.data.loc[time, ValueType.CLOSE.value] = close_value
+            self.completed_times.append(time)
         for time_to_remove in indexes:
             self.remaining_times.remove(time_to_remove)
 
@@ -361,16 +387,11 @@ class Portfolio:
 
     def calculate_roi(self, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None):
         roi = 0.0
-        if len(self.data.index) > 0:
-            final_value = self.data.iloc[-1, 0]
-            initial_value = self.data.iloc[0, 0]
+        data: pandas.DataFrame = self.data.loc[start_time:end_time]
+        if len(data.index) > 0:
+            final_value = data.iloc[-1, 0]
+            initial_value = data.iloc[0, 0]
             roi = (final_value / initial_value) - 1.0
-        # last_time = end_time if end_time is not None else self.get_last_completed_time()
-        # first_time = start_time if start_time is not None else self.get_first_completed_time()
-        # if last_time is not None and first_time is not None:
-        #     final_value = self.value_data[last_time]
-        #     initial_value = self.value_data[first_time]
-        #     roi = (final_value / initial_value) - 1.0
         return roi
 
 
@@ -0,0 +1,86 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+from datetime import datetime
+from typing import NamedTuple, Optional, Tuple, Dict
+
+from main.application.adapter import AssetType
+from main.application.time_interval import TimeInterval
+from main.application.value_type import ValueType
+from main.portfolio.portfolio import Portfolio
+
+
+class PortfolioSpec(NamedTuple):
+    """
+    An immutable description of the portfolio that strategies start from: the starting quantities, the time bounds, the
+    interval, the adapter classes, the asset type overrides and the Portfolio class (e.g. ArrayPortfolio). Strategies
+    in a parameter grid each create their own (empty) portfolio from the same spec, which is much cheaper than deep
+    copying a template portfolio, and variants (e.g. for each interval) are new specs instead of changes to a shared
+    template.
+    """
+    title: str
+    quantities: Tuple[Tuple[str, float], ...]
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    interval: TimeInterval = TimeInterval.DAY
+    base_symbol: str = 'USD'
+    adapter_classes: Tuple[Tuple[ValueType, type], ...] = ()
+    asset_type_overrides: Optional[Tuple[Tuple[str, AssetType], ...]] = None  # None keeps the Portfolio defaults
+    portfolio_class: type = Portfolio
+
+    @classmethod
+    def of(cls, title: str, quantities: Dict[str, float], start_time: Optional[datetime] = None,
+           end_time: Optional[datetime] = None, interval: TimeInterval = TimeInterval.DAY, base_symbol: str = 'USD',
+           adapter_class: Optional[type] = None, asset_type_overrides: Optional[Dict[str, AssetType]] = None,
+           portfolio_class: type = Portfolio) -> "PortfolioSpec":
+        """
+        Create a spec from the (mutable) values a Portfolio is normally set up with.
+        :param title: The title of the portfolios
+        :param quantities: The starting quantity of each asset
+        :param start_time: The first time the portfolios are run from
+        :param end_time: The last time the portfolios are run to
+        :param interval: The interval of the data the portfolios are run on
+        :param base_symbol: The symbol that the values of the portfolios are in
+        :param adapter_class: The adapter class used for every value type
+        :param asset_type_overrides: The asset types to use for symbols, instead of looking them up
+        :param portfolio_class: The Portfolio class (or subclass) to create
+        :return: The spec
+        """
+        adapter_classes = () if adapter_class is None else tuple([(value_type, adapter_class)
+                                                                 for value_type in ValueType])
+        overrides = None if asset_type_overrides is None else tuple(asset_type_overrides.items())
+        return cls(title, tuple(quantities.items()), start_time, end_time, interval, base_symbol, adapter_classes,
+                   overrides, portfolio_class)
+
+    def with_interval(self, interval: TimeInterval) -> "PortfolioSpec":
+        return self._replace(interval=interval)
+
+    def create(self, portfolio_class: Optional[type] = None) -> Portfolio:
+        """
+        Create a new portfolio from the spec.
+        :param portfolio_class: The Portfolio class (or subclass) to create, None to use the one of the spec
+        :return: The portfolio, it shares nothing with other portfolios created from the spec
+        """
+        portfolio_class = self.portfolio_class if portfolio_class is None else portfolio_class
+        portfolio: Portfolio = portfolio_class(self.title, dict(self.quantities), self.start_time, self.end_time)
+        portfolio.interval = self.interval
+        portfolio.base_symbol = self.base_symbol
+        portfolio.adapter_classes = dict(self.adapter_classes)
+        if self.asset_type_overrides is not None:
+            portfolio.asset_type_overrides = dict(self.asset_type_overrides)
+        return portfolio
@@ -0,0 +1,88 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+import pandas
+
+from main.portfolio.order import Order, OrderSide
+
+
+class TradeEventType(Enum):
+    OPENED = 'opened'
+    CANCELED = 'canceled'
+    CLOSED = 'closed'
+
+
+class TradeEvent:
+    """
+    A compact record of something that happened to an order, the values are copied when the event happens (i.e. the
+    price of a closed order is the price it closed at).
+    """
+    __slots__ = ('event_type', 'time', 'symbol', 'order_side', 'order_type', 'amount', 'price')
+    event_type: TradeEventType
+    time: datetime
+    symbol: str
+    order_side: OrderSide
+    order_type: str
+    amount: float
+    price: Optional[float]
+
+    def __init__(self, event_type: TradeEventType, time: datetime, order: Order):
+        self.event_type = event_type
+        self.time = time
+        self.symbol = order.symbol
+        self.order_side = order.order_side
+        self.order_type = order.enumeration
+        self.amount = order.amount
+        self.price = order.price
+
+
+class TradeJournal:
+    """
+    The events of all of the orders of a portfolio in the order they happened. Recording an event only copies a few
+    values, so it is cheap enough to do for every order during a run, unlike formatting a log message.
+    """
+    events: List[TradeEvent]
+
+    def __init__(self):
+        self.events = []
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def record(self, event_type: TradeEventType, time: datetime, order: Order) -> None:
+        self.events.append(TradeEvent(event_type, time, order))
+
+    def get_events(self, event_type: Optional[TradeEventType] = None) -> List[TradeEvent]:
+        """
+        :param event_type: The type of events to get, None for all of the events
+        :return: The events in the order they happened
+        """
+        if event_type is None:
+            return list(self.events)
+        return [event for event in self.events if event.event_type == event_type]
+
+    def get_data(self) -> pandas.DataFrame:
+        """
+        :return: The events as a table, one row per event
+        """
+        return pandas.DataFrame([{name: getattr(event, name) for name in TradeEvent.__slots__}
+                                 for event in self.events], columns=list(TradeEvent.__slots__))
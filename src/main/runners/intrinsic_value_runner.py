@@ -20,7 +20,7 @@ import logging
 import os
 from datetime import datetime
 from math import ceil
-from typing import Dict, Set, Optional, List
+from typing import Dict, Set, Optional, List, Any, Tuple
 
 import numpy
 import pandas
@@ -28,8 +28,8 @@ from numpy import median
 from sklearn import linear_model
 
 from main.application.adapter import AssetType, Adapter, get_common_start_time, get_common_end_time, \
-    insert_column
-from main.application.adapter_collection import AdapterCollection, filter_adapters
+    insert_columns
+from main.application.adapter_collection import AdapterCollection
 from main.application.argument import Argument, ArgumentKey
 from main.application.runner import Runner, NoSymbolsSpecifiedException, validate_type, get_adapter_class, \
     get_asset_type_overrides, get_copyright_notice
@@ -73,11 +73,11 @@ def report_irr(future_earnings: pandas.Series, common_dividends, at_price, avg_p
 
 def predict_value_type_linear(collection: AdapterCollection, symbol: str, value_type: ValueType,
                               future_time: datetime) -> float:
-    adapter: Adapter = filter_adapters(collection.adapters, symbol, value_type)
+    adapter: Adapter = collection.get_adapter(symbol, value_type)
     start_time = get_common_start_time(adapter.data)
     end_time = get_common_end_time(adapter.data)
     column: pandas.Series = adapter.get_column_between(start_time, end_time, value_type)
-    column.dropna(inplace=True)
+    column = column.dropna()
     column = column.sort_index(ascending=True)
     prediction = predict_value_linear(column, future_time)
     return prediction
@@ -412,7 +412,7 @@ class IntrinsicValueRunner(Runner):
         # A Collection can have multiple symbols tied to a variety of adapters, instead of iterating these right now,
         # we just support one, but if we want to do multiple then we can add support for it
         for name, collection in collections.items():
-            eps_adapter = filter_adapters(collection.adapters, self.symbol, ValueType.EPS)
+            eps_adapter = collection.get_adapter(self.symbol, ValueType.EPS)
             eps_intervals: Set[TimeInterval] = set(
                 [argument.value for argument in eps_adapter.arguments if argument.argument_key ==
                  ArgumentKey.INTERVAL])
@@ -500,7 +500,7 @@ class IntrinsicValueRunner(Runner):
             report.log("Data table for intrinsic value calculation using {}...\n{}".format(
                 self.fundamentals_interval, report_df.to_string()))
 
-            predictions_df = pandas.DataFrame()
+            predictions: Dict[Any, Tuple[List[datetime], List[float]]] = {}
             future_start_time = last_time + interval.timedelta
             intervals = ceil((df.index.max() - df.index.min()) / interval.timedelta)
             for column in value_types:
@@ -515,7 +515,7 @@ class IntrinsicValueRunner(Runner):
                     values = [value if value >= 0 else 0 for value in values]
                 if column in [ValueType.SHARES]:  # if debt trending to negative, then zero it
                     values = [df.loc[last_time, ValueType.SHARES] for value in values]
-                insert_column(predictions_df, column, indexes, values)
+                predictions[column] = (indexes, values)
 
             for column in [IntrinsicValueRunner.LOW_PE, IntrinsicValueRunner.HIGH_PE, IntrinsicValueRunner.ROE]:
                 values = []
@@ -524,7 +524,8 @@ class IntrinsicValueRunner(Runner):
                     future_datetime = future_start_time + it * interval.timedelta
                     indexes.append(future_datetime)
                     values.append(predict_value_linear(df.loc[:, column], future_datetime))
-                insert_column(predictions_df, column, indexes, values)
+                predictions[column] = (indexes, values)
+            predictions_df: pandas.DataFrame = insert_columns(pandas.DataFrame(), predictions)
 
             mean_msg = ""
             use_mean_eps = False
@@ -14,22 +14,27 @@
 #  You should have received a copy of the GNU General Public License
 #  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
 
-import copy
 import logging
+import os
 from datetime import datetime
 from enum import Enum, auto
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Any
 
 from main.application.adapter import AssetType
+from main.application.adapter_collection import share_adapter_data
 from main.application.time_interval import TimeInterval
-from main.application.runner import Runner, get_adapter_class, get_asset_type_overrides, NoSymbolsSpecifiedException
+from main.application.runner import Runner, get_adapter_class, get_asset_type_overrides, NoSymbolsSpecifiedException, \
+    get_portfolio_class
+from main.application.shared_data import SharedDataStore
 from main.application.strategy import Strategy
-from main.application.value_type import ValueType
+from main.application.strategy_summary import StrategySummary
+from main.calculators.indicator_cache import IndicatorCache
 from main.common.locations import get_and_clean_timestamp_dir, Locations
 from main.executors.parallel_executor import ParallelExecutor
 from main.executors.parallel_strategy_executor import ParallelStrategyExecutor
 from main.executors.sequential_strategy_executor import SequentialStrategyExecutor
 from main.portfolio.portfolio import Portfolio
+from main.portfolio.portfolio_spec import PortfolioSpec
 from main.strategies.bounded_rsi import BoundedRsi
 from main.strategies.buy_and_hold import BuyAndHold
 from main.strategies.buy_down_sell_up_trailing import BuyDownSellUpTrailing
@@ -57,8 +62,11 @@ class MatrixRunner(Runner):
     end_time: Optional[datetime]
     graph: bool
     parallel: bool
+    parallel_options: Dict[str, Any]
+    portfolio_class: type
     price_interval: TimeInterval
     report_types: List[MatrixReportType]
+    shared_data: bool
     start_time: Optional[datetime]
     symbols: List[str]
 
@@ -70,8 +78,11 @@ class MatrixRunner(Runner):
         self.end_time = None
         self.graph = False
         self.parallel = True
+        self.parallel_options = {}
+        self.portfolio_class = Portfolio
         self.price_interval = TimeInterval.DAY
         self.report_types = []
+        self.shared_data = False
         self.start_time = None
         self.symbols = []
 
@@ -86,8 +97,11 @@ class MatrixRunner(Runner):
             'end_time': self.end_time,
             'graph': self.graph,
             'parallel': self.parallel,
+            'parallel_options': self.parallel_options,
+            'portfolio_class': self.portfolio_class.__name__,
             'price_interval': self.price_interval.value,
             'report_types': [report_type.name for report_type in self.report_types],
+            'shared_data': self.shared_data,
             'start_time': self.start_time,
             'symbols': self.symbols,
         }
@@ -100,10 +114,16 @@ class MatrixRunner(Runner):
         self.report_types = [MatrixReportType[report_type] for report_type in report_types]
         if 'asset_type_overrides' in config:
             self.asset_type_overrides = get_asset_type_overrides(config['asset_type_overrides'])
+        if 'portfolio_class' in config:
+            self.portfolio_class = get_portfolio_class(config['portfolio_class'])
         if 'graph' in config:
             self.graph = config['graph']
         if 'parallel' in config:
             self.parallel = config['parallel']
+        if 'parallel_options' in config:
+            self.parallel_options = config['parallel_options']
+        if 'shared_data' in config:
+            self.shared_data = config['shared_data']
         if 'base_symbol' in config:
             self.base_symbol = config['base_symbol']
         if 'price_interval' in config:
@@ -125,7 +145,7 @@ class MatrixRunner(Runner):
         return "MatrixRun"
         # return f"{self.price_interval.value.title()}_{self.adapter_class.__name__}"
 
-    def summarize(self, title: str, strategy_matrix: Dict[str, List[Strategy]]):
+    def summarize(self, title: str, strategy_matrix: Dict[str, List[StrategySummary]]):
         logging.info('== {}'.format(title))
         column = 0
         results = {}
@@ -134,19 +154,17 @@ class MatrixRunner(Runner):
         first = True
         for symbol in self.symbols:
             results[symbol] = {}
-            for strategy in strategy_matrix[symbol]:
-                portfolio = strategy.portfolio
+            for summary in strategy_matrix[symbol]:
                 if first:
                     spaces = " " * 14 * column
-                    logging.info('{:>15} : {}{}'.format("", spaces, portfolio.title))
+                    logging.info('{:>15} : {}{}'.format("", spaces, summary.portfolio_title))
                     column += 1
-                interest_rate = portfolio.calculate_cagr()
-                results[symbol][portfolio.title] = interest_rate
-                dates[symbol] = [strategy.collection.get_start_time(symbol, ValueType.CLOSE),
-                                 strategy.collection.get_end_time(symbol, ValueType.CLOSE)]
-                if portfolio.title not in totals:
-                    totals[portfolio.title] = 0.0
-                totals[portfolio.title] += interest_rate
+                interest_rate = summary.cagr
+                results[symbol][summary.portfolio_title] = interest_rate
+                dates[symbol] = [summary.get_start_time(symbol), summary.get_end_time(symbol)]
+                if summary.portfolio_title not in totals:
+                    totals[summary.portfolio_title] = 0.0
+                totals[summary.portfolio_title] += interest_rate
             first = False
         win_counts = {}
         for symbol, rates in results.items():
@@ -243,53 +261,68 @@ class MatrixRunner(Runner):
         strategy_date_dir = get_and_clean_timestamp_dir(locations.get_cache_dir('strategies'))
 
         if self.parallel:
-            strategy_runner = ParallelStrategyExecutor(strategy_date_dir)
+            strategy_runner = ParallelStrategyExecutor(strategy_date_dir, summarize=True)
+            strategy_runner.set_options(self.parallel_options)
         else:
-            strategy_runner = SequentialStrategyExecutor(strategy_date_dir)
+            strategy_runner = SequentialStrategyExecutor(strategy_date_dir, summarize=True)
 
         strategy_matrix: Dict[str, List[Strategy]] = {}
         for symbol in self.symbols:
             strategy_matrix[symbol] = []
             self.add_symbol_strategies(symbol, strategy_matrix)
 
-        for symbol, strategies in strategy_matrix.items():
-            for strategy in strategies:
-                strategy_runner.add_strategy(strategy.run, (), symbol, str(strategy).replace(' ', '_'))
+        with SharedDataStore() as store:
+            if self.parallel and self.shared_data:
+                # workers attach to the data that is loaded once here, instead of each loading its own copy
+                share_adapter_data([adapter for strategies in strategy_matrix.values() for strategy in strategies
+                                    for adapter in strategy.collection.adapters], store)
+
+            for symbol, strategies in strategy_matrix.items():
+                for strategy in strategies:
+                    strategy_runner.add_strategy(strategy.run, (), symbol, str(strategy).replace(' ', '_'))
+                    # break
                 # break
-            # break
-        success = strategy_runner.start()
+            indicator_cache: IndicatorCache = IndicatorCache.get_instance()
+            indicator_cache_dir: Optional[str] = indicator_cache.cache_dir
+            if self.parallel:
+                # workers are separate processes, so they share the indicators that are calculated through the disk
+                indicator_cache.cache_dir = os.path.join(strategy_date_dir, 'indicators')
+            try:
+                success = strategy_runner.start()
+            finally:
+                indicator_cache.cache_dir = indicator_cache_dir
 
-        title = 'Strategies Across Symbols CAGR'
-        self.summarize(title, strategy_runner.processed_strategies)
+            title = 'Strategies Across Symbols CAGR'
+            self.summarize(title, strategy_runner.processed_strategies)
 
-        # draw = True
-        draw = False
-        if draw:
-            visual_date_dir = get_and_clean_timestamp_dir(locations.get_cache_dir('visualizer'))
-            visual_runner = ParallelExecutor(visual_date_dir)
-            for symbol in self.symbols:
-                for strategy in strategy_runner.processed_strategies[symbol]:
-                    visualizer: Visualizer = Visualizer(str(strategy), strategy.collection, [strategy.portfolio])
-                    # visualizer.annotate_canceled_orders = True
-                    visualizer.annotate_opened_orders = True
-                    # visualizer.annotate_open_prices = True
-                    # visualizer.annotate_close_prices = True
-                    # visualizer.draw_high_prices = False
-                    # visualizer.draw_low_prices = False
-                    # visualizer.draw_open_prices = True
-                    # visualizer.draw_close_prices = True
-                    visual_runner.add(visualizer.plot_all, (), str(strategy).replace(' ', '_'))
-            visual_runner.start()
+            # draw = True
+            draw = False
+            if draw:
+                visual_date_dir = get_and_clean_timestamp_dir(locations.get_cache_dir('visualizer'))
+                visual_runner = ParallelExecutor(visual_date_dir)
+                for symbol in self.symbols:
+                    for summary in strategy_runner.processed_strategies[symbol]:
+                        strategy: Strategy = summary.get_strategy()
+                        visualizer: Visualizer = Visualizer(str(strategy), strategy.collection, [strategy.portfolio])
+                        # visualizer.annotate_canceled_orders = True
+                        visualizer.annotate_opened_orders = True
+                        # visualizer.annotate_open_prices = True
+                        # visualizer.annotate_close_prices = True
+                        # visualizer.draw_high_prices = False
+                        # visualizer.draw_low_prices = False
+                        # visualizer.draw_open_prices = True
+                        # visualizer.draw_close_prices = True
+                        visual_runner.add(visualizer.plot_all, (), str(strategy).replace(' ', '_'))
+                visual_runner.start()
         return success
 
     def add_symbol_strategies(self, symbol, strategies):
         # Portfolio
-        template: Portfolio = Portfolio('Multi-Symbol Portfolio Value', {'USD': 10000.0, symbol: 0.0})
-        template.base_symbol = self.base_symbol
-        template.start_time = self.start_time
-        template.end_time = self.end_time
-        template.add_adapter_class(self.adapter_class)
-        template.asset_type_overrides = self.asset_type_overrides
+        spec: PortfolioSpec = PortfolioSpec.of('Multi-Symbol Portfolio Value', {'USD': 10000.0, symbol: 0.0},
+                                               self.start_time, self.end_time, base_symbol=self.base_symbol,
+                                               adapter_class=self.adapter_class,
+                                               asset_type_overrides=self.asset_type_overrides,
+                                               portfolio_class=self.portfolio_class)
         # Interval
         intervals = [self.price_interval]
             # TimeInterval.WEEK,
@@ -299,7 +332,7 @@ class MatrixRunner(Runner):
         # Strategies
 
         if MatrixReportType.BUY_AND_HOLD in self.report_types:
-            strategies[symbol].append(BuyAndHold(symbol, copy.deepcopy(template)))
+            strategies[symbol].append(BuyAndHold(symbol, spec.create()))
 
         if MatrixReportType.LAST_BOUNCE in self.report_types:
             thresholds = [
@@ -316,8 +349,8 @@ class MatrixRunner(Runner):
             for threshold in thresholds:
                 for ratio in ratios:
                     for interval in intervals:
-                        template.interval = interval
-                        strategies[symbol].append(LastBounce(symbol, copy.deepcopy(template), ratio, threshold))
+                        portfolio = spec.with_interval(interval).create()
+                        strategies[symbol].append(LastBounce(symbol, portfolio, ratio, threshold))
                         pass
 
         if MatrixReportType.BUY_DOWN_SELL_UP_TRAILING in self.report_types:
@@ -334,8 +367,8 @@ class MatrixRunner(Runner):
             for sell_up in sell_ups:
                 for buy_down in buy_downs:
                     for interval in intervals:
-                        template.interval = interval
-                        strategies[symbol].append(BuyDownSellUpTrailing(symbol, copy.deepcopy(template), buy_down, sell_up))
+                        portfolio = spec.with_interval(interval).create()
+                        strategies[symbol].append(BuyDownSellUpTrailing(symbol, portfolio, buy_down, sell_up))
                         pass
 
         if MatrixReportType.BUY_UP_SELL_DOWN_TRAILING in self.report_types:
@@ -359,8 +392,8 @@ class MatrixRunner(Runner):
             for buy_up in buy_ups:
                 for sell_down in sell_downs:
                     for interval in busd_intervals:
-                        template.interval = interval
-                        strategies[symbol].append(BuyUpSellDownTrailing(symbol, copy.deepcopy(template), buy_up, sell_down))
+                        portfolio = spec.with_interval(interval).create()
+                        strategies[symbol].append(BuyUpSellDownTrailing(symbol, portfolio, buy_up, sell_down))
 
         if MatrixReportType.SOLDIERS_AND_CROWS in self.report_types:
             counts = [
@@ -370,8 +403,8 @@ class MatrixRunner(Runner):
             ]
             for count in counts:
                 for interval in intervals:
-                    template.interval = interval
-                    strategies[symbol].append(SoldiersAndCrows(symbol, copy.deepcopy(template), count))
+                    portfolio = spec.with_interval(interval).create()
+                    strategies[symbol].append(SoldiersAndCrows(symbol, portfolio, count))
 
         if MatrixReportType.BOUNDED_RSI in self.report_types:
             periods = [
@@ -393,8 +426,8 @@ class MatrixRunner(Runner):
                 for upper in uppers:
                     for lower in lowers:
                         for interval in intervals:
-                            template.interval = interval
-                            strategies[symbol].append(BoundedRsi(symbol, copy.deepcopy(template), period, upper, lower))
+                            portfolio = spec.with_interval(interval).create()
+                            strategies[symbol].append(BoundedRsi(symbol, portfolio, period, upper, lower))
 
         if MatrixReportType.MACD_CROSSING in self.report_types:
             slows = [
@@ -416,5 +449,5 @@ class MatrixRunner(Runner):
                 for fast in fasts:
                     for signal in signals:
                         for interval in intervals:
-                            template.interval = interval
-                            strategies[symbol].append(MacdCrossing(symbol, copy.deepcopy(template), slow, fast, signal))
+                            portfolio = spec.with_interval(interval).create()
+                            strategies[symbol].append(MacdCrossing(symbol, portfolio, slow, fast, signal))
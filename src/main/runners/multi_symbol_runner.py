@@ -20,10 +20,12 @@
 import logging
 import os
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Any
 
 from main.application.adapter import AssetType
-from main.application.runner import NoSymbolsSpecifiedException, get_adapter_class
+from main.application.adapter_collection import share_adapter_data
+from main.application.runner import NoSymbolsSpecifiedException, get_adapter_class, get_portfolio_class
+from main.application.shared_data import SharedDataStore
 from main.application.strategy import Strategy
 from main.application.time_interval import TimeInterval
 from main.common.locations import Locations, get_and_clean_timestamp_dir
@@ -32,6 +34,7 @@ from main.executors.parallel_strategy_executor import ParallelStrategyExecutor
 from main.executors.sequential_executor import SequentialExecutor
 from main.executors.sequential_strategy_executor import SequentialStrategyExecutor
 from main.portfolio.portfolio import Portfolio
+from main.portfolio.portfolio_spec import PortfolioSpec
 from main.runners.symbol_runner import SymbolRunner
 from main.strategies.strategy_type import StrategyType, add_last_bounce_strategies, add_macd_crossing_strategies, \
     add_bounded_rsi_strategies, add_buy_up_sell_down_trailing_strategies, add_buy_and_hold_strategies, \
@@ -48,6 +51,9 @@ class MultiSymbolRunner(SymbolRunner):
     base_symbol: str
     graph: bool
     parallel: bool
+    parallel_options: Dict[str, Any]
+    portfolio_class: type
+    shared_data: bool
     price_interval: TimeInterval
     start_time: Optional[datetime]
     end_time: Optional[datetime]
@@ -61,6 +67,9 @@ class MultiSymbolRunner(SymbolRunner):
         self.base_symbol = 'USD'
         self.graph = True
         self.parallel = True
+        self.parallel_options = {}
+        self.portfolio_class = Portfolio
+        self.shared_data = False
         self.price_interval = TimeInterval.DAY
         self.start_time = None
         self.end_time = None
@@ -103,6 +112,9 @@ class MultiSymbolRunner(SymbolRunner):
             'base_symbol':    self.base_symbol,
             'graph':          self.graph,
             'parallel':       self.parallel,
+            'parallel_options': self.parallel_options,
+            'portfolio_class': self.portfolio_class.__name__,
+            'shared_data':    self.shared_data,
             'price_interval': self.price_interval.value,
             'start_time':     self.start_time,
             'end_time':       self.end_time,
@@ -126,6 +138,12 @@ class MultiSymbolRunner(SymbolRunner):
             self.graph = config['graph']
         if 'parallel' in config:
             self.parallel = config['parallel']
+        if 'parallel_options' in config:
+            self.parallel_options = config['parallel_options']
+        if 'portfolio_class' in config:
+            self.portfolio_class = get_portfolio_class(config['portfolio_class'])
+        if 'shared_data' in config:
+            self.shared_data = config['shared_data']
         if 'start_time' in config:
             self.start_time = datetime.combine(config['start_time'], datetime.min.time())
         if 'end_time' in config:
@@ -153,44 +171,52 @@ class MultiSymbolRunner(SymbolRunner):
         for symbol in self.symbols:
             quantities[symbol] = 0.0
         quantities[self.base_symbol] = initial_value
-        template: Portfolio = Portfolio('Cross Symbol Portfolio Value', quantities, self.start_time, self.end_time)
-        template.interval = self.price_interval
-        template.add_adapter_class(self.adapter_class)
-        template.asset_type_overrides = self.asset_type_overrides
+        spec: PortfolioSpec = PortfolioSpec.of('Cross Symbol Portfolio Value', quantities, self.start_time,
+                                               self.end_time, self.price_interval, adapter_class=self.adapter_class,
+                                               asset_type_overrides=self.asset_type_overrides,
+                                               portfolio_class=self.portfolio_class)
         strategy_date_dir = get_and_clean_timestamp_dir(locations.get_cache_dir('strategies'))
 
         # Can always run direct if things get messy...
-        # MultiRelativeSmaSwapUp(self.symbols, copy.deepcopy(template), period=20, delta=1.05, look_back=10).run()
+        # MultiRelativeSmaSwapUp(self.symbols, spec.create(), period=20, delta=1.05, look_back=10).run()
         # return True
 
         # Strategies
         strategies: List[Strategy] = []
-        strategies += add_buy_and_hold_strategies(self.report_types, self.symbols, template)
-        strategies += add_sma_up_strategies(self.report_types, self.symbols, template)
-        strategies += add_testing_atr_strategies(self.report_types, self.symbols, template)
-        strategies += add_testing_macd_strategies(self.report_types, self.symbols, template)
-        strategies += add_testing_supertrend_strategies(self.report_types, self.symbols, template)
-        strategies += add_testing_wma_strategies(self.report_types, self.symbols, template)
-        strategies += add_testing_ema_strategies(self.report_types, self.symbols, template)
-        strategies += add_testing_lindev_strategies(self.report_types, self.symbols, template)
-        strategies += add_macd_crossing_strategies(self.report_types, self.symbols, template)
-        strategies += add_bounded_rsi_strategies(self.report_types, self.symbols, template)
-        strategies += add_last_bounce_strategies(self.report_types, self.symbols, template)
-        strategies += add_soldiers_and_crows_strategies(self.report_types, self.symbols, template)
-        strategies += add_buy_up_sell_down_trailing_strategies(self.report_types, self.symbols, template)
-        strategies += add_buy_down_sell_up_trailing_strategies(self.report_types, self.symbols, template)
-        strategies += add_multi_delta_swap_strategies(self.report_types, self.symbols, template)
-        strategies += add_multi_relative_sma_swap_up_strategies(self.report_types, self.symbols, template)
-        strategies += add_multi_relative_sma_swap_dowm_strategies(self.report_types, self.symbols, template)
+        strategies += add_buy_and_hold_strategies(self.report_types, self.symbols, spec)
+        strategies += add_sma_up_strategies(self.report_types, self.symbols, spec)
+        strategies += add_testing_atr_strategies(self.report_types, self.symbols, spec)
+        strategies += add_testing_macd_strategies(self.report_types, self.symbols, spec)
+        strategies += add_testing_supertrend_strategies(self.report_types, self.symbols, spec)
+        strategies += add_testing_wma_strategies(self.report_types, self.symbols, spec)
+        strategies += add_testing_ema_strategies(self.report_types, self.symbols, spec)
+        strategies += add_testing_lindev_strategies(self.report_types, self.symbols, spec)
+        strategies += add_macd_crossing_strategies(self.report_types, self.symbols, spec)
+        strategies += add_bounded_rsi_strategies(self.report_types, self.symbols, spec)
+        strategies += add_last_bounce_strategies(self.report_types, self.symbols, spec)
+        strategies += add_soldiers_and_crows_strategies(self.report_types, self.symbols, spec)
+        strategies += add_buy_up_sell_down_trailing_strategies(self.report_types, self.symbols, spec)
+        strategies += add_buy_down_sell_up_trailing_strategies(self.report_types, self.symbols, spec)
+        strategies += add_multi_delta_swap_strategies(self.report_types, self.symbols, spec)
+        strategies += add_multi_relative_sma_swap_up_strategies(self.report_types, self.symbols, spec)
+        strategies += add_multi_relative_sma_swap_dowm_strategies(self.report_types, self.symbols, spec)
 
         key = "_".join(self.symbols)
 
-        executor = ParallelStrategyExecutor(strategy_date_dir) if self.parallel else SequentialStrategyExecutor(
-            strategy_date_dir)
+        if self.parallel:
+            executor = ParallelStrategyExecutor(strategy_date_dir)
+            executor.set_options(self.parallel_options)
+        else:
+            executor = SequentialStrategyExecutor(strategy_date_dir)
 
-        for strategy in strategies:
-            executor.add_strategy(strategy.run, (), key, str(strategy).replace(' ', '_'))
-        success = executor.start()
+        with SharedDataStore() as store:
+            if self.parallel and self.shared_data:
+                # workers attach to the data that is loaded once here, instead of each loading its own copy
+                share_adapter_data([adapter for strategy in strategies for adapter in strategy.collection.adapters],
+                                   store)
+            for strategy in strategies:
+                executor.add_strategy(strategy.run, (), key, str(strategy).replace(' ', '_'))
+            success = executor.start()
         report_on = executor.processed_strategies[key] if key in executor.processed_strategies else [None]
 
         output_dir = locations.get_output_dir(Report.camel_to_snake(self.__class__.__name__))
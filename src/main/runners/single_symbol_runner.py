@@ -22,7 +22,8 @@ from datetime import datetime
 from typing import List, Dict, Optional
 
 from main.application.adapter import AssetType
-from main.application.runner import get_asset_type_overrides, get_adapter_class, NoSymbolsSpecifiedException
+from main.application.runner import get_asset_type_overrides, get_adapter_class, NoSymbolsSpecifiedException, \
+    get_portfolio_class
 from main.application.strategy import Strategy
 from main.application.time_interval import TimeInterval
 from main.common.locations import get_and_clean_timestamp_dir, Locations
@@ -31,6 +32,7 @@ from main.executors.parallel_executor import ParallelExecutor
 from main.executors.parallel_strategy_executor import ParallelStrategyExecutor
 from main.executors.sequential_strategy_executor import SequentialStrategyExecutor
 from main.portfolio.portfolio import Portfolio
+from main.portfolio.portfolio_spec import PortfolioSpec
 from main.runners.symbol_runner import SymbolRunner
 from main.strategies.strategy_type import StrategyType, add_last_bounce_strategies, add_macd_crossing_strategies, \
     add_bounded_rsi_strategies, add_buy_up_sell_down_trailing_strategies, add_buy_and_hold_strategies, \
@@ -54,6 +56,7 @@ class SingleSymbolRunner(SymbolRunner):
     start_time: Optional[datetime]
     end_time: Optional[datetime]
     asset_type_overrides: Dict[str, AssetType]
+    portfolio_class: type
     report_types: List[StrategyType]
 
     def __init__(self):
@@ -67,6 +70,7 @@ class SingleSymbolRunner(SymbolRunner):
         self.start_time = None
         self.end_time = None
         self.asset_type_overrides = {}
+        self.portfolio_class = Portfolio
         self.report_types = []
 
     def get_config(self) -> Dict:
@@ -83,6 +87,7 @@ class SingleSymbolRunner(SymbolRunner):
             'start_time':           self.start_time,
             'end_time':             self.end_time,
             'asset_type_overrides': asset_type_overrides,
+            'portfolio_class':      self.portfolio_class.__name__,
             'report_types':         [report_type.name for report_type in self.report_types],
         }
         return config
@@ -94,6 +99,8 @@ class SingleSymbolRunner(SymbolRunner):
         self.report_types = [StrategyType[report_type] for report_type in report_types]
         if 'asset_type_overrides' in config:
             self.asset_type_overrides = get_asset_type_overrides(config['asset_type_overrides'])
+        if 'portfolio_class' in config:
+            self.portfolio_class = get_portfolio_class(config['portfolio_class'])
         if 'graph' in config:
             self.graph = config['graph']
         if 'parallel' in config:
@@ -127,33 +134,32 @@ class SingleSymbolRunner(SymbolRunner):
         # end_time = None
         end_time: datetime = self.end_time if self.end_time else datetime.now()
         # end_time = datetime(2010, 1, 1)
-        template: Portfolio = Portfolio('Single Symbol Portfolio Value', {'USD': 20000.0, self.symbol: 0.0},
-                                        self.start_time, end_time)
-        # template.interval = TimeInterval.DAY
-        template.interval = self.price_interval
-        template.add_adapter_class(self.adapter_class)
-        template.asset_type_overrides = self.asset_type_overrides
+        spec: PortfolioSpec = PortfolioSpec.of('Single Symbol Portfolio Value', {'USD': 20000.0, self.symbol: 0.0},
+                                               self.start_time, end_time, self.price_interval,
+                                               adapter_class=self.adapter_class,
+                                               asset_type_overrides=self.asset_type_overrides,
+                                               portfolio_class=self.portfolio_class)
 
         # script_dir = os.path.dirname(os.path.realpath(__file__))
         strategy_date_dir = get_and_clean_timestamp_dir(locations.get_cache_dir('strategies'))
 
         # Strategies
         strategies: List[Strategy] = []
-        strategies += add_buy_and_hold_strategies(self.report_types, [self.symbol], template)
-        strategies += add_sma_up_strategies(self.report_types, [self.symbol], template)
-        strategies += add_testing_atr_strategies(self.report_types, [self.symbol], template)
-        strategies += add_testing_macd_strategies(self.report_types, [self.symbol], template)
-        strategies += add_testing_supertrend_strategies(self.report_types, [self.symbol], template)
-        strategies += add_testing_wma_strategies(self.report_types, [self.symbol], template)
-        strategies += add_testing_ema_strategies(self.report_types, [self.symbol], template)
-        strategies += add_testing_lindev_strategies(self.report_types, [self.symbol], template)
-        strategies += add_macd_crossing_strategies(self.report_types, [self.symbol], template)
-        strategies += add_bounded_rsi_strategies(self.report_types, [self.symbol], template)
-        strategies += add_last_bounce_strategies(self.report_types, [self.symbol], template)
-        strategies += add_soldiers_and_crows_strategies(self.report_types, [self.symbol], template)
-        strategies += add_buy_up_sell_down_trailing_strategies(self.report_types, [self.symbol], template)
-        strategies += add_buy_down_sell_up_trailing_strategies(self.report_types, [self.symbol], template)
-        # strategies.append(BookDepth(self.symbol, copy.deepcopy(template), period=14.0))
+        strategies += add_buy_and_hold_strategies(self.report_types, [self.symbol], spec)
+        strategies += add_sma_up_strategies(self.report_types, [self.symbol], spec)
+        strategies += add_testing_atr_strategies(self.report_types, [self.symbol], spec)
+        strategies += add_testing_macd_strategies(self.report_types, [self.symbol], spec)
+        strategies += add_testing_supertrend_strategies(self.report_types, [self.symbol], spec)
+        strategies += add_testing_wma_strategies(self.report_types, [self.symbol], spec)
+        strategies += add_testing_ema_strategies(self.report_types, [self.symbol], spec)
+        strategies += add_testing_lindev_strategies(self.report_types, [self.symbol], spec)
+        strategies += add_macd_crossing_strategies(self.report_types, [self.symbol], spec)
+        strategies += add_bounded_rsi_strategies(self.report_types, [self.symbol], spec)
+        strategies += add_last_bounce_strategies(self.report_types, [self.symbol], spec)
+        strategies += add_soldiers_and_crows_strategies(self.report_types, [self.symbol], spec)
+        strategies += add_buy_up_sell_down_trailing_strategies(self.report_types, [self.symbol], spec)
+        strategies += add_buy_down_sell_up_trailing_strategies(self.report_types, [self.symbol], spec)
+        # strategies.append(BookDepth(self.symbol, spec.create(), period=14.0))
 
         # success = True
         # for strategy in strategies:
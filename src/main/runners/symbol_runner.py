@@ -21,7 +21,7 @@ from typing import List
 
 import pandas
 
-from main.application.adapter import insert_column
+from main.application.adapter import insert_columns
 from main.application.runner import Runner
 from main.application.strategy import Strategy
 from main.common.report import Report, to_percent, to_dollars
@@ -61,12 +61,13 @@ class SymbolRunner(Runner):
                 start_dates.append(strategy.portfolio.get_first_completed_date())
                 end_dates.append(strategy.portfolio.get_last_completed_date())
 
-        df: pandas.DataFrame = pandas.DataFrame()
-        insert_column(df, ColumnType.CAGR, names, cagrs)
-        insert_column(df, ColumnType.ROI, names, rois)
-        insert_column(df, ColumnType.END_VALUE, names, end_values)
-        insert_column(df, ColumnType.START_DATE, names, start_dates)
-        insert_column(df, ColumnType.END_DATE, names, end_dates)
+        df: pandas.DataFrame = insert_columns(pandas.DataFrame(), {
+            ColumnType.CAGR: (names, cagrs),
+            ColumnType.ROI: (names, rois),
+            ColumnType.END_VALUE: (names, end_values),
+            ColumnType.START_DATE: (names, start_dates),
+            ColumnType.END_DATE: (names, end_dates),
+        })
         report_df = report_format(df)
         report.log("{}".format(report_df.to_string()))
 
@@ -25,7 +25,7 @@ import matplotlib.pyplot as plt
 import pandas
 from pytrends.request import TrendReq
 
-from main.application.adapter import insert_column, AssetType, Adapter
+from main.application.adapter import insert_columns, AssetType, Adapter
 from main.application.time_interval import TimeInterval
 from main.application.adapter_collection import AdapterCollection, set_all_cache_key_dates
 from main.application.argument import Argument, ArgumentKey
@@ -79,8 +79,8 @@ class TrendRunner(Runner):
             time_data = pytrend.interest_over_time()
             close_column: pandas.Series = collection.get_column(self.symbol, ValueType.CLOSE)
             max_price = close_column.max()
-            insert_column(time_data, ValueType.CLOSE, close_column.index.tolist(),
-                          ((close_column.values / max_price) * 100.0).tolist())
+            close_values = ((close_column.values / max_price) * 100.0).tolist()
+            time_data = insert_columns(time_data, {ValueType.CLOSE: (close_column.index.tolist(), close_values)})
             time_data.interpolate(method='time', inplace=True)
             logging.info(f"Interest over time:\n{time_data}")
             time_data.rename(columns={ValueType.CLOSE: f"Closing Price {self.symbol}"}, inplace=True)
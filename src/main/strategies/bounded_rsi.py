@@ -14,7 +14,6 @@
 #  You should have received a copy of the GNU General Public License
 #  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
 from main.application.adapter import find_closest_before_else_after, Adapter
-from main.application.adapter_collection import filter_adapters
 from main.application.value_type import ValueType
 from main.portfolio.order import MarketOrder, OrderSide
 from main.portfolio.portfolio import Portfolio
@@ -40,7 +39,7 @@ class BoundedRsi(SingleSymbolStrategy):
         if last_time is not None:
             cash = self.portfolio.quantities[self.collection.get_base_symbol()]
             quantity: float = self.portfolio.quantities[self.symbol]
-            adapter: Adapter = filter_adapters(self.collection.adapters, self.symbol, ValueType.RSI)
+            adapter: Adapter = self.collection.get_adapter(self.symbol, ValueType.RSI)
             closest_time = find_closest_before_else_after(adapter.data, last_time)
             rsi = self.collection.get_value(self.symbol, closest_time, ValueType.RSI)
             if (quantity > 0.0) and (rsi >= self.upper):
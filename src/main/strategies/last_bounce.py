@@ -17,9 +17,13 @@
 
 from datetime import datetime
 
-from typing import List
+from typing import List, Optional, Tuple
+
+import numpy
+import pandas
 
 from main.application.value_type import ValueType
+from main.calculators.candle_patterns import get_bounces_up, get_bounces_down
 from main.portfolio.order import OrderSide, MarketOrder
 from main.portfolio.portfolio import Portfolio
 from main.application.single_symbol_strategy import SingleSymbolStrategy
@@ -29,13 +33,30 @@ class LastBounce(SingleSymbolStrategy):
     """ uses a red to green on buy and a green to red to sell """
     ratio: float  # 2.0 ratio means the right side is at least double the left side
     threshold: float  # 0.01 means the last open close must be larger than a 1% difference to trigger
+    times: pandas.Index
+    opens: numpy.ndarray
+    closes: numpy.ndarray
+    bounces_up: numpy.ndarray
+    bounces_down: numpy.ndarray
+    previous_time: Optional[datetime]
 
     def __init__(self, symbol: str, portfolio: Portfolio, ratio: float, threshold: float):
         super().__init__("Last bounce ratio {} threshold {}".format(ratio, threshold), symbol, portfolio)
         self.ratio = ratio
         self.threshold = threshold
+        self.previous_time = None
         self.build_price_collection()
 
+    def prepare(self) -> None:
+        candles: pandas.DataFrame = self.collection.get_columns(self.symbol, [ValueType.OPEN, ValueType.CLOSE])
+        self.times = candles.index
+        self.opens = candles[ValueType.OPEN].to_numpy(dtype=float)
+        self.closes = candles[ValueType.CLOSE].to_numpy(dtype=float)
+        self.bounces_up = get_bounces_up(self.opens, self.closes, self.ratio, self.threshold)
+        self.bounces_down = get_bounces_down(self.opens, self.closes, self.ratio, self.threshold)
+        completed_times: List[datetime] = self.portfolio.get_completed_times()
+        self.previous_time = completed_times[-1] if len(completed_times) > 0 else None
+
     def next_step(self, current_time: datetime,
                   order_filter: List[OrderSide] = (OrderSide.SELL, OrderSide.BUY)) -> None:
         cash: float = self.portfolio.quantities[self.collection.get_base_symbol()]
@@ -44,45 +65,41 @@ class LastBounce(SingleSymbolStrategy):
             self.open_buy(current_time, cash)
         elif (quantity > 0.0) and OrderSide.SELL in order_filter:
             self.open_sell(current_time, quantity)
+        self.previous_time = current_time
+
+    def get_candles(self, current_time: datetime, bounces: numpy.ndarray) -> Optional[Tuple[int, int]]:
+        """
+        Get the bars for the previous and current time if the current bar bounced from the previous one.
+        :param current_time: The time of the current bar
+        :param bounces: True for each bar that bounced from the bar before it
+        :return: The positions of the previous and current bars, None if there is no previous bar or no bounce
+        """
+        if self.previous_time is None:
+            return None
+        position: int = self.times.get_loc(current_time)
+        previous_position: int = self.times.get_loc(self.previous_time)
+        if previous_position == position - 1:
+            bounced = bounces[position]
+        else:  # the previous step was not the previous bar (e.g. another symbol has more times), check these two
+            pair = [previous_position, position]
+            find_bounces = get_bounces_up if bounces is self.bounces_up else get_bounces_down
+            bounced = find_bounces(self.opens[pair], self.closes[pair], self.ratio, self.threshold)[1]
+        return (previous_position, position) if bounced else None
 
     def open_sell(self, current_time, quantity):
-        times: List[datetime] = self.portfolio.get_completed_times()
-        if len(times) < 2:
-            return
-        assert current_time == times[-1], "Unexpectedly failed while testing that the current time is the end of times"
-        current_open = self.collection.get_value(self.symbol, times[-1], ValueType.OPEN)
-        current_close = self.collection.get_value(self.symbol, times[-1], ValueType.CLOSE)
-        previous_open = self.collection.get_value(self.symbol, times[-2], ValueType.OPEN)
-        previous_close = self.collection.get_value(self.symbol, times[-2], ValueType.CLOSE)
-        previous_closed_up = previous_close > previous_open
-        current_closed_down = current_close < current_open
-        one_close_is_lower = current_close < (previous_close * (1 - self.threshold))
-        current_close_to_open = abs(current_close - current_open)
-        previous_close_to_open = abs(previous_close - previous_open)
-        ratio_met = previous_close_to_open * self.ratio < current_close_to_open
-        if previous_closed_up and current_closed_down and one_close_is_lower and ratio_met:
+        candles: Optional[Tuple[int, int]] = self.get_candles(current_time, self.bounces_down)
+        if candles is not None:
+            previous, current = candles
             order = MarketOrder(self.symbol, OrderSide.SELL, quantity, current_time)
             order.message = "price bounced down from open={:0.3f};close={:0.3f} to open={:0.3f};close={:0.3f})".format(
-                previous_open, previous_close, current_open, current_close)
+                self.opens[previous], self.closes[previous], self.opens[current], self.closes[current])
             self.portfolio.open_order(order)
 
     def open_buy(self, current_time, cash):
-        times: List[datetime] = self.portfolio.get_completed_times()
-        if len(times) < 2:
-            return
-        assert current_time == times[-1], "Unexpectedly failed while testing that the current time is the end of times"
-        current_open = self.collection.get_value(self.symbol, times[-1], ValueType.OPEN)
-        current_close = self.collection.get_value(self.symbol, times[-1], ValueType.CLOSE)
-        previous_open = self.collection.get_value(self.symbol, times[-2], ValueType.OPEN)
-        previous_close = self.collection.get_value(self.symbol, times[-2], ValueType.CLOSE)
-        previous_closed_down = previous_close < previous_open
-        current_closed_up = current_close > current_open
-        one_close_is_higher = current_close > (previous_close * (1 + self.threshold))
-        current_close_to_open = abs(current_close - current_open)
-        previous_close_to_open = abs(previous_close - previous_open)
-        ratio_met = previous_close_to_open * self.ratio < current_close_to_open
-        if previous_closed_down and current_closed_up and one_close_is_higher and ratio_met:
+        candles: Optional[Tuple[int, int]] = self.get_candles(current_time, self.bounces_up)
+        if candles is not None:
+            previous, current = candles
             order = MarketOrder(self.symbol, OrderSide.BUY, cash, current_time)
             order.message = "price bounced up from open={:0.3f};close={:0.3f} to open={:0.3f};close={:0.3f}".format(
-                previous_open, previous_close, current_open, current_close)
+                self.opens[previous], self.closes[previous], self.opens[current], self.closes[current])
             self.portfolio.open_order(order)
@@ -70,7 +70,8 @@ class MultiRelativeSmaSwapUp(MultiSymbolStrategy):
             look_back_sma = self.collection.get_value(symbol, look_back_time, ValueType.SMA)
             relative_smas[symbol] = sma / look_back_sma
             if symbol not in self.portfolio.indicator_data:
-                self.portfolio.indicator_data[symbol] = sma_df
+                # the items are a view of the adapter data, so copy them before adding to them
+                self.portfolio.indicator_data[symbol] = sma_df.copy()
             # What was this for?
             self.portfolio.indicator_data[symbol][current_time] = relative_smas[symbol]
         cash: float = self.portfolio.quantities[self.portfolio.base_symbol]
@@ -17,15 +17,25 @@
 # ------------------------------------------------------------------------------
 
 from datetime import datetime
+from typing import Optional
 
+import pandas
+
+from main.application.adapter import Adapter
 from main.application.single_symbol_strategy import SingleSymbolStrategy
 from main.application.value_type import ValueType
 from main.calculators.action_type import ActionType
 from main.calculators.sma import SMA
+from main.calculators.vectorized import calculate_sma
 from main.portfolio.order import MarketOrder, OrderSide
 from main.portfolio.portfolio import Portfolio
 
 
+def get_average(averages: pandas.Series, current_time: datetime) -> Optional[float]:
+    average = averages.get(current_time)
+    return None if average is None or pandas.isna(average) else average
+
+
 class SmaUp(SingleSymbolStrategy):
 
     def __init__(self, symbol: str, portfolio: Portfolio, short: int, long: int, limit: int):
@@ -35,7 +45,16 @@ class SmaUp(SingleSymbolStrategy):
         self.sma_short = SMA(short)
         self.sma_long = SMA(long)
         self.price_list_limit = limit
-        self.price_list_closes = []
+        self.short_averages = pandas.Series(dtype=float)
+        self.long_averages = pandas.Series(dtype=float)
+
+    def prepare(self) -> None:
+        # the averages start with the first close of the run, the same as updating them on every step
+        adapter: Adapter = self.collection.get_adapter(self.symbol, ValueType.CLOSE)
+        closes: pandas.Series = adapter.get_column_between(self.portfolio.start_time, self.portfolio.end_time,
+                                                           ValueType.CLOSE)
+        self.short_averages = self.get_indicator(closes, 'sma', (self.sma_short.averaging_length,), calculate_sma)
+        self.long_averages = self.get_indicator(closes, 'sma', (self.sma_long.averaging_length,), calculate_sma)
 
     def next_step(self, current_time: datetime) -> None:
         cash = self.portfolio.quantities[self.collection.get_base_symbol()]
@@ -47,12 +66,7 @@ class SmaUp(SingleSymbolStrategy):
         
         '''
 
-        self.price_list_closes.insert(0, self.collection.get_value(self.symbol, current_time, ValueType.CLOSE))
-
-        if len(self.price_list_closes) > self.price_list_limit:
-            self.price_list_closes.pop()
-
-        action = self.decide()
+        action = self.decide(current_time)
         quantity: float = self.portfolio.quantities[self.symbol]
 
         if action == ActionType.SELL and quantity > 0.0:
@@ -63,15 +77,17 @@ class SmaUp(SingleSymbolStrategy):
             order = MarketOrder(self.symbol, OrderSide.BUY, cash, current_time)
             self.portfolio.open_order(order)
 
-    def decide(self):
+    def decide(self, current_time: datetime):
 
         # get short SMA
-        short_calc = self.sma_short.calc(self.price_list_closes)
+        short_calc: Optional[float] = get_average(self.short_averages, current_time)
 
         # get long SMA
-        long_calc = self.sma_long.calc(self.price_list_closes)
+        long_calc: Optional[float] = get_average(self.long_averages, current_time)
 
-        if short_calc is None or long_calc is None:
+        # only the last limit closes are looked back on, so an average longer than that never has enough data
+        too_long = max(self.sma_short.averaging_length, self.sma_long.averaging_length) > self.price_list_limit
+        if short_calc is None or long_calc is None or too_long:
             return ActionType.NOT_ENOUGH_DATA
 
         if short_calc > long_calc:
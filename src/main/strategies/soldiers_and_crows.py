@@ -14,9 +14,14 @@
 #  You should have received a copy of the GNU General Public License
 #  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
 
+from datetime import datetime
 from typing import List
 
+import numpy
+import pandas
+
 from main.application.value_type import ValueType
+from main.calculators.candle_patterns import get_white_soldiers, get_black_crows
 from main.portfolio.order import MarketOrder, OrderSide
 from main.portfolio.portfolio import Portfolio
 from main.application.single_symbol_strategy import SingleSymbolStrategy
@@ -24,12 +29,23 @@ from main.application.single_symbol_strategy import SingleSymbolStrategy
 
 class SoldiersAndCrows(SingleSymbolStrategy):
     count: int
+    times: pandas.Index
+    soldiers: numpy.ndarray
+    crows: numpy.ndarray
 
     def __init__(self, symbol: str, portfolio: Portfolio, count: int):
         super().__init__("{} white soldiers and black crows".format(count), symbol, portfolio)
         self.count = count
         self.build_price_collection()
 
+    def prepare(self) -> None:
+        candles: pandas.DataFrame = self.collection.get_columns(self.symbol, [ValueType.OPEN, ValueType.CLOSE])
+        opens: numpy.ndarray = candles[ValueType.OPEN].to_numpy(dtype=float)
+        closes: numpy.ndarray = candles[ValueType.CLOSE].to_numpy(dtype=float)
+        self.times = candles.index
+        self.soldiers = get_white_soldiers(opens, closes, self.count)
+        self.crows = get_black_crows(opens, closes, self.count)
+
     def next_step(self, current_time,
                   order_filter: List[OrderSide] = (OrderSide.SELL, OrderSide.BUY)) -> None:
         cash = self.portfolio.quantities[self.collection.get_base_symbol()]
@@ -39,24 +55,23 @@ class SoldiersAndCrows(SingleSymbolStrategy):
         elif (quantity > 0.0) and OrderSide.SELL in order_filter:
             self.sell(current_time, quantity)
 
+    def has_pattern(self, signals: numpy.ndarray, current_time: datetime, last_time: datetime) -> bool:
+        """
+        Check if the last count bars on or before the current time form the pattern, using only bars that are not
+        before the last time.
+        :param signals: True for each bar that ends the pattern
+        :param current_time: The time of the last bar
+        :param last_time: The time of the first bar that can be used
+        :return: True if the pattern was found
+        """
+        end: int = int(self.times.searchsorted(current_time, side='right'))
+        return end >= self.count and signals[end - 1] and self.times[end - self.count] >= last_time
+
     def sell(self, current_time, quantity):
         last_order = self.portfolio.get_last_closed_order()
         assert last_order is None or last_order.order_side == OrderSide.BUY
         last_time = last_order.close_time if last_order is not None else self.collection.get_common_start_time()
-        opens = self.collection.get_all_items_on_or_after(self.symbol, last_time, ValueType.OPEN)
-        closes = self.collection.get_all_items_on_or_after(self.symbol, last_time, ValueType.CLOSE)
-        times = []
-        for time in opens.index:
-            if time > current_time:
-                continue
-            times.append(time)
-        three_times = sorted(times)[-self.count:]
-        do_it = True
-        for time in three_times:
-            if opens.loc[time, ValueType.OPEN] < closes.loc[time, ValueType.CLOSE]:
-                do_it = False
-                break
-        if do_it and len(three_times) == self.count:
+        if self.has_pattern(self.crows, current_time, last_time):
             order = MarketOrder(self.symbol, OrderSide.SELL, quantity, current_time)
             order.message = "three black crows closing"
             self.portfolio.open_order(order)
@@ -65,20 +80,7 @@ class SoldiersAndCrows(SingleSymbolStrategy):
         last_order = self.portfolio.get_last_closed_order()
         assert last_order is None or last_order.order_side == OrderSide.SELL
         last_time = last_order.close_time if last_order is not None else self.collection.get_common_start_time()
-        opens = self.collection.get_all_items_on_or_after(self.symbol, last_time, ValueType.OPEN)
-        closes = self.collection.get_all_items_on_or_after(self.symbol, last_time, ValueType.CLOSE)
-        times = []
-        for time in opens.index:
-            if time > current_time:
-                continue
-            times.append(time)
-        three_times = sorted(times)[-self.count:]
-        do_it = True
-        for time in three_times:
-            if opens.loc[time, ValueType.OPEN] > closes.loc[time, ValueType.CLOSE]:
-                do_it = False
-                break
-        if do_it and len(three_times) == self.count:
+        if self.has_pattern(self.soldiers, current_time, last_time):
             order = MarketOrder(self.symbol, OrderSide.BUY, cash, current_time)
             order.message = "three white soldiers closing"
             self.portfolio.open_order(order)
@@ -16,11 +16,11 @@
 #  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
 # ------------------------------------------------------------------------------
 
-import copy
 from enum import Enum, auto
 from typing import List
 
 from main.application.strategy import Strategy
+from main.portfolio.portfolio_spec import PortfolioSpec
 from main.strategies.bounded_rsi import BoundedRsi
 from main.strategies.buy_and_hold import BuyAndHold
 from main.strategies.buy_down_sell_up_trailing import BuyDownSellUpTrailing
@@ -60,15 +60,15 @@ class StrategyType(Enum):
     MULTI_RELATIVE_SMA_SWAP_DOWN = auto()
 
 
-def add_buy_and_hold_strategies(report_types, symbols, template):
+def add_buy_and_hold_strategies(report_types, symbols, spec: PortfolioSpec):
     strategies: List[Strategy] = []
     if StrategyType.BUY_AND_HOLD in report_types:
         for symbol in symbols:
-            strategies.append(BuyAndHold(symbol, copy.deepcopy(template)))
+            strategies.append(BuyAndHold(symbol, spec.create()))
     return strategies
 
 
-def add_sma_up_strategies(report_types, symbols, template):
+def add_sma_up_strategies(report_types, symbols, spec: PortfolioSpec):
     strategies: List[Strategy] = []
     if StrategyType.SMA_UP in report_types:
         shorts = [
@@ -90,71 +90,71 @@ def add_sma_up_strategies(report_types, symbols, template):
             for long in longs:
                 for limit in limits:
                     for symbol in symbols:
-                        strategies.append(SmaUp(symbol, copy.deepcopy(template), short, long, limit))
+                        strategies.append(SmaUp(symbol, spec.create(), short, long, limit))
     return strategies
 
 
-def add_testing_atr_strategies(report_types, symbols, template):
+def add_testing_atr_strategies(report_types, symbols, spec: PortfolioSpec):
     strategies: List[Strategy] = []
     if StrategyType.TESTING_ATR in report_types:
 
         #  ALL OF THIS
         for symbol in symbols:
-            strategies.append(TestingATR(symbol, copy.deepcopy(template)))
+            strategies.append(TestingATR(symbol, spec.create()))
     return strategies
 
 
-def add_testing_macd_strategies(report_types, symbols, template):
+def add_testing_macd_strategies(report_types, symbols, spec: PortfolioSpec):
     strategies: List[Strategy] = []
     if StrategyType.TESTING_MACD in report_types:
 
         #  ALL OF THIS
         for symbol in symbols:
-            strategies.append(TestingMACD(symbol, copy.deepcopy(template)))
+            strategies.append(TestingMACD(symbol, spec.create()))
     return strategies
 
 
-def add_testing_supertrend_strategies(report_types, symbols, template):
+def add_testing_supertrend_strategies(report_types, symbols, spec: PortfolioSpec):
     strategies: List[Strategy] = []
     if StrategyType.TESTING_SUPERTREND in report_types:
 
         #  ALL OF THIS
         for symbol in symbols:
-            strategies.append(TestingSUPERTREND(symbol, copy.deepcopy(template)))
+            strategies.append(TestingSUPERTREND(symbol, spec.create()))
     return strategies
 
 
-def add_testing_wma_strategies(report_types, symbols, template):
+def add_testing_wma_strategies(report_types, symbols, spec: PortfolioSpec):
     strategies: List[Strategy] = []
     if StrategyType.TESTING_WMA in report_types:
 
         #  ALL OF THIS
         for symbol in symbols:
-            strategies.append(TestingWMA(symbol, copy.deepcopy(template)))
+            strategies.append(TestingWMA(symbol, spec.create()))
     return strategies
 
 
-def add_testing_ema_strategies(report_types, symbols, template):
+def add_testing_ema_strategies(report_types, symbols, spec: PortfolioSpec):
     strategies: List[Strategy] = []
     if StrategyType.TESTING_EMA in report_types:
 
         #  ALL OF THIS
         for symbol in symbols:
-            strategies.append(TestingEMA(symbol, copy.deepcopy(template)))
+            strategies.append(TestingEMA(symbol, spec.create()))
     return strategies
 
 
-def add_testing_lindev_strategies(report_types, symbols, template):
+def add_testing_lindev_strategies(report_types, symbols, spec: PortfolioSpec):
     strategies: List[Strategy] = []
     if StrategyType.TESTING_LINDEV in report_types:
 
         #  ALL OF THIS
         for symbol in symbols:
-            strategies.append(TestingLINDEV(symbol, copy.deepcopy(template)))
+            strategies.append(TestingLINDEV(symbol, spec.create()))
     return strategies
 
 
-def add_last_bounce_strategies(report_types, symbols, template):
+def add_last_bounce_strategies(report_types, symbols, spec: PortfolioSpec):
     strategies: List[Strategy] = []
     if StrategyType.LAST_BOUNCE in report_types:
         thresholds = [
@@ -171,11 +171,11 @@ def add_last_bounce_strategies(report_types, symbols, template):
         for threshold in thresholds:
             for ratio in ratios:
                 for symbol in symbols:
-                    strategies.append(LastBounce(symbol, copy.deepcopy(template), ratio, threshold))
+                    strategies.append(LastBounce(symbol, spec.create(), ratio, threshold))
     return strategies
 
 
-def add_macd_crossing_strategies(report_types, symbols, template):
+def add_macd_crossing_strategies(report_types, symbols, spec: PortfolioSpec):
     strategies: List[Strategy] = []
     if StrategyType.MACD_CROSSING in report_types:
         # Fast (Exponential) Moving Average in number of intervals (days if daily, months if monthly etc.)
@@ -201,11 +201,11 @@ def add_macd_crossing_strategies(report_types, symbols, template):
                 for macd_signal in macd_signals:
                     for symbol in symbols:
                         strategies.append(
-                            MacdCrossing(symbol, copy.deepcopy(template), macd_slow, macd_fast, macd_signal))
+                            MacdCrossing(symbol, spec.create(), macd_slow, macd_fast, macd_signal))
     return strategies
 
 
-def add_bounded_rsi_strategies(report_types, symbols, template):
+def add_bounded_rsi_strategies(report_types, symbols, spec: PortfolioSpec):
     strategies: List[Strategy] = []
     if StrategyType.BOUNDED_RSI in report_types:
         rsi_uppers = [
@@ -229,11 +229,11 @@ def add_bounded_rsi_strategies(report_types, symbols, template):
                 for rsi_period in rsi_periods:
                     for symbol in symbols:
                         strategies.append(
-                            BoundedRsi(symbol, copy.deepcopy(template), rsi_period, rsi_upper, rsi_lower))
+                            BoundedRsi(symbol, spec.create(), rsi_period, rsi_upper, rsi_lower))
     return strategies
 
 
-def add_buy_up_sell_down_trailing_strategies(report_types, symbols, template):
+def add_buy_up_sell_down_trailing_strategies(report_types, symbols, spec: PortfolioSpec):
     strategies: List[Strategy] = []
     if StrategyType.BUY_UP_SELL_DOWN_TRAILING in report_types:
         buy_ups = [
@@ -249,11 +249,11 @@ def add_buy_up_sell_down_trailing_strategies(report_types, symbols, template):
         for buy_up in buy_ups:
             for sell_down in sell_downs:
                 for symbol in symbols:
-                    strategies.append(BuyUpSellDownTrailing(symbol, copy.deepcopy(template), buy_up, sell_down))
+                    strategies.append(BuyUpSellDownTrailing(symbol, spec.create(), buy_up, sell_down))
     return strategies
 
 
-def add_buy_down_sell_up_trailing_strategies(report_types, symbols, template):
+def add_buy_down_sell_up_trailing_strategies(report_types, symbols, spec: PortfolioSpec):
     strategies: List[Strategy] = []
     if StrategyType.BUY_DOWN_SELL_UP_TRAILING in report_types:
         buy_downs = [
@@ -269,20 +269,20 @@ def add_buy_down_sell_up_trailing_strategies(report_types, symbols, template):
         for buy_down in buy_downs:
             for sell_up in sell_ups:
                 for symbol in symbols:
-                    strategies.append(BuyDownSellUpTrailing(symbol, copy.deepcopy(template), buy_down, sell_up))
+                    strategies.append(BuyDownSellUpTrailing(symbol, spec.create(), buy_down, sell_up))
     return strategies
 
 
-def add_soldiers_and_crows_strategies(report_types, symbols, template):
+def add_soldiers_and_crows_strategies(report_types, symbols, spec: PortfolioSpec):
     strategies: List[Strategy] = []
     if StrategyType.SOLDIERS_AND_CROWS in report_types:
         count = 3
         for symbol in symbols:
-            strategies.append(SoldiersAndCrows(symbol, copy.deepcopy(template), count))
+            strategies.append(SoldiersAndCrows(symbol, spec.create(), count))
     return strategies
 
 
-def add_multi_delta_swap_strategies(report_types, symbols, template):
+def add_multi_delta_swap_strategies(report_types, symbols, spec: PortfolioSpec):
     strategies: List[Strategy] = []
     if StrategyType.MULTI_DELTA_SWAP in report_types:
         deltas = [
@@ -291,11 +291,11 @@ def add_multi_delta_swap_strategies(report_types, symbols, template):
             # 1.025,
         ]
         for delta in deltas:
-            strategies.append(MultiDeltaSwap(symbols, copy.deepcopy(template), delta=delta))
+            strategies.append(MultiDeltaSwap(symbols, spec.create(), delta=delta))
     return strategies
 
 
-def add_multi_relative_sma_swap_up_strategies(report_types, symbols, template):
+def add_multi_relative_sma_swap_up_strategies(report_types, symbols, spec: PortfolioSpec):
     strategies: List[Strategy] = []
     if StrategyType.MULTI_RELATIVE_SMA_SWAP_UP in report_types:
         deltas = [
@@ -315,11 +315,11 @@ def add_multi_relative_sma_swap_up_strategies(report_types, symbols, template):
             for delta in deltas:
                 for look_back in look_backs:
                     strategies.append(
-                        MultiRelativeSmaSwapUp(symbols, copy.deepcopy(template), period, delta, look_back))
+                        MultiRelativeSmaSwapUp(symbols, spec.create(), period, delta, look_back))
     return strategies
 
 
-def add_multi_relative_sma_swap_dowm_strategies(report_types, symbols, template):
+def add_multi_relative_sma_swap_dowm_strategies(report_types, symbols, spec: PortfolioSpec):
     strategies: List[Strategy] = []
     if StrategyType.MULTI_RELATIVE_SMA_SWAP_DOWN in report_types:
         deltas = [
@@ -339,5 +339,5 @@ def add_multi_relative_sma_swap_dowm_strategies(report_types, symbols, template)
             for delta in deltas:
                 for look_back in look_backs:
                     strategies.append(
-                        MultiRelativeSmaSwapDown(symbols, copy.deepcopy(template), period, delta, look_back))
+                        MultiRelativeSmaSwapDown(symbols, spec.create(), period, delta, look_back))
     return strategies
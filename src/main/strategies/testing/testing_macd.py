@@ -24,15 +24,24 @@ this is just a testing strategy to prove the sma indicator is working
 '''
 
 from datetime import datetime
+from typing import Optional
+
+import pandas
 
 from main.application.single_symbol_strategy import SingleSymbolStrategy
 from main.application.value_type import ValueType
 from main.calculators.action_type import ActionType
 from main.calculators.macd import MACD
+from main.calculators.vectorized import calculate_macd
 from main.portfolio.order import MarketOrder, OrderSide
 from main.portfolio.portfolio import Portfolio
 
 
+def get_difference(differences: pandas.Series, current_time: datetime) -> Optional[float]:
+    difference = differences.get(current_time)
+    return None if difference is None or pandas.isna(difference) else difference
+
+
 class TestingMACD(SingleSymbolStrategy):
 
     def __init__(self, symbol: str, portfolio: Portfolio):
@@ -40,8 +49,18 @@ class TestingMACD(SingleSymbolStrategy):
         self.build_price_collection()
         self.macd_short = MACD(5, 10, 30)
         self.macd_long = MACD(10, 20, 30)
-        self.PRICE_LIST_LIMIT = 50
-        self.price_list_closes = []
+        self.short_differences = pandas.Series(dtype=float)
+        self.long_differences = pandas.Series(dtype=float)
+
+    def prepare(self) -> None:
+        closes: pandas.Series = self.collection.get_column(self.symbol, ValueType.CLOSE).dropna()
+        self.short_differences = self.calculate_differences(self.macd_short, closes)
+        self.long_differences = self.calculate_differences(self.macd_long, closes)
+
+    def calculate_differences(self, macd: MACD, closes: pandas.Series) -> pandas.Series:
+        columns = self.get_indicator(closes, 'macd', (macd.fast_length, macd.slow_length, macd.macd_length),
+                                     calculate_macd)
+        return columns[ValueType.MACD_HIST]
 
     def next_step(self, current_time: datetime) -> None:
         cash = self.portfolio.quantities[self.collection.get_base_symbol()]
@@ -53,12 +72,7 @@ class TestingMACD(SingleSymbolStrategy):
         
         '''
 
-        self.price_list_closes.insert(0, self.collection.get_value(self.symbol, current_time, ValueType.CLOSE))
-
-        if len(self.price_list_closes) > self.PRICE_LIST_LIMIT:
-            self.price_list_closes.pop()
-
-        action = self.decide()
+        action = self.decide(current_time)
         quantity: float = self.portfolio.quantities[self.symbol]
 
         if action == "sell" and quantity > 0.0:
@@ -69,13 +83,13 @@ class TestingMACD(SingleSymbolStrategy):
             order = MarketOrder(self.symbol, OrderSide.BUY, cash, current_time)
             self.portfolio.open_order(order)
 
-    def decide(self):
+    def decide(self, current_time: datetime):
 
-        # get short SMA
-        short_calc = self.macd_short.calc(self.price_list_closes)
+        # get short MACD
+        short_calc: Optional[float] = get_difference(self.short_differences, current_time)
 
-        # get long SMA
-        long_calc = self.macd_long.calc(self.price_list_closes)
+        # get long MACD
+        long_calc: Optional[float] = get_difference(self.long_differences, current_time)
 
         if short_calc is None or long_calc is None:
             return ActionType.NOT_ENOUGH_DATA
@@ -41,8 +41,6 @@ class TestingSUPERTREND(SingleSymbolStrategy):
         self.build_price_collection()
         self.supertrend_short = SUPERTREND(5)
         self.supertrend_long = SUPERTREND(10)
-        self.price_list_limit = 50
-        self.price_list_closes = []
 
     def next_step(self, current_time: datetime) -> None:
         cash = self.portfolio.quantities[self.collection.get_base_symbol()]
@@ -54,12 +52,7 @@ class TestingSUPERTREND(SingleSymbolStrategy):
         
         '''
 
-        self.price_list_closes.insert(0, self.collection.get_value(self.symbol, current_time, ValueType.CLOSE))
-
-        if len(self.price_list_closes) > self.price_list_limit:
-            self.price_list_closes.pop()
-
-        action = self.decide()
+        action = self.decide(self.collection.get_value(self.symbol, current_time, ValueType.CLOSE))
         quantity: float = self.portfolio.quantities[self.symbol]
 
         if action == "sell" and quantity > 0.0:
@@ -70,13 +63,13 @@ class TestingSUPERTREND(SingleSymbolStrategy):
             order = MarketOrder(self.symbol, OrderSide.BUY, cash, current_time)
             self.portfolio.open_order(order)
 
-    def decide(self):
+    def decide(self, close: float):
 
         # get short SMA
-        short_calc = self.supertrend_short.calc(self.price_list_closes)
+        short_calc = self.supertrend_short.update(close)
 
         # get long SMA
-        long_calc = self.supertrend_long.calc(self.price_list_closes)
+        long_calc = self.supertrend_long.update(close)
 
         if short_calc is None or long_calc is None:
             return ActionType.NOT_ENOUGH_DATA
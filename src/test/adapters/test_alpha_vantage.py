@@ -13,15 +13,16 @@
 #
 #  You should have received a copy of the GNU General Public License
 #  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
-from datetime import timedelta, datetime
+import tempfile
 from typing import Dict, List
 from unittest import TestCase
 
 from main.adapters.alpha_vantage import AlphaVantage, get_adjusted_ratio
-from main.application.adapter import request_limit_with_timedelta_delay, DataType
+from main.application.adapter import DataType
 from main.application.time_interval import TimeInterval
 from main.application.argument import Argument, ArgumentKey
 from main.application.value_type import ValueType
+from main.common.symbol_directory import SymbolDirectory
 
 
 class MockAlphaVantage(AlphaVantage):  # -> List(str), str
@@ -40,24 +41,15 @@ class MockAlphaVantage(AlphaVantage):  # -> List(str), str
 
 
 class TestAlphaVantage(TestCase):
-    def test_delay_requests(self):
-        # testing_utils.configure_test_logging()
-        start_time = datetime.now()
-        historic_requests = {
-            '/path1': start_time,
-            '/path2': start_time,
-            '/path3': start_time,
-            '/path4': start_time,
-            '/path5': start_time,
-        }
-        max_timeframe = timedelta(milliseconds=500)
-        request_limit_with_timedelta_delay(buffer=0.0, historic_requests=historic_requests,
-                                           max_timeframe=max_timeframe, max_requests=5)
-        request_limit_with_timedelta_delay(buffer=0.0, historic_requests=historic_requests,
-                                           max_timeframe=max_timeframe, max_requests=5)
-        end_time = datetime.now()
-        delta_time = end_time - start_time
-        self.assertLessEqual(max_timeframe, delta_time)
+    cache_dir: tempfile.TemporaryDirectory
+
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.TemporaryDirectory()
+        SymbolDirectory.get_instance().reset()
+
+    def tearDown(self) -> None:
+        SymbolDirectory.get_instance().reset()
+        self.cache_dir.cleanup()
 
     def test_get_adjusted_ratio(self):
         time_data: Dict[str, str] = {
@@ -74,6 +66,7 @@ class TestAlphaVantage(TestCase):
 
     def test_get_equities_list(self):
         adapter: AlphaVantage = MockAlphaVantage('TEST')
+        adapter.cache_root_dir = self.cache_dir.name
         equities: List[str] = adapter.get_equities_list()
         self.assertEqual(equities[0], 'testvalue')
 
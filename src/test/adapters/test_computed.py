@@ -0,0 +1,79 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+from datetime import datetime
+from unittest import TestCase
+
+import pandas
+
+from main.adapters.computed import ComputedAdapter
+from main.application.adapter import AssetType
+from main.application.argument import Argument, ArgumentKey
+from main.application.time_interval import TimeInterval
+from main.application.value_type import ValueType
+from main.calculators.vectorized import calculate_macd, calculate_rsi, calculate_sma
+from main.portfolio.portfolio import Portfolio
+from main.strategies.buy_and_hold import BuyAndHold
+from test.testing_utils import MockDataAdapter
+
+
+class TestComputedAdapter(TestCase):
+
+    def test_computes_from_price_adapter(self):
+        """
+        Checks that the indicator columns are calculated from the close prices of the price adapter.
+        :return:
+        """
+        adapter: ComputedAdapter = ComputedAdapter('SINE50', AssetType.STOCK, MockDataAdapter)
+        adapter.add_argument(Argument(ArgumentKey.INTERVAL, TimeInterval.DAY))
+        adapter.add_argument(Argument(ArgumentKey.END_TIME, datetime(2100, 1, 1)))
+        adapter.add_argument(Argument(ArgumentKey.SMA_PERIOD, 10.0))
+        adapter.add_argument(Argument(ArgumentKey.MACD_FAST, 12.0))
+        adapter.add_argument(Argument(ArgumentKey.MACD_SLOW, 26.0))
+        adapter.add_argument(Argument(ArgumentKey.MACD_SIGNAL, 9.0))
+        for value_type in [ValueType.SMA, ValueType.MACD, ValueType.MACD_HIST, ValueType.MACD_SIGNAL]:
+            adapter.add_value_type(value_type)
+        adapter.add_all_columns()
+        closes: pandas.Series = adapter.get_price_adapter().data[ValueType.CLOSE]
+        pandas.testing.assert_series_equal(adapter.data[ValueType.SMA], calculate_sma(closes, 10).dropna(),
+                                           check_names=False, check_freq=False)
+        expected: pandas.DataFrame = calculate_macd(closes, 12, 26, 9)
+        for value_type in [ValueType.MACD, ValueType.MACD_HIST, ValueType.MACD_SIGNAL]:
+            pandas.testing.assert_series_equal(adapter.data[value_type].dropna(), expected[value_type].dropna(),
+                                               check_names=False, check_freq=False)
+
+    def test_strategy_uses_price_adapter_class(self):
+        """
+        Checks that a computed adapter added through a strategy uses the adapter class of the close prices.
+        :return:
+        """
+        symbol = 'SINE50'
+        end_time: datetime = datetime(2022, 6, 1)
+        portfolio: Portfolio = Portfolio("Test", {'USD': 1000.0, symbol: 0.0}, end_time - TimeInterval.YEAR.timedelta,
+                                         end_time)
+        portfolio.interval = TimeInterval.DAY
+        portfolio.add_adapter_class(MockDataAdapter)
+        portfolio.add_adapter_class(ComputedAdapter, ValueType.RSI)
+        strategy: BuyAndHold = BuyAndHold(symbol, portfolio)
+        strategy.add_rsi_collection(symbol, 14.0)
+        strategy.run()
+        rsi: pandas.Series = strategy.collection.get_column(symbol, ValueType.RSI)
+        closes: pandas.Series = strategy.collection.get_column(symbol, ValueType.CLOSE)
+        pandas.testing.assert_series_equal(rsi, calculate_rsi(closes, 14).dropna(), check_names=False,
+                                           check_freq=False)
+        self.assertTrue(((rsi >= 0.0) & (rsi <= 100.0)).all())
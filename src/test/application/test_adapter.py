@@ -16,7 +16,9 @@
 #  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
 # ------------------------------------------------------------------------------
 
+import tempfile
 from datetime import datetime, timedelta
+from typing import Dict, List
 from unittest import TestCase
 
 import numpy
@@ -24,9 +26,13 @@ import pandas
 
 from main.application.adapter import Adapter, AssetType, get_common_start_time, get_common_end_time, \
     DuplicateRawIndexesException, find_closest_instance_after, find_closest_instance_before, insert_column, \
-    DataNotSortedException, get_default_cache_key_date, find_closest_before_else_after, \
-    get_column, get_key_for_api_request
+    insert_columns, DataNotSortedException, get_default_cache_key_date, find_closest_before_else_after, \
+    get_column, get_key_for_api_request, DataType
+from main.application.argument import Argument, ArgumentKey
+from main.application.converter import Converter
+from main.application.time_interval import TimeInterval
 from main.application.value_type import ValueType
+from main.common.symbol_directory import SymbolDirectory
 from test.testing_utils import get_test_adapter_data, MockDataAdapter
 
 
@@ -49,6 +55,51 @@ def get_average_runtime(function, args, run_count: int = 10) -> timedelta:
     return average_run_time
 
 
+class CountingAdapter(Adapter):
+    """
+    An adapter that "downloads" data through get_api_response and counts how often it has to request and translate it.
+    """
+    requests: int
+    translations: int
+
+    def __init__(self, symbol: str, cache_root_dir: str):
+        super().__init__(symbol, AssetType.STOCK)
+        self.cache_root_dir = cache_root_dir
+        self.cache_key_date = datetime(year=3000, month=1, day=1)
+        self.requests = 0
+        self.translations = 0
+        self.converters: List[Converter] = [
+            Converter(ValueType.CLOSE, self.get_prices_response, ['close']),
+            Converter(ValueType.OPEN, self.get_prices_response, ['open']),
+        ]
+
+    def get_prices(self, symbol: str) -> Dict[str, Dict[str, float]]:
+        self.requests += 1
+        return {'2100-01-0{}'.format(day): {'open': day + 0.5, 'close': day + 1.0} for day in range(1, 4)}
+
+    def get_prices_response(self, value_type: ValueType) -> None:
+        response_data, _ = self.get_api_response(self.get_prices, {'symbol': self.symbol}, data_type=DataType.JSON)
+        self.translations += 1
+        converter: Converter = self.get_converter(value_type)
+        indexes = [datetime.fromisoformat(entry_datetime) for entry_datetime in response_data.keys()]
+        values = [entry[converter.response_keys[0]] for entry in response_data.values()]
+        self.data = insert_columns(self.data, {value_type: (indexes, values)})
+
+
+class ListingAdapter(Adapter):
+    """
+    An adapter that "downloads" a symbol listing through get_url_response.
+    """
+
+    def __init__(self, symbol: str, cache_root_dir: str):
+        super().__init__(symbol, AssetType.STOCK)
+        self.cache_root_dir = cache_root_dir
+
+    def get_url_response(self, url: str, query, cache: bool = True, data_type: DataType = DataType.JSON,
+                         delay: bool = True):
+        return {'symbols': ['BBB', 'AAA']}, None
+
+
 class TestBaseAdapter(TestCase):
 
     def test_get_common_end_time_no_data(self):
@@ -176,6 +227,36 @@ class TestBaseAdapter(TestCase):
         self.assertEqual(adapter.data.loc[end_time, ValueType.CLOSE], close_values[end_time_index],
                          "Close value order was not as expected")
 
+    def test_insert_data_columns_duplicates_fail(self):
+        """
+        Check that if columns are inserted with duplicate indexes that the DuplicateRawIndexesException is thrown
+        :return:
+        """
+        adapter: Adapter = MockDataAdapter('TEST', AssetType.DIGITAL_CURRENCY)
+        common_time = datetime(year=3000, month=2, day=1)
+        columns = {ValueType.OPEN: ([common_time - timedelta(weeks=1)], [1.0]),
+                   ValueType.CLOSE: ([common_time, common_time], [1.0, 1.0])}
+        self.assertRaises(DuplicateRawIndexesException, insert_columns, adapter.data, columns)
+
+    def test_insert_data_columns(self):
+        """
+        Check that inserting columns in bulk gives the same data as inserting them one at a time
+        :return:
+        """
+        common_time = datetime(year=3000, month=2, day=1)
+        start_time = common_time - timedelta(weeks=1)
+        end_time = common_time + timedelta(weeks=1)
+        columns = {ValueType.OPEN: ([start_time, common_time], [1.0, 2.0]),
+                   ValueType.CLOSE: ([end_time, common_time], [4.0, 3.0]),
+                   ValueType.HIGH: ([common_time], [5.0])}
+        expected: pandas.DataFrame = pandas.DataFrame()
+        for column, (indexes, values) in columns.items():
+            insert_column(expected, column, indexes, values)
+        data: pandas.DataFrame = insert_columns(pandas.DataFrame(), {ValueType.OPEN: columns[ValueType.OPEN]})
+        data = insert_columns(data, {value_type: columns[value_type] for value_type in [ValueType.CLOSE,
+                                                                                         ValueType.HIGH]})
+        pandas.testing.assert_frame_equal(expected, data, check_freq=False)
+
     def test_find_closest_instance_after_raises(self):
         """
         Verify that the closest instance after throws an exception for unsorted data
@@ -343,11 +424,81 @@ class TestBaseAdapter(TestCase):
         expected_column: pandas.Series = data[ValueType.CLOSE]
         self.assertTrue(column.equals(expected_column))
 
+    def test_get_column_between(self):
+        data: pandas.DataFrame = get_test_adapter_data(increments=10)
+        adapter: Adapter = MockDataAdapter('TEST')
+        adapter.data = data
+        times = [data.index[0] - timedelta(days=1), data.index[3], data.index[3] + timedelta(days=1),
+                 data.index[-1], data.index[-1] + timedelta(days=1)]
+        for after in times:
+            self.assertTrue(adapter.get_column_on_or_after(after, ValueType.CLOSE).equals(
+                data[data.index >= after][ValueType.CLOSE]))
+            self.assertTrue(adapter.get_column_on_or_before(after, ValueType.CLOSE).equals(
+                data[data.index <= after][ValueType.CLOSE]))
+            for before in times:
+                expected = data[(data.index >= after) & (data.index <= before)][ValueType.CLOSE]
+                self.assertTrue(adapter.get_column_between(after, before, ValueType.CLOSE).equals(expected))
+        column: pandas.Series = adapter.get_column_between(data.index[2], data.index[5], ValueType.CLOSE)
+        self.assertTrue(numpy.shares_memory(column.to_numpy(), data[ValueType.CLOSE].to_numpy()), "Expected a view")
+        self.assertTrue(adapter.get_column_between(data.index[0], data.index[-1], ValueType.RSI).empty)
+
+    def test_get_column_last(self):
+        data: pandas.DataFrame = get_test_adapter_data(increments=10)
+        adapter: Adapter = MockDataAdapter('TEST')
+        adapter.data = data
+        self.assertEqual(list(adapter.get_column_last(data.index[5], 3, ValueType.CLOSE)), [4.0, 5.0, 6.0])
+        self.assertEqual(list(adapter.get_column_last(data.index[5] + timedelta(days=1), 2, ValueType.CLOSE)),
+                         [5.0, 6.0])
+        self.assertEqual(list(adapter.get_column_last(data.index[1], 5, ValueType.CLOSE)), [1.0, 2.0])
+        self.assertTrue(adapter.get_column_last(data.index[0] - timedelta(days=1), 5, ValueType.CLOSE).empty)
+        adapter.data = data.iloc[::-1]
+        with self.assertRaises(DataNotSortedException):
+            adapter.get_column_last(data.index[5], 3, ValueType.CLOSE)
+
     def test_get_key_for_api_request(self):
         args = {'key1': 'arg1', 'key2': datetime(year=3000, month=1, day=1), 'arg3': 3.0}
         key: str = get_key_for_api_request(self.test_get_key_for_api_request, args)
         self.assertEqual(key, 'TestBaseAdapter.test_get_key_for_api_request.arg1_3000-01-01_00_00_00_3_0')
 
+    def test_data_cache(self):
+        """
+        Checks that translated data is loaded from the data cache, without requesting nor translating it again, and
+        that it matches the data that was translated.
+        :return:
+        """
+        with tempfile.TemporaryDirectory() as cache_root_dir:
+            cold: CountingAdapter = CountingAdapter('TEST', cache_root_dir)
+            cold.add_argument(Argument(ArgumentKey.INTERVAL, TimeInterval.DAY))
+            cold.request_value_types = [ValueType.CLOSE, ValueType.OPEN]
+            cold.add_all_columns()
+            self.assertEqual((cold.requests, cold.translations), (1, 2))
+            warm: CountingAdapter = CountingAdapter('TEST', cache_root_dir)
+            warm.add_argument(Argument(ArgumentKey.INTERVAL, TimeInterval.DAY))
+            warm.request_value_types = [ValueType.CLOSE, ValueType.OPEN]
+            warm.add_all_columns()
+            self.assertEqual((warm.requests, warm.translations), (0, 0))
+            pandas.testing.assert_frame_equal(cold.data, warm.data, check_freq=False)
+            other: CountingAdapter = CountingAdapter('TEST', cache_root_dir)
+            other.add_argument(Argument(ArgumentKey.INTERVAL, TimeInterval.WEEK))
+            other.add_value_type(ValueType.CLOSE)
+            other.add_all_columns()
+            self.assertEqual(other.translations, 1, "Data cached for other arguments should not be used")
+
+    def test_get_symbol_listing_without_cache_key_date(self):
+        """
+        Checks that symbols can be listed on a freshly built adapter, i.e. before any data is added and the cache key
+        date is set.
+        :return:
+        """
+        SymbolDirectory.get_instance().reset()
+        with tempfile.TemporaryDirectory() as cache_root_dir:
+            adapter: ListingAdapter = ListingAdapter('TEST', cache_root_dir)
+            symbols = adapter.get_symbol_listing('https://test/listing', {'function': 'LISTING'},
+                                                 lambda data: data['symbols'])
+            self.assertEqual(symbols, frozenset(['AAA', 'BBB']))
+            self.assertIsNotNone(adapter.cache_key_date)
+        SymbolDirectory.get_instance().reset()
+
     # def test_write_url_response_to_file(self):
     #     configure_test_logging()
     #     locations = Locations()
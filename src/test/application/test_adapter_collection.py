@@ -17,14 +17,18 @@
 #
 #
 #
+from datetime import timedelta, datetime
 from unittest import TestCase
 
+import numpy
 import pandas
 
-from main.application.adapter_collection import AdapterCollection
+from main.application.adapter import Adapter, AssetType
+from main.application.adapter_collection import AdapterCollection, NotExactlyOneAdapterException
 from main.application.value_type import ValueType
+from main.calculators.indicator_cache import IndicatorCache
 from test.testing_utils import get_test_adapter_data, get_test_symbol, \
-    create_test_collection_with_data
+    create_test_collection_with_data, create_test_adapter, CountingAdapter, setup_counting_adapter
 
 
 class TestAdapterCollection(TestCase):
@@ -59,3 +63,141 @@ class TestAdapterCollection(TestCase):
         collection: AdapterCollection = create_test_collection_with_data(symbol, data)
         for index in data.index:
             self.assertEqual(collection.get_value(symbol, index, ValueType.CLOSE), data.loc[index, ValueType.CLOSE])
+
+    def test_get_adapter(self):
+        """
+        Checks that get_adapter finds the adapter for a symbol and value type and raises when not exactly one matches.
+        :return:
+        """
+        data: pandas.DataFrame = get_test_adapter_data()
+        symbol: str = get_test_symbol()
+        collection: AdapterCollection = create_test_collection_with_data(symbol, data)
+        self.assertIs(collection.get_adapter(symbol, ValueType.CLOSE), collection.adapters[0])
+        with self.assertRaises(NotExactlyOneAdapterException):
+            collection.get_adapter(symbol, ValueType.RSI)
+        with self.assertRaises(NotExactlyOneAdapterException):
+            collection.get_adapter('MISSING', ValueType.CLOSE)
+        collection.add(create_test_adapter(symbol, data, AssetType.DIGITAL_CURRENCY))
+        with self.assertRaises(NotExactlyOneAdapterException):
+            collection.get_adapter(symbol, ValueType.CLOSE)
+
+    def test_get_adapter_after_changes(self):
+        """
+        Checks that get_adapter sees adapters and value types that were added after a lookup was done.
+        :return:
+        """
+        data: pandas.DataFrame = get_test_adapter_data()
+        symbol: str = get_test_symbol()
+        collection: AdapterCollection = create_test_collection_with_data(symbol, data)
+        self.assertIs(collection.get_adapter(symbol, ValueType.CLOSE), collection.adapters[0])
+        other: Adapter = create_test_adapter('OTHER', data, AssetType.DIGITAL_CURRENCY)
+        collection.adapters.append(other)
+        self.assertIs(collection.get_adapter('OTHER', ValueType.CLOSE), other)
+        other.add_value_type(ValueType.RSI)
+        self.assertIs(collection.get_adapter('OTHER', ValueType.RSI), other)
+        other.request_value_types = [ValueType.OPEN]
+        self.assertIs(collection.get_adapter('OTHER', ValueType.OPEN), other)
+        with self.assertRaises(NotExactlyOneAdapterException):
+            collection.get_adapter('OTHER', ValueType.CLOSE)
+        other.symbol = 'RENAMED'
+        self.assertIs(collection.get_adapter('RENAMED', ValueType.OPEN), other)
+
+    def test_get_value_on_timeline(self):
+        """
+        Checks that values read through the timeline (by position) match values read by time, both for times on the
+        timeline and for times that are not.
+        :return:
+        """
+        data: pandas.DataFrame = get_test_adapter_data(increments=5)
+        symbol: str = get_test_symbol()
+        collection: AdapterCollection = create_test_collection_with_data(symbol, data)
+        before_start = data.index[0] - timedelta(days=1)
+        between = data.index[2] + timedelta(days=1)
+        collection.set_timeline([before_start] + list(data.index) + [between])
+        for index in data.index:
+            self.assertEqual(collection.get_value(symbol, index, ValueType.CLOSE), data.loc[index, ValueType.CLOSE])
+        for instance, expected in [(before_start, data.index[0]), (between, data.index[2]),
+                                   (data.index[-1] + timedelta(days=1), data.index[-1])]:
+            self.assertEqual(collection.get_value_closest_before_else_after(symbol, instance, ValueType.CLOSE),
+                             data.loc[expected, ValueType.CLOSE])
+        with self.assertRaises(KeyError):
+            collection.get_value(symbol, between, ValueType.CLOSE)
+
+    def test_timeline_positions_follow_data(self):
+        """
+        Checks that the positions resolved for the timeline are resolved again when the data of an adapter is replaced.
+        :return:
+        """
+        data: pandas.DataFrame = get_test_adapter_data(increments=5)
+        symbol: str = get_test_symbol()
+        collection: AdapterCollection = create_test_collection_with_data(symbol, data)
+        collection.set_timeline(list(data.index))
+        self.assertEqual(collection.get_value(symbol, data.index[-1], ValueType.CLOSE), 5.0)
+        collection.adapters[0].data = data.iloc[1:] * 2.0
+        self.assertEqual(collection.get_value(symbol, data.index[-1], ValueType.CLOSE), 10.0)
+        self.assertEqual(collection.get_value_closest_before_else_after(symbol, data.index[0], ValueType.CLOSE), 4.0)
+
+    def test_retrieve_all_data_concurrently(self):
+        """
+        Checks that retrieving the adapters in parallel gives the same data as retrieving them one after the other,
+        that identical adapters are only retrieved once and that the fetch time is kept for each adapter.
+        :return:
+        """
+        symbols = ['UP15', 'SINE50', 'STEP50', 'DOWN15']
+        end_time = datetime(2100, 1, 1)
+        serial: AdapterCollection = AdapterCollection()
+        concurrent: AdapterCollection = AdapterCollection()
+        for collection in [serial, concurrent]:
+            for symbol in symbols:
+                collection.add(setup_counting_adapter(symbol, end_time))
+        duplicate: CountingAdapter = setup_counting_adapter(symbols[0], end_time)
+        concurrent.add(duplicate)
+        serial.retrieve_all_data(max_workers=1)
+        concurrent.retrieve_all_data(max_workers=4)
+        for expected, actual in zip(serial.adapters, concurrent.adapters):
+            pandas.testing.assert_frame_equal(expected.data, actual.data)
+        self.assertEqual([adapter.retrievals for adapter in concurrent.adapters], [1, 1, 1, 1, 0])
+        pandas.testing.assert_frame_equal(concurrent.adapters[0].data, duplicate.data)
+        self.assertIsNot(concurrent.adapters[0].data, duplicate.data)
+        self.assertEqual(set(concurrent.fetch_times.keys()), set(concurrent.adapters))
+        self.assertEqual(concurrent.fetch_times[duplicate], 0.0)
+
+    def test_find_local_high_and_low(self):
+        """
+        Checks that the local high and low (found with range queries) match the max and min of the items between the
+        times, for every range of times, including ranges that start or end between (or outside of) the data times.
+        :return:
+        """
+        adapter: CountingAdapter = setup_counting_adapter('SINE50', datetime(2100, 1, 1))
+        adapter.request_value_types = [ValueType.HIGH, ValueType.LOW]
+        collection: AdapterCollection = AdapterCollection()
+        collection.add(adapter)
+        collection.retrieve_all_data()
+        times = list(adapter.data.index[::7]) + [adapter.data.index[0] - timedelta(days=3),
+                                                 adapter.data.index[10] + timedelta(hours=1),
+                                                 adapter.data.index[-1] + timedelta(days=3)]
+        for start_time in times:
+            for end_time in times:
+                expected_high = collection.get_all_items_between('SINE50', start_time, end_time, ValueType.HIGH).max()
+                expected_low = collection.get_all_items_between('SINE50', start_time, end_time, ValueType.LOW).min()
+                numpy.testing.assert_equal(collection.find_local_high('SINE50', end_time, start_time), expected_high)
+                numpy.testing.assert_equal(collection.find_local_low('SINE50', end_time, start_time), expected_low)
+
+    def test_range_tables_are_shared(self):
+        """
+        Checks that collections with the same data share the range query tables, through the IndicatorCache.
+        :return:
+        """
+        IndicatorCache.get_instance().reset()
+        tables = []
+        for _ in range(2):
+            adapter: CountingAdapter = setup_counting_adapter('SINE50', datetime(2100, 1, 1))
+            adapter.request_value_types = [ValueType.HIGH]
+            collection: AdapterCollection = AdapterCollection()
+            collection.add(adapter)
+            collection.retrieve_all_data()
+            collection.find_local_high('SINE50', adapter.data.index[-1], adapter.data.index[0])
+            tables.append(collection.get_range_table(adapter, ValueType.HIGH, numpy.fmax))
+        self.assertIs(tables[0], tables[1])
+        self.assertEqual(IndicatorCache.get_instance().misses, 1)
+        IndicatorCache.get_instance().reset()
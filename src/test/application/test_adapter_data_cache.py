@@ -0,0 +1,63 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+from datetime import datetime
+from unittest import TestCase
+
+import pandas
+
+from main.application.adapter_data_cache import AdapterDataCache, get_adapter_data_key
+from test.testing_utils import setup_counting_adapter, CountingAdapter
+
+
+class TestAdapterDataCache(TestCase):
+    def setUp(self):
+        self.cache: AdapterDataCache = AdapterDataCache.get_instance()
+        self.cache.reset()
+        self.cache.max_entries = 2
+        self.end_time = datetime(year=2100, month=2, day=1)
+
+    def tearDown(self):
+        self.cache.reset()
+        self.cache.max_entries = 0
+
+    def test_reuses_data(self):
+        first: CountingAdapter = setup_counting_adapter('SINE50', self.end_time)
+        second: CountingAdapter = setup_counting_adapter('SINE50', self.end_time)
+        self.assertEqual(get_adapter_data_key(first), get_adapter_data_key(second))
+        self.cache.retrieve(first)
+        self.cache.retrieve(second)
+        self.assertEqual((first.retrievals, second.retrievals), (1, 0))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(self.cache.get_hit_rate(), 0.5)
+        pandas.testing.assert_frame_equal(first.data, second.data)
+        self.assertIsNot(first.data, second.data)
+
+    def test_evicts_least_recently_used(self):
+        for symbol in ['SINE50', 'SINE15', 'UP15', 'SINE50']:
+            self.cache.retrieve(setup_counting_adapter(symbol, self.end_time))
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 4))
+        self.assertEqual(len(self.cache.entries), 2)
+
+    def test_disabled(self):
+        self.cache.max_entries = 0
+        for _ in range(2):
+            adapter: CountingAdapter = setup_counting_adapter('SINE50', self.end_time)
+            self.cache.retrieve(adapter)
+            self.assertEqual(adapter.retrievals, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 0))
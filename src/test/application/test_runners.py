@@ -16,7 +16,9 @@
 from datetime import datetime
 from unittest import TestCase
 
-from main.application.runner import get_current_copyright_year
+from main.application.runner import get_current_copyright_year, get_portfolio_class
+from main.portfolio.array_portfolio import ArrayPortfolio
+from main.portfolio.portfolio import Portfolio
 
 
 class TestRunners(TestCase):
@@ -27,3 +29,7 @@ class TestRunners(TestCase):
                          f"Current year is '{now.year}' and copyright year is '{copyright_year}'. When tests run, it is"
                          f" assumed that code will be changing and as such copyright notices should also be updated, "
                          f"but they currently are out-of-date.")
+
+    def test_get_portfolio_class(self):
+        self.assertIs(get_portfolio_class('Portfolio'), Portfolio)
+        self.assertIs(get_portfolio_class('ArrayPortfolio'), ArrayPortfolio)
@@ -0,0 +1,91 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import multiprocessing
+from datetime import datetime
+from unittest import TestCase
+
+import numpy
+import pandas
+
+from main.application.adapter_collection import share_adapter_data, AdapterCollection
+from main.application.shared_data import SharedDataStore, SharedData
+from main.application.value_type import ValueType
+from test.testing_utils import create_strategy, setup_counting_adapter
+
+
+def get_test_data() -> pandas.DataFrame:
+    index = pandas.date_range('2100-01-01', periods=5, freq='D', tz='America/New_York', name='time')
+    return pandas.DataFrame({ValueType.OPEN: [1.0, 2.0, numpy.nan, 4.0, 5.0],
+                             ValueType.CLOSE: [1.5, 2.5, 3.5, 4.5, 5.5]}, index=index)
+
+
+def sum_shared_closes(shared_data: SharedData) -> float:
+    return float(shared_data.attach()[ValueType.CLOSE].sum())
+
+
+class TestSharedData(TestCase):
+    def test_publish_and_attach(self):
+        data = get_test_data()
+        with SharedDataStore() as store:
+            shared_data = store.publish(data)
+            attached = shared_data.attach()
+            pandas.testing.assert_frame_equal(attached, data, check_freq=False)
+            self.assertTrue(numpy.shares_memory(attached[ValueType.CLOSE].to_numpy(), shared_data.get_arrays()[1]))
+            with self.assertRaises(ValueError):
+                attached.iloc[0, 0] = 0.0
+            del attached
+
+    def test_publish_unsupported(self):
+        with SharedDataStore() as store:
+            self.assertIsNone(store.publish(pandas.DataFrame()))
+            self.assertIsNone(store.publish(pandas.DataFrame({ValueType.CLOSE: [1, 2]},
+                                                             index=pandas.date_range('2100-01-01', periods=2))))
+            self.assertEqual(store.get_size(), 0)
+
+    def test_attach_in_worker(self):
+        with SharedDataStore() as store:
+            shared_data = store.publish(get_test_data())
+            with multiprocessing.Pool(1) as pool:
+                self.assertEqual(pool.apply(sum_shared_closes, (shared_data,)), 17.5)
+
+    def test_share_adapter_data(self):
+        expected = create_strategy().run().portfolio.calculate_cagr()
+        strategies = [create_strategy(), create_strategy()]
+        adapters = [adapter for strategy in strategies for adapter in strategy.collection.adapters]
+        with SharedDataStore() as store:
+            self.assertEqual(share_adapter_data(adapters, store), 1)
+            self.assertTrue(all([adapter.data.empty for adapter in adapters]))
+            self.assertIs(adapters[0].shared_data, adapters[-1].shared_data)
+            for strategy in strategies:
+                self.assertAlmostEqual(strategy.run().portfolio.calculate_cagr(), expected)
+            del strategies, adapters
+
+    def test_retrieve_identical_shared_adapters(self):
+        end_time = datetime(2100, 1, 1)
+        collection: AdapterCollection = AdapterCollection()
+        collection.add(setup_counting_adapter('UP15', end_time))
+        collection.add(setup_counting_adapter('UP15', end_time))
+        with SharedDataStore() as store:
+            share_adapter_data(collection.adapters, store)
+            collection.retrieve_all_data()
+            first, duplicate = collection.adapters
+            self.assertFalse(first.data.empty)
+            self.assertIs(first.data, duplicate.data)  # read-only, so it is shared instead of copied
+            self.assertIs(first.shared_data, duplicate.shared_data)
+            del first, duplicate, collection
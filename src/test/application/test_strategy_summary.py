@@ -0,0 +1,57 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import pickle
+from unittest import TestCase
+
+import numpy
+
+from main.application.strategy_summary import StrategySummary, run_and_summarize
+from main.application.value_type import ValueType
+from test.testing_utils import create_strategy
+
+
+class TestStrategySummary(TestCase):
+    def test_run_and_summarize(self):
+        strategy = create_strategy().run()
+        summary: StrategySummary = run_and_summarize(create_strategy().run)
+        portfolio = strategy.portfolio
+        self.assertEqual(summary.title, str(strategy))
+        self.assertEqual(summary.portfolio_title, portfolio.title)
+        self.assertTrue(summary.has_results())
+        self.assertAlmostEqual(summary.cagr, portfolio.calculate_cagr())
+        self.assertAlmostEqual(summary.roi, portfolio.calculate_roi())
+        numpy.testing.assert_array_equal(summary.times, portfolio.data.index.to_numpy())
+        numpy.testing.assert_array_almost_equal(summary.values, portfolio.data[ValueType.CLOSE.value].to_numpy())
+        self.assertEqual(len(summary.journal), len(portfolio.journal))
+        self.assertEqual(summary.get_start_time('SINE50'), strategy.collection.get_start_time('SINE50', ValueType.CLOSE))
+        self.assertIsNone(summary.get_end_time('UNKNOWN'))
+
+    def test_summary_is_smaller_than_strategy(self):
+        strategy = create_strategy().run()
+        summary = StrategySummary(strategy)
+        self.assertLess(len(pickle.dumps(summary)), len(pickle.dumps(strategy)))
+
+    def test_get_strategy(self):
+        summary: StrategySummary = pickle.loads(pickle.dumps(run_and_summarize(create_strategy().run)))
+        with self.assertRaises(RuntimeError):
+            summary.get_strategy()
+        summary.set_run(create_strategy().run, ())
+        strategy = summary.get_strategy()
+        self.assertIs(summary.get_strategy(), strategy)
+        self.assertAlmostEqual(strategy.portfolio.calculate_cagr(), summary.cagr)
@@ -0,0 +1,112 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+from datetime import datetime
+from unittest import TestCase
+
+import numpy
+import pandas
+
+from main.application.adapter import AssetType
+from main.application.argument import Argument, ArgumentKey
+from main.application.time_interval import TimeInterval
+from main.application.value_type import ValueType
+from main.calculators.candle_patterns import get_white_soldiers, get_black_crows, get_bounces_up, get_bounces_down
+from test.testing_utils import MockDataAdapter
+
+
+def get_test_candles(symbol: str) -> pandas.DataFrame:
+    adapter: MockDataAdapter = MockDataAdapter(symbol, AssetType.STOCK)
+    adapter.request_value_types = [ValueType.OPEN, ValueType.CLOSE]
+    adapter.add_argument(Argument(ArgumentKey.END_TIME, datetime(2100, 1, 1)))
+    adapter.add_argument(Argument(ArgumentKey.INTERVAL, TimeInterval.DAY))
+    adapter.add_all_columns()
+    return adapter.data
+
+
+def get_random_candles(count: int) -> pandas.DataFrame:
+    random = numpy.random.default_rng(5)
+    opens = numpy.round(random.uniform(95.0, 105.0, count))  # rounded so that some bars open and close the same
+    closes = numpy.round(opens + random.normal(0.0, 2.0, count))
+    closes[::17] = numpy.nan
+    return pandas.DataFrame({ValueType.OPEN: opens, ValueType.CLOSE: closes},
+                            index=pandas.date_range(datetime(2100, 1, 1), periods=count))
+
+
+def has_soldiers(opens: pandas.Series, closes: pandas.Series, count: int, position: int) -> bool:
+    """ the per bar check that SoldiersAndCrows.buy did before the patterns were found up front """
+    times = sorted([time for time in opens.index if time <= opens.index[position]])[-count:]
+    return len(times) == count and all([not (opens.loc[time] > closes.loc[time]) for time in times])
+
+
+def has_crows(opens: pandas.Series, closes: pandas.Series, count: int, position: int) -> bool:
+    """ the per bar check that SoldiersAndCrows.sell did before the patterns were found up front """
+    times = sorted([time for time in opens.index if time <= opens.index[position]])[-count:]
+    return len(times) == count and all([not (opens.loc[time] < closes.loc[time]) for time in times])
+
+
+def has_bounced_up(opens: pandas.Series, closes: pandas.Series, ratio: float, threshold: float, position: int) -> bool:
+    """ the per bar check that LastBounce.open_buy did before the patterns were found up front """
+    if position < 1:
+        return False
+    previous_open, previous_close = opens.iloc[position - 1], closes.iloc[position - 1]
+    current_open, current_close = opens.iloc[position], closes.iloc[position]
+    return previous_close < previous_open and current_close > current_open and \
+        current_close > (previous_close * (1 + threshold)) and \
+        abs(previous_close - previous_open) * ratio < abs(current_close - current_open)
+
+
+def has_bounced_down(opens: pandas.Series, closes: pandas.Series, ratio: float, threshold: float,
+                     position: int) -> bool:
+    """ the per bar check that LastBounce.open_sell did before the patterns were found up front """
+    if position < 1:
+        return False
+    previous_open, previous_close = opens.iloc[position - 1], closes.iloc[position - 1]
+    current_open, current_close = opens.iloc[position], closes.iloc[position]
+    return previous_close > previous_open and current_close < current_open and \
+        current_close < (previous_close * (1 - threshold)) and \
+        abs(previous_close - previous_open) * ratio < abs(current_close - current_open)
+
+
+class TestCandlePatterns(TestCase):
+
+    def get_all_candles(self):
+        return [get_test_candles(symbol) for symbol in ['SINE50', 'STEP50', 'UP15', 'DOWN15']] + \
+            [get_random_candles(200), get_random_candles(2), get_random_candles(0)]
+
+    def test_soldiers_and_crows_parity(self):
+        for candles in self.get_all_candles():
+            opens, closes = candles[ValueType.OPEN], candles[ValueType.CLOSE]
+            for count in [1, 2, 3, 5]:
+                soldiers = get_white_soldiers(opens.to_numpy(), closes.to_numpy(), count)
+                crows = get_black_crows(opens.to_numpy(), closes.to_numpy(), count)
+                self.assertEqual(list(soldiers), [has_soldiers(opens, closes, count, position)
+                                                  for position in range(len(opens))])
+                self.assertEqual(list(crows), [has_crows(opens, closes, count, position)
+                                               for position in range(len(opens))])
+
+    def test_bounces_parity(self):
+        for candles in self.get_all_candles():
+            opens, closes = candles[ValueType.OPEN], candles[ValueType.CLOSE]
+            for ratio, threshold in [(0.1, 0.0), (0.5, 0.001), (2.0, 0.01)]:
+                bounces_up = get_bounces_up(opens.to_numpy(), closes.to_numpy(), ratio, threshold)
+                bounces_down = get_bounces_down(opens.to_numpy(), closes.to_numpy(), ratio, threshold)
+                self.assertEqual(list(bounces_up), [has_bounced_up(opens, closes, ratio, threshold, position)
+                                                    for position in range(len(opens))])
+                self.assertEqual(list(bounces_down), [has_bounced_down(opens, closes, ratio, threshold, position)
+                                                      for position in range(len(opens))])
@@ -0,0 +1,69 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import math
+from typing import List, Optional
+from unittest import TestCase
+
+from main.application.calculator import IncrementalCalculator
+from main.calculators.atr import ATR
+from main.calculators.ema import EMA
+from main.calculators.lindev import LINDEV
+from main.calculators.sma import SMA
+from main.calculators.supertrend import SUPERTREND
+from main.calculators.wma import WMA
+
+
+def get_test_prices(count: int) -> List[float]:
+    return [100.0 + 25.0 * math.sin(position / 7.0) + (position % 5) * 1.5 for position in range(count)]
+
+
+class TestIncrementalCalculators(TestCase):
+    def assert_same_as_calc(self, create_calculator):
+        """
+        Checks that updating a calculator one price at a time gives the same results as calc over the list of prices
+        so far (newest first), including after a reset.
+        :param create_calculator: Callable that takes a length and returns the calculator
+        :return:
+        """
+        for length in [1, 2, 5, 10, 2.5]:
+            calculator: IncrementalCalculator = create_calculator(length)
+            for _ in range(2):
+                prices_list: List[float] = []
+                for price in get_test_prices(300):
+                    prices_list.insert(0, price)
+                    expected: Optional[float] = calculator.calc(prices_list)
+                    actual: Optional[float] = calculator.update(price)
+                    if expected is None:
+                        self.assertIsNone(actual)
+                    else:
+                        self.assertAlmostEqual(expected, actual, places=9)
+                calculator.reset()
+
+    def test_sma(self):
+        self.assert_same_as_calc(SMA)
+
+    def test_ema(self):
+        self.assert_same_as_calc(EMA)
+
+    def test_wma(self):
+        self.assert_same_as_calc(WMA)
+
+    def test_atr_lindev_supertrend(self):
+        for calculator_class in [ATR, LINDEV, SUPERTREND]:
+            self.assert_same_as_calc(calculator_class)
@@ -0,0 +1,91 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import os
+import tempfile
+from unittest import TestCase
+
+import pandas
+
+from main.application.time_interval import TimeInterval
+from main.calculators.indicator_cache import IndicatorCache
+from main.calculators.vectorized import calculate_sma
+
+
+class TestIndicatorCache(TestCase):
+
+    def setUp(self) -> None:
+        self.cache = IndicatorCache.get_instance()
+        self.cache.cache_dir = None
+        self.cache.reset()
+        self.calculated = 0
+
+    def tearDown(self) -> None:
+        self.cache.cache_dir = None
+        self.cache.reset()
+
+    def get_sma(self, closes: pandas.Series, length: int) -> pandas.Series:
+        def calculate():
+            self.calculated += 1
+            return calculate_sma(closes, length)
+        return self.cache.get('AAA', TimeInterval.DAY, closes, 'sma', (length,), calculate)
+
+    def test_shared_results(self):
+        closes = pandas.Series([float(value) for value in range(20)])
+        first = self.get_sma(closes, 5)
+        second = self.get_sma(closes.copy(), 5)
+        self.assertIs(first, second)
+        self.assertEqual(1, self.calculated)
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+        self.get_sma(closes, 6)
+        self.assertEqual(2, self.calculated)
+
+    def test_changed_data_is_a_miss(self):
+        closes = pandas.Series([float(value) for value in range(20)])
+        self.get_sma(closes, 5)
+        changed = closes.copy()
+        changed.iloc[-1] = 100.0
+        self.assertEqual(100.0 / 5 + sum(range(15, 19)) / 5, self.get_sma(changed, 5).iloc[-1])
+        self.assertEqual(2, self.calculated)
+        self.assertEqual(0, self.cache.hits)
+
+    def test_max_entries(self):
+        closes = pandas.Series([float(value) for value in range(20)])
+        self.cache.max_entries = 2
+        try:
+            self.get_sma(closes, 3)
+            self.get_sma(closes, 4)
+            self.get_sma(closes, 3)
+            self.get_sma(closes, 5)  # evicts the least recently used, length 4
+            self.assertEqual(2, len(self.cache.results))
+            self.get_sma(closes, 3)
+            self.get_sma(closes, 4)
+            self.assertEqual(4, self.calculated)
+        finally:
+            self.cache.max_entries = 256
+
+    def test_disk_cache(self):
+        closes = pandas.Series([float(value) for value in range(20)])
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.cache.cache_dir = cache_dir
+            expected = self.get_sma(closes, 5)
+            self.assertEqual(1, len([name for name in os.listdir(cache_dir) if name.endswith('.pickle')]))
+            self.cache.reset()  # e.g. another process
+            pandas.testing.assert_series_equal(expected, self.get_sma(closes, 5))
+            self.assertEqual(1, self.calculated)
+            self.assertEqual(1, self.cache.disk_hits)
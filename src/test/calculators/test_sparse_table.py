@@ -0,0 +1,44 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+from unittest import TestCase
+
+import numpy
+
+from main.calculators.sparse_table import SparseTable
+
+
+class TestSparseTable(TestCase):
+
+    def test_query(self):
+        values = numpy.array([5.0, 3.0, numpy.nan, 8.0, 1.0, 7.0, 2.0, 6.0, 4.0, 9.0, 0.0])
+        highs: SparseTable = SparseTable(values, numpy.fmax)
+        lows: SparseTable = SparseTable(values, numpy.fmin)
+        for start in range(len(values)):
+            for end in range(start, len(values)):
+                expected = values[start:end + 1]
+                expected = expected[~numpy.isnan(expected)]
+                numpy.testing.assert_equal(highs.query(start, end), expected.max() if len(expected) else numpy.nan)
+                numpy.testing.assert_equal(lows.query(start, end), expected.min() if len(expected) else numpy.nan)
+
+    def test_empty_ranges(self):
+        table: SparseTable = SparseTable(numpy.array([1.0, numpy.nan, 3.0]), numpy.fmax)
+        self.assertTrue(numpy.isnan(table.query(1, 1)))
+        self.assertTrue(numpy.isnan(table.query(2, 1)))
+        self.assertTrue(numpy.isnan(SparseTable(numpy.array([]), numpy.fmax).query(0, 0)))
+        self.assertEqual(table.query(-5, 10), 3.0)
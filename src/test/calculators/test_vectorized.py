@@ -0,0 +1,96 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import math
+from datetime import datetime
+from typing import List
+from unittest import TestCase
+
+import numpy
+import pandas
+
+from main.application.time_interval import TimeInterval
+from main.application.value_type import ValueType
+from main.calculators.hullwma import HULLWMA
+from main.calculators.macd import MACD
+from main.calculators.vectorized import calculate_ema, calculate_wma, calculate_hull, calculate_macd
+from main.calculators.wma import WMA
+from main.portfolio.portfolio import Portfolio
+from main.strategies.testing import testing_macd
+from test.testing_utils import MockDataAdapter
+
+
+def get_test_prices(count: int) -> pandas.Series:
+    return pandas.Series([100.0 + 25.0 * math.sin(position / 7.0) + (position % 5) * 1.5 for position in range(count)])
+
+
+def get_ema(values: List[float], length: int) -> List[float]:
+    alpha = 2 / (length + 1)
+    averages = [values[0]]
+    for value in values[1:]:
+        averages.append(alpha * value + (1 - alpha) * averages[-1])
+    return [numpy.nan] * (length - 1) + averages[length - 1:]
+
+
+class TestVectorized(TestCase):
+
+    def test_ema(self):
+        prices: pandas.Series = get_test_prices(100)
+        numpy.testing.assert_allclose(calculate_ema(prices, 12).to_numpy(), get_ema(list(prices), 12))
+
+    def test_wma(self):
+        prices: pandas.Series = get_test_prices(100)
+        for length in [1, 4, 9]:
+            expected = [numpy.nan] * (length - 1) + [WMA(length).calc(list(reversed(prices[:end])))
+                                                     for end in range(length, len(prices) + 1)]
+            numpy.testing.assert_allclose(calculate_wma(prices, length).to_numpy(), expected)
+        self.assertTrue(calculate_wma(prices[:3], 9).isna().all())
+
+    def test_hull(self):
+        prices: pandas.Series = get_test_prices(100)
+        length = 9
+        raw = [2 * WMA(4).calc(list(reversed(prices[:end]))) - WMA(length).calc(list(reversed(prices[:end])))
+               for end in range(length, len(prices) + 1)]
+        expected = [WMA(3).calc(list(reversed(raw[:end]))) for end in range(3, len(raw) + 1)]
+        hull: pandas.Series = calculate_hull(prices, length)
+        self.assertEqual(hull.isna().sum(), length + 3 - 2)
+        numpy.testing.assert_allclose(hull.dropna().to_numpy(), expected)
+        self.assertAlmostEqual(HULLWMA(length).calc(list(reversed(prices))), expected[-1])
+
+    def test_macd(self):
+        prices: pandas.Series = get_test_prices(200)
+        columns: pandas.DataFrame = calculate_macd(prices, 12, 26, 9)
+        macd = numpy.array(get_ema(list(prices), 12)) - numpy.array(get_ema(list(prices), 26))
+        signal = [numpy.nan] * 25 + get_ema(list(macd[25:]), 9)
+        numpy.testing.assert_allclose(columns[ValueType.MACD].to_numpy(), macd)
+        numpy.testing.assert_allclose(columns[ValueType.MACD_SIGNAL].to_numpy(), signal)
+        numpy.testing.assert_allclose(columns[ValueType.MACD_HIST].to_numpy(), macd - numpy.array(signal))
+        self.assertAlmostEqual(MACD(12, 26, 9).calc(list(reversed(prices))), macd[-1] - signal[-1])
+        self.assertIsNone(MACD(12, 26, 9).calc(list(reversed(prices[:30]))))
+
+    def test_testing_macd_runs(self):
+        symbol = 'SINE50'
+        end_time: datetime = datetime(2022, 6, 1)
+        portfolio: Portfolio = Portfolio("Test", {'USD': 1000.0, symbol: 0.0}, end_time - TimeInterval.YEAR.timedelta,
+                                         end_time)
+        portfolio.interval = TimeInterval.DAY
+        portfolio.add_adapter_class(MockDataAdapter)
+        strategy: testing_macd.TestingMACD = testing_macd.TestingMACD(symbol, portfolio)
+        strategy.run()
+        self.assertEqual(len(strategy.short_differences), len(strategy.collection.get_column(symbol, ValueType.CLOSE)))
+        self.assertFalse(strategy.short_differences.dropna().empty)
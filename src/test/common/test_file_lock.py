@@ -0,0 +1,89 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from unittest import TestCase, mock
+
+from main.common.file_lock import FileLock, LockMetrics, LockStatistics
+
+
+def acquire_and_exit(lock_file: str) -> None:
+    """
+    Acquire the lock and exit without releasing it, like a crashed process would.
+    :param lock_file: The lock file to acquire
+    :return:
+    """
+    FileLock(lock_file).acquire()
+    os._exit(0)
+
+
+class TestFileLock(TestCase):
+
+    def test_waits_for_holder(self):
+        """
+        Checks that a lock held by someone else is waited on until it is released, and that the wait is recorded.
+        :return:
+        """
+        with tempfile.TemporaryDirectory() as lock_dir:
+            lock_file = os.path.join(lock_dir, '.lock.test')
+            holder = FileLock(lock_file)
+            holder.acquire()
+            release = threading.Timer(0.2, holder.release)
+            release.start()
+            with FileLock(lock_file) as waiter:
+                self.assertIsNone(holder.fd)
+                self.assertIsNotNone(waiter.fd)
+            release.join()
+            statistics: LockStatistics = LockMetrics.get_instance().get_statistics(lock_file)
+            self.assertEqual(statistics.acquired, 2)
+            self.assertEqual(statistics.contended, 1)
+            self.assertGreater(statistics.max_wait, 0.1)
+
+    def test_lock_is_released_when_holder_exits(self):
+        """
+        Checks that a lock is not left stale when the process holding it exits without releasing it.
+        :return:
+        """
+        with tempfile.TemporaryDirectory() as lock_dir:
+            lock_file = os.path.join(lock_dir, '.lock.test')
+            process = multiprocessing.Process(target=acquire_and_exit, args=(lock_file,))
+            process.start()
+            process.join()
+            start = time.perf_counter()
+            with FileLock(lock_file):
+                self.assertLess(time.perf_counter() - start, 1.0)
+
+    def test_file_is_closed_when_acquire_fails(self):
+        """
+        Checks that the lock file is not left open when locking it raises (e.g. it is interrupted while waiting).
+        :return:
+        """
+        with tempfile.TemporaryDirectory() as lock_dir:
+            lock = FileLock(os.path.join(lock_dir, '.lock.test'))
+            with mock.patch('main.common.file_lock.os.close', wraps=os.close) as close, \
+                    mock.patch('main.common.file_lock.fcntl.flock', side_effect=OSError('Testing lock failures')):
+                with self.assertRaises(OSError):
+                    lock.acquire()
+            self.assertIsNone(lock.fd)
+            self.assertEqual(close.call_count, 1)
+            with self.assertRaises(OSError):
+                os.fstat(close.call_args[0][0])
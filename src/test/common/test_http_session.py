@@ -0,0 +1,102 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+from unittest import TestCase
+
+from main.common.http_session import SessionPool, SessionStatistics, PooledSession
+
+
+class ResponseHandler(BaseHTTPRequestHandler):
+    """
+    Keeps connections open (HTTP/1.1) and responds with the next of the queued statuses, or 200 once they run out.
+    """
+    protocol_version = 'HTTP/1.1'
+    statuses: List[int] = []
+
+    def do_GET(self):
+        status = self.statuses.pop(0) if self.statuses else 200
+        body = b'{"status": %d}' % status
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHttpSession(TestCase):
+
+    def setUp(self):
+        ResponseHandler.statuses = []
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), ResponseHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = 'http://127.0.0.1:{}/query'.format(self.server.server_address[1])
+        SessionPool.get_instance().reset()
+
+    def tearDown(self):
+        SessionPool.get_instance().reset()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connection_is_reused(self):
+        """
+        Checks that a session is shared by name and that requests after the first reuse the open connection.
+        :return:
+        """
+        session: PooledSession = SessionPool.get_instance().get_session('Test', backoff=0.0)
+        self.assertIs(SessionPool.get_instance().get_session('Test'), session)
+        for _ in range(3):
+            self.assertEqual(session.get(self.url).json(), {'status': 200})
+        statistics: SessionStatistics = SessionPool.get_instance().get_statistics('Test')
+        self.assertEqual(statistics.requests, 3)
+        self.assertEqual(statistics.connections, 1)
+        self.assertEqual(statistics.get_reused(), 2)
+
+    def test_retries_busy_and_failed_responses(self):
+        """
+        Checks that 429 and 5xx responses are retried and that the response after the retries is returned.
+        :return:
+        """
+        ResponseHandler.statuses = [429, 503]
+        session: PooledSession = SessionPool.get_instance().get_session('Test', retries=3, backoff=0.0)
+        self.assertEqual(session.get(self.url).json(), {'status': 200})
+        self.assertEqual(session.statistics.retries, 2)
+        ResponseHandler.statuses = [500, 500]
+        session = SessionPool.get_instance().get_session('Limited', retries=1, backoff=0.0)
+        self.assertEqual(session.get(self.url).status_code, 500)
+
+    def test_post_is_not_retried(self):
+        """
+        Checks that a failed POST (which may not be idempotent) is not sent again.
+        :return:
+        """
+        ResponseHandler.statuses = [503, 503]
+        session: PooledSession = SessionPool.get_instance().get_session('Test', retries=3, backoff=0.0)
+        self.assertEqual(session.post(self.url, json={'method': 'test'}).status_code, 503)
+        self.assertEqual(session.statistics.retries, 0)
+        self.assertEqual(ResponseHandler.statuses, [503])
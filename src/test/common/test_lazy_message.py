@@ -0,0 +1,43 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import logging
+from unittest import TestCase
+
+from main.common.lazy_message import LazyMessage
+
+
+class TestLazyMessage(TestCase):
+
+    def test_only_formatted_when_emitted(self):
+        formatted = []
+
+        def format_message() -> str:
+            formatted.append(True)
+            return 'expensive'
+
+        logger = logging.getLogger('test_lazy_message')
+        logger.propagate = False
+        logger.setLevel(logging.WARNING)
+        logger.info(LazyMessage(format_message))
+        self.assertEqual(len(formatted), 0)
+        logger.setLevel(logging.INFO)
+        with self.assertLogs(logger, logging.INFO) as logs:
+            logger.info(LazyMessage(format_message))
+        self.assertEqual(logs.output, ['INFO:test_lazy_message:expensive'])
+        self.assertEqual(len(formatted), 1)
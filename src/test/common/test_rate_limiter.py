@@ -0,0 +1,59 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import os
+import tempfile
+from datetime import timedelta
+from multiprocessing import Pool
+from unittest import TestCase
+
+from main.common.rate_limiter import RateLimiter
+
+
+def take_token(state_file: str) -> float:
+    """
+    Take a token from a rate limiter that allows 3 requests per half second.
+    :param state_file: The state file of the rate limiter
+    :return: The time waited for the token
+    """
+    return RateLimiter(state_file, 3, timedelta(seconds=0.5)).acquire()
+
+
+class TestRateLimiter(TestCase):
+
+    def test_limits_requests_in_timeframe(self):
+        """
+        Checks that the first max requests are not delayed, and that the next request waits for a token to be returned.
+        :return:
+        """
+        with tempfile.TemporaryDirectory() as state_dir:
+            limiter = RateLimiter(os.path.join(state_dir, '.rate_limit'), 3, timedelta(seconds=0.5))
+            self.assertEqual([limiter.try_acquire() for _ in range(3)], [0.0, 0.0, 0.0])
+            self.assertGreater(limiter.try_acquire(), 0.0)
+            self.assertGreater(limiter.acquire(), 0.3)
+
+    def test_shared_across_processes(self):
+        """
+        Checks that processes using the same state file share the bucket.
+        :return:
+        """
+        with tempfile.TemporaryDirectory() as state_dir:
+            state_file = os.path.join(state_dir, '.rate_limit')
+            with Pool(3) as pool:
+                waits = pool.map(take_token, [state_file] * 6)
+            self.assertEqual(len([wait for wait in waits if wait == 0.0]), 3)
@@ -0,0 +1,57 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import os
+import tempfile
+from typing import List
+from unittest import TestCase
+
+from main.common.symbol_directory import SymbolDirectory
+
+
+class TestSymbolDirectory(TestCase):
+
+    def setUp(self):
+        SymbolDirectory.get_instance().reset()
+
+    def tearDown(self):
+        SymbolDirectory.get_instance().reset()
+
+    def test_listing_is_loaded_once(self):
+        """
+        Checks that a listing is only loaded once in a process, and that once saved it is read from the symbols file
+        instead of being loaded again.
+        :return:
+        """
+        loads: List[int] = []
+
+        def get_symbols() -> List[str]:
+            loads.append(1)
+            return ['AAPL', 'MSFT', 'AAPL', 'SPY']
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            symbols_file = os.path.join(temp_dir, 'symbols.listing.txt')
+            symbols = SymbolDirectory.get_instance().get_symbols(symbols_file, get_symbols)
+            self.assertEqual(symbols, frozenset(['AAPL', 'MSFT', 'SPY']))
+            self.assertIs(SymbolDirectory.get_instance().get_symbols(symbols_file, get_symbols), symbols)
+            self.assertEqual(len(loads), 1)
+            SymbolDirectory.get_instance().reset()  # e.g. another process
+            self.assertEqual(SymbolDirectory.get_instance().get_symbols(symbols_file, get_symbols), symbols)
+            self.assertEqual(len(loads), 1)
+            other_file = os.path.join(temp_dir, 'symbols.other.txt')
+            self.assertNotIn('AAPL', SymbolDirectory.get_instance().get_symbols(other_file, lambda: ['BTC']))
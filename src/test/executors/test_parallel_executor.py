@@ -0,0 +1,193 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+from main.executors.job import JobState
+from main.executors.parallel_executor import ParallelExecutor, JobTimeoutException, UnknownParallelOptionException
+from main.executors.parallel_strategy_executor import ParallelStrategyExecutor, StrategyJob
+from main.portfolio.portfolio import Portfolio
+from main.strategies.buy_down_sell_up_trailing import BuyDownSellUpTrailing
+from test.testing_utils import create_portfolio, create_strategy
+
+
+def return_value(value):
+    return value
+
+
+def raise_error():
+    raise RuntimeError("Testing job exceptions")
+
+
+def sleep(seconds: float) -> bool:
+    time.sleep(seconds)
+    return True
+
+
+def sleep_catching_exceptions(seconds: float) -> bool:
+    try:
+        time.sleep(seconds)
+    except Exception:
+        pass
+    return True
+
+
+def run_after(seconds: float, strategy):
+    time.sleep(seconds)
+    return strategy.run()
+
+
+def get_process_id(seconds: float) -> int:
+    time.sleep(seconds)
+    return os.getpid()
+
+
+class ProcessIdExecutor(ParallelExecutor):
+    process_ids: set
+
+    def __init__(self, log_dir):
+        super().__init__(log_dir)
+        self.process_ids = set()
+
+    def process_result(self, job, returned) -> None:
+        self.process_ids.add(returned)
+        super().process_result(job, returned)
+
+
+def create_executor(executor_class: type = ParallelExecutor) -> ParallelExecutor:
+    executor = executor_class(os.path.join(tempfile.mkdtemp(), 'logs'))
+    executor.processes = 2
+    executor.streaming = True
+    return executor
+
+
+class TestParallelExecutor(TestCase):
+    def test_streaming_states(self):
+        executor = create_executor()
+        executor.add(return_value, (True,), 'passes')
+        executor.add(return_value, (False,), 'fails')
+        executor.add(raise_error, (), 'raises')
+        self.assertFalse(executor.start())
+        self.assertEqual([job.state for job in executor.jobs], [JobState.PASSED, JobState.FAILED, JobState.EXCEPTION])
+        self.assertIsInstance(executor.jobs[2].exception, RuntimeError)
+
+    def test_streaming_chunks_and_window(self):
+        executor = create_executor()
+        executor.chunk_size = 4
+        executor.max_in_flight = 6
+        for index in range(50):
+            executor.add(return_value, (index + 1,), 'job_{}'.format(index))
+        self.assertTrue(executor.start())
+        self.assertTrue(all([job.state == JobState.PASSED for job in executor.jobs]))
+
+    def test_job_timeout(self):
+        executor = create_executor()
+        executor.job_timeout_seconds = 0.5
+        executor.add(sleep, (0.0,), 'quick')
+        executor.add(sleep, (5.0,), 'slow')
+        start = time.perf_counter()
+        self.assertFalse(executor.start())
+        self.assertLess(time.perf_counter() - start, 5.0)
+        self.assertEqual([job.state for job in executor.jobs], [JobState.PASSED, JobState.TIMEOUT])
+        self.assertIsInstance(executor.jobs[1].exception, JobTimeoutException)
+
+    def test_job_timeout_is_not_caught_by_the_job(self):
+        executor = create_executor()
+        executor.job_timeout_seconds = 0.5
+        executor.add(sleep_catching_exceptions, (5.0,), 'slow')
+        start = time.perf_counter()
+        self.assertFalse(executor.start())
+        self.assertLess(time.perf_counter() - start, 5.0)
+        self.assertEqual(executor.jobs[0].state, JobState.TIMEOUT)
+
+    def test_not_streaming_uses_processes(self):
+        executor = create_executor(ProcessIdExecutor)
+        executor.streaming = False
+        executor.processes = 1
+        for index in range(3):
+            executor.add(get_process_id, (0.01,), 'job_{}'.format(index))
+        self.assertTrue(executor.start())
+        self.assertEqual(len(executor.process_ids), 1)
+
+    def test_max_tasks_per_child(self):
+        executor = create_executor(ProcessIdExecutor)
+        executor.processes = 1
+        executor.max_tasks_per_child = 1
+        for index in range(3):
+            executor.add(get_process_id, (0.01,), 'job_{}'.format(index))
+        self.assertTrue(executor.start())
+        self.assertEqual(len(executor.process_ids), 3)
+
+    def test_streaming_strategies(self):
+        executor = create_executor(ParallelStrategyExecutor)
+        executor.summarize = True
+        for index in range(3):
+            executor.add_strategy(create_strategy().run, (), 'SINE50', 'strategy_{}'.format(index))
+        self.assertTrue(executor.start())
+        self.assertEqual(len(executor.processed_strategies['SINE50']), 3)
+
+    def test_set_options(self):
+        executor = create_executor()
+        executor.set_options({'chunk_size': 4, 'job_timeout_seconds': 60.0})
+        self.assertEqual((executor.chunk_size, executor.job_timeout_seconds), (4, 60.0))
+        with self.assertRaises(UnknownParallelOptionException):
+            executor.set_options({'chunk': 4})
+
+    def test_streaming_strategies_keep_order(self):
+        executor = create_executor(ParallelStrategyExecutor)
+        for index, seconds in enumerate([1.0, 0.0, 0.0]):
+            strategy = BuyDownSellUpTrailing('SINE50', create_portfolio(Portfolio, 'SINE50'), 0.97 - index / 100, 1.02)
+            executor.add_job(StrategyJob(run_after, (seconds, strategy), 'SINE50', 'strategy_{}'.format(index)))
+        self.assertTrue(executor.start())
+        self.assertEqual([str(strategy) for strategy in executor.processed_strategies['SINE50']],
+                         [str(job.args[1]) for job in executor.jobs])
+
+    def test_get_chunks_with_affinity(self):
+        executor = create_executor(ParallelStrategyExecutor)
+        self.assertTrue(executor.affinity)
+        for index, group in enumerate(['A', 'B', 'A', 'A', 'A', 'B']):
+            executor.add_job(StrategyJob(return_value, (True,), group, 'job_{}'.format(index)))
+        executor.set_options({'affinity': False})
+        self.assertEqual(executor.get_chunks(), [[0], [1], [2], [3], [4], [5]])
+        executor.set_options({'affinity': True})
+        self.assertEqual(executor.get_chunks(), [[0, 2, 3], [4], [1, 5]])  # groups are split for 2 processes
+
+    def test_get_chunks_with_affinity_caps_the_size(self):
+        executor = create_executor(ParallelStrategyExecutor)
+        executor.max_chunk_size = 4
+        for index in range(20):
+            executor.add_job(StrategyJob(return_value, (True,), 'A', 'job_{}'.format(index)))
+        chunks = executor.get_chunks()
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 4, 4, 4, 4])
+        self.assertEqual([index for chunk in chunks for index in chunk], list(range(20)))
+        self.assertEqual(executor.get_max_in_flight(), 8)  # in chunks, a few for each of the 2 processes
+        executor.chunk_size = 5
+        self.assertEqual([len(chunk) for chunk in executor.get_chunks()], [5, 5, 5, 5])
+
+    def test_affinity_reuses_adapter_data(self):
+        executor = create_executor(ParallelStrategyExecutor)
+        executor.summarize = True
+        for symbol in ['SINE50', 'SINE15']:
+            for index in range(3):
+                strategy = BuyDownSellUpTrailing(symbol, create_portfolio(Portfolio, symbol), 0.97 - index / 100, 1.02)
+                executor.add_strategy(strategy.run, (), symbol, '{}_{}'.format(symbol, index))
+        self.assertTrue(executor.start())
+        self.assertEqual((executor.data_hits, executor.data_misses), (4, 2))
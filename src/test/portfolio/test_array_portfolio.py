@@ -0,0 +1,126 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+from main.application.adapter_collection import set_all_cache_key_dates
+from main.application.strategy import Strategy
+from main.portfolio.array_portfolio import ArrayPortfolio
+from main.portfolio.portfolio import Portfolio
+from main.strategies.buy_and_hold import BuyAndHold
+from main.strategies.buy_down_sell_up_trailing import BuyDownSellUpTrailing
+from main.strategies.buy_up_sell_down_trailing import BuyUpSellDownTrailing
+from main.strategies.last_bounce import LastBounce
+from main.strategies.soldiers_and_crows import SoldiersAndCrows
+from test.testing_utils import create_portfolio
+
+
+class TestArrayPortfolio(TestCase):
+    def assert_same_results(self, create_strategy):
+        """
+        Runs the strategy with a Portfolio and with an ArrayPortfolio and checks that the results are identical.
+        :param create_strategy: Callable that takes a portfolio and returns the strategy to run
+        :return:
+        """
+        expected: Strategy = create_strategy(Portfolio).run()
+        actual: Strategy = create_strategy(ArrayPortfolio).run()
+        self.assertEqual(list(expected.portfolio.data.index), list(actual.portfolio.data.index))
+        self.assertEqual(list(expected.portfolio.data.iloc[:, 0]), list(actual.portfolio.data.iloc[:, 0]))
+        self.assertEqual(expected.portfolio.quantities, actual.portfolio.quantities)
+        self.assertEqual([(order.close_time, order.price) for order in expected.portfolio.closed_orders],
+                         [(order.close_time, order.price) for order in actual.portfolio.closed_orders])
+        self.assertEqual(expected.portfolio.calculate_cagr(), actual.portfolio.calculate_cagr())
+
+    def test_buy_and_hold(self):
+        symbol = 'UP15'
+        self.assert_same_results(lambda cls: BuyAndHold(symbol, create_portfolio(cls, symbol)))
+
+    def test_buy_down_sell_up_trailing(self):
+        symbol = 'SINE50'
+        self.assert_same_results(lambda cls: BuyDownSellUpTrailing(symbol, create_portfolio(cls, symbol), 0.9, 1.1))
+
+    def test_buy_up_sell_down_trailing(self):
+        symbol = 'SINE15'
+        self.assert_same_results(lambda cls: BuyUpSellDownTrailing(symbol, create_portfolio(cls, symbol), 1.1, 0.9))
+
+    def test_last_bounce(self):
+        symbol = 'STEP50'
+        self.assert_same_results(lambda cls: LastBounce(symbol, create_portfolio(cls, symbol), 0.5, 0.01))
+
+    def test_soldiers_and_crows(self):
+        symbol = 'STEP50'
+        self.assert_same_results(lambda cls: SoldiersAndCrows(symbol, create_portfolio(cls, symbol), 2))
+
+    def test_data_is_materialized_once_run(self):
+        symbol = 'UP15'
+        portfolio: ArrayPortfolio = create_portfolio(ArrayPortfolio, symbol)
+        BuyAndHold(symbol, portfolio).run()
+        self.assertIs(portfolio.data, portfolio.data)
+        self.assertEqual(len(portfolio.data.index), len(portfolio.get_completed_times()))
+        self.assertEqual(list(portfolio.get_quantity_data().columns), ['USD', symbol])
+
+    def test_empty_run(self):
+        symbol = 'UP15'
+        portfolio: ArrayPortfolio = create_portfolio(ArrayPortfolio, symbol)
+        portfolio.start_time = portfolio.end_time + timedelta(days=1)  # no bars are in the range
+        strategy: Strategy = BuyAndHold(symbol, portfolio)
+        set_all_cache_key_dates(strategy.collection.adapters, datetime.now())
+        strategy.collection.retrieve_all_data()
+        portfolio.set_remaining_times(strategy.collection)
+        self.assertFalse(portfolio.has_remaining_times())
+        self.assertEqual(len(portfolio.get_completed_times()), 0)
+        self.assertIsNone(portfolio.get_last_completed_time())
+        self.assertTrue(portfolio.data.empty)
+        self.assertTrue(portfolio.get_quantity_data().empty)
+        self.assertEqual(portfolio.calculate_roi(), 0.0)
+        self.assertEqual(portfolio.calculate_cagr(), 0.0)
+        self.assertRaises(IndexError, portfolio.get_original_value)
+        self.assertRaises(IndexError, portfolio.get_latest_value)
+
+    def test_calculate_roi_between(self):
+        symbol = 'UP15'
+        expected: Portfolio = BuyAndHold(symbol, create_portfolio(Portfolio, symbol)).run().portfolio
+        actual: ArrayPortfolio = BuyAndHold(symbol, create_portfolio(ArrayPortfolio, symbol)).run().portfolio
+        times = actual.get_completed_times()
+        start_time: datetime = times[2]
+        end_time: datetime = times[-3]
+        roi: float = (actual.data.loc[end_time].iloc[0] / actual.data.loc[start_time].iloc[0]) - 1.0
+        self.assertNotEqual(roi, actual.calculate_roi())
+        self.assertAlmostEqual(actual.calculate_roi(start_time, end_time), roi)
+        # times between the bars only include the bars inside of them
+        self.assertAlmostEqual(actual.calculate_roi(start_time - timedelta(hours=1), end_time + timedelta(hours=1)),
+                               roi)
+        self.assertEqual(actual.calculate_roi(end_time + timedelta(hours=1), end_time + timedelta(hours=2)), 0.0)
+        self.assertEqual(expected.calculate_roi(start_time, end_time), actual.calculate_roi(start_time, end_time))
+        self.assertEqual(expected.calculate_cagr(start_time, end_time), actual.calculate_cagr(start_time, end_time))
+
+    def test_quantity_of_new_symbol(self):
+        symbol = 'UP15'
+        portfolio: ArrayPortfolio = create_portfolio(ArrayPortfolio, symbol)
+        strategy: Strategy = BuyAndHold(symbol, portfolio)
+        set_all_cache_key_dates(strategy.collection.adapters, datetime.now())
+        strategy.collection.retrieve_all_data()
+        portfolio.set_remaining_times(strategy.collection)
+        times = portfolio.get_remaining_times()
+        portfolio.run_to(strategy.collection, times[0])
+        portfolio.quantities['NEW'] = 2.0  # e.g. an order was filled for a symbol that wasn't held
+        portfolio.run_to(strategy.collection, times[1])
+        quantities = portfolio.get_quantity_data()
+        self.assertEqual(list(quantities.columns), ['USD', symbol, 'NEW'])
+        self.assertEqual(list(quantities['NEW']), [0.0, 2.0])
@@ -0,0 +1,65 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+import numpy
+import pandas
+
+from main.portfolio.completed_times import CompletedTimes
+
+
+class TestCompletedTimes(TestCase):
+
+    def test_append(self):
+        completed: CompletedTimes = CompletedTimes(capacity=2)
+        self.assertIsNone(completed.get(-1))
+        self.assertEqual(len(completed.get_index()), 0)
+        times = [datetime(2100, 1, 1) + timedelta(days=day) for day in range(10)]
+        for time in times:
+            completed.append(time)
+        self.assertEqual(list(completed.get_index()), times)
+        self.assertEqual(completed.get(0), times[0])
+        self.assertEqual(completed.get(-1), times[-1])
+        self.assertEqual(completed.get(-3), times[-3])
+        with self.assertRaises(IndexError):
+            completed.get(10)
+
+    def test_index_is_a_view(self):
+        completed: CompletedTimes = CompletedTimes()
+        for day in range(3):
+            completed.append(datetime(2100, 1, 1) + timedelta(days=day))
+        index: pandas.DatetimeIndex = completed.get_index()
+        self.assertTrue(numpy.shares_memory(index.asi8, completed.values))
+        completed.append(datetime(2100, 2, 1))
+        self.assertEqual(len(index), 3)
+
+    def test_out_of_order(self):
+        completed: CompletedTimes = CompletedTimes()
+        for day in [1, 3, 2, 3, 0]:
+            completed.append(datetime(2100, 1, 1) + timedelta(days=day))
+        self.assertEqual(list(completed.get_index()), [datetime(2100, 1, 1) + timedelta(days=day) for day in range(4)])
+
+    def test_time_zone(self):
+        completed: CompletedTimes = CompletedTimes()
+        time: pandas.Timestamp = pandas.Timestamp(datetime(2100, 1, 1, 9, 30), tz='US/Eastern')
+        completed.append(time)
+        self.assertEqual(completed.get(-1), time)
+        self.assertEqual(str(completed.get(-1).tz), 'US/Eastern')
+        self.assertEqual(completed.get_index()[0], time)
@@ -0,0 +1,78 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Tuple, List
+from unittest import TestCase
+
+from main.application.value_type import ValueType
+from main.portfolio.order import LimitOrder, StopOrder, MarketOrder, OrderSide, Order
+from main.portfolio.order_book import OrderBook
+
+
+class BarCollection:
+    """
+    Has the values of the bars for get_value, like an AdapterCollection.
+    """
+    values: Dict[Tuple[str, datetime, ValueType], float]
+
+    def __init__(self):
+        self.values = {}
+
+    def get_value(self, symbol: str, instance: datetime, value_type: ValueType) -> float:
+        return self.values[(symbol, instance, value_type)]
+
+
+class TestOrderBook(TestCase):
+
+    def test_satisfied_orders_match_asking_each_order(self):
+        generator = random.Random(3)
+        collection = BarCollection()
+        book: OrderBook = OrderBook()
+        opened: List[Order] = []
+        start = datetime(2100, 1, 1)
+        for bar in range(50):
+            instance = start + timedelta(days=bar)
+            for symbol in ['AAA', 'BBB']:
+                low = generator.uniform(90.0, 100.0)
+                high = low + generator.uniform(0.0, 10.0)
+                collection.values[(symbol, instance, ValueType.LOW)] = low
+                collection.values[(symbol, instance, ValueType.HIGH)] = high
+                collection.values[(symbol, instance, ValueType.OPEN)] = (low + high) / 2
+                for _ in range(5):
+                    order_class = generator.choice([LimitOrder, StopOrder])
+                    side = generator.choice([OrderSide.BUY, OrderSide.SELL])
+                    price = round(generator.uniform(85.0, 115.0), 1)  # rounded so that some prices are the same
+                    order = order_class(symbol, side, price, 1.0, instance)
+                    book.add(order)
+                    opened.append(order)
+            market_order = MarketOrder('AAA', OrderSide.BUY, 1.0, instance)
+            book.add(market_order)
+            opened.append(market_order)
+            expected = [order for order in book.get_open_orders() if order.is_satisfied(instance, collection)]
+            self.assertEqual(book.get_satisfied(instance, collection), expected)
+            for order in expected:
+                book.remove(order)
+            for order in generator.sample(book.get_open_orders(), min(3, len(book))):  # e.g. canceled
+                book.remove(order)
+            self.assertEqual(book.get_open_orders(), [order for order in opened if order in book.get_open_orders()])
+        self.assertEqual(book.get_symbol_orders('BBB'),
+                         [order for order in book.get_open_orders() if order.symbol == 'BBB'])
+        self.assertEqual(book.get_side_orders('AAA', OrderSide.SELL),
+                         [order for order in book.get_symbol_orders('AAA') if order.order_side == OrderSide.SELL])
@@ -21,8 +21,11 @@ import pandas
 
 from main.application.adapter_collection import AdapterCollection
 from main.application.value_type import ValueType
-from main.portfolio.portfolio import filter_list_times, get_current_value
-from test.testing_utils import get_test_adapter_data, create_test_collection_with_data, get_test_symbol, get_test_base_symbol
+from main.portfolio.portfolio import filter_list_times, get_current_value, Portfolio
+from main.portfolio.trade_journal import TradeEventType
+from main.strategies.buy_down_sell_up_trailing import BuyDownSellUpTrailing
+from test.testing_utils import get_test_adapter_data, create_test_collection_with_data, get_test_symbol, \
+    get_test_base_symbol, create_portfolio
 
 
 def get_test_data() -> List[datetime]:
@@ -66,3 +69,14 @@ class TestPortfolio(TestCase):
         current_value = get_current_value(instance, collection, quantities, value_type)
         expected_value = quantities[base] + (quantities[symbol] * data.loc[instance, value_type])
         self.assertEqual(current_value, expected_value)
+
+    def test_trade_journal(self):
+        strategy = BuyDownSellUpTrailing('SINE50', create_portfolio(Portfolio, 'SINE50'), 0.97, 1.02)
+        portfolio: Portfolio = strategy.run().portfolio
+        journal = portfolio.journal
+        self.assertEqual(len(journal), len(portfolio.opened_orders) + len(portfolio.canceled_orders) +
+                         len(portfolio.closed_orders))
+        closed = journal.get_events(TradeEventType.CLOSED)
+        self.assertEqual([(event.time, event.price) for event in closed],
+                         [(order.close_time, order.price) for order in portfolio.closed_orders])
+        self.assertEqual(len(journal.get_data().index), len(journal))
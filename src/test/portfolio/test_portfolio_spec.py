@@ -0,0 +1,88 @@
+# ------------------------------------------------------------------------------
+#  Copyright 2021-2022 eContriver LLC
+#  This file is part of Finance from eContriver.
+#  -
+#  Finance from eContriver is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  any later version.
+#  -
+#  Finance from eContriver is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  -
+#  You should have received a copy of the GNU General Public License
+#  along with Finance from eContriver.  If not, see <https://www.gnu.org/licenses/>.
+# ------------------------------------------------------------------------------
+
+import copy
+import time
+from datetime import datetime
+from unittest import TestCase
+
+from main.application.adapter import AssetType
+from main.application.time_interval import TimeInterval
+from main.application.value_type import ValueType
+from main.portfolio.array_portfolio import ArrayPortfolio
+from main.portfolio.portfolio import Portfolio
+from main.portfolio.portfolio_spec import PortfolioSpec
+from main.strategies.buy_and_hold import BuyAndHold
+from main.strategies.strategy_type import add_buy_and_hold_strategies, StrategyType
+from test.testing_utils import MockDataAdapter
+
+
+def create_spec() -> PortfolioSpec:
+    return PortfolioSpec.of('Test', {'USD': 1000.0, 'SINE50': 0.0}, datetime(2100, 1, 1), datetime(2101, 1, 1),
+                            TimeInterval.WEEK, 'USD', MockDataAdapter, {'SINE50': AssetType.STOCK})
+
+
+class TestPortfolioSpec(TestCase):
+    def test_create_matches_template(self):
+        template: Portfolio = Portfolio('Test', {'USD': 1000.0, 'SINE50': 0.0}, datetime(2100, 1, 1),
+                                        datetime(2101, 1, 1))
+        template.interval = TimeInterval.WEEK
+        template.add_adapter_class(MockDataAdapter)
+        template.asset_type_overrides = {'SINE50': AssetType.STOCK}
+        expected: Portfolio = copy.deepcopy(template)
+        portfolio: Portfolio = create_spec().create()
+        for name in ['title', 'quantities', 'start_time', 'end_time', 'interval', 'base_symbol', 'adapter_classes',
+                     'asset_type_overrides']:
+            self.assertEqual(getattr(portfolio, name), getattr(expected, name), name)
+
+    def test_portfolios_are_independent(self):
+        spec = create_spec()
+        first: Portfolio = spec.create()
+        second: Portfolio = spec.with_interval(TimeInterval.DAY).create(ArrayPortfolio)
+        first.quantities['USD'] = 0.0
+        first.asset_type_overrides['ETH'] = AssetType.DIGITAL_CURRENCY
+        self.assertIsInstance(second, ArrayPortfolio)
+        self.assertEqual(second.interval, TimeInterval.DAY)
+        self.assertEqual(second.quantities['USD'], 1000.0)
+        self.assertNotIn('ETH', second.asset_type_overrides)
+        self.assertEqual(spec.interval, TimeInterval.WEEK)
+        self.assertEqual(spec.create().get_adapter_class(ValueType.CLOSE), MockDataAdapter)
+        with self.assertRaises(AttributeError):
+            spec.interval = TimeInterval.DAY
+
+    def test_defaults(self):
+        portfolio: Portfolio = PortfolioSpec.of('Test', {'USD': 1000.0}).create()
+        self.assertEqual(portfolio.interval, TimeInterval.DAY)
+        self.assertEqual(portfolio.asset_type_overrides, Portfolio('Test', {}).asset_type_overrides)
+
+    def test_portfolio_class(self):
+        spec = create_spec()._replace(portfolio_class=ArrayPortfolio)
+        self.assertIsInstance(spec.create(), ArrayPortfolio)
+        self.assertIsInstance(spec.create(Portfolio), Portfolio)
+        strategies = add_buy_and_hold_strategies([StrategyType.BUY_AND_HOLD], ['SINE50'], spec)
+        self.assertIsInstance(strategies[0].portfolio, ArrayPortfolio)
+        expected = BuyAndHold('SINE50', create_spec().create()).run().portfolio
+        self.assertAlmostEqual(strategies[0].run().portfolio.calculate_cagr(), expected.calculate_cagr())
+
+    def test_large_grid(self):
+        symbols = ['SYMBOL{}'.format(index) for index in range(10000)]
+        start = time.perf_counter()
+        strategies = add_buy_and_hold_strategies([StrategyType.BUY_AND_HOLD], symbols, create_spec())
+        self.assertEqual(len(strategies), len(symbols))
+        self.assertIsInstance(strategies[0], BuyAndHold)
+        self.assertLess(time.perf_counter() - start, 10.0)
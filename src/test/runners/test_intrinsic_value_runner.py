@@ -19,7 +19,7 @@ from unittest import TestCase
 import pandas
 
 from main.application.adapter import Adapter, insert_column
-from main.application.adapter_collection import filter_adapters, AdapterCollection
+from main.application.adapter_collection import AdapterCollection
 from main.application.value_type import ValueType
 from main.runners.intrinsic_value_runner import predict_value_type_linear, predict_value_linear
 from test.testing_utils import get_test_adapter_data, get_test_symbol, \
@@ -54,8 +54,8 @@ class TestIntrinsicValueRunner(TestCase):
         data: pandas.DataFrame = get_test_adapter_data()
         symbol: str = get_test_symbol()
         collection: AdapterCollection = create_test_collection_with_data(symbol, data)
-        adapter: Adapter = filter_adapters(collection.adapters, 'TEST', ValueType.CLOSE)
-        adapter.request_value_types.append(ValueType.OPEN)
+        adapter: Adapter = collection.find_adapter('TEST', ValueType.CLOSE)
+        adapter.add_value_type(ValueType.OPEN)
         start_time: datetime = data.index[0]
         end_time: datetime = data.index[-1]
         insert_column(adapter.data, ValueType.OPEN, [start_time, end_time], [1.0, 2.0])
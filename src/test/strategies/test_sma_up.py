@@ -21,6 +21,7 @@ from unittest import TestCase
 
 from main.application.strategy import Strategy
 from main.application.time_interval import TimeInterval
+from main.calculators.indicator_cache import IndicatorCache
 from main.portfolio.portfolio import Portfolio
 from main.strategies.sma_up import SmaUp
 from test.testing_utils import MockDataAdapter
@@ -51,3 +52,20 @@ class TestSmaUpStrategy(TestCase):
         # visualizer.plot_all()
 
         # TODO: what to test now?
+
+    def test_sma_up_shares_averages(self):
+        """
+        Tests that SMA Up strategies on the same symbol share the averages that they have in common
+        :return:
+        """
+        symbol: str = 'SINE50'
+        end_time: datetime = datetime(2100, 1, 1)
+        start_time: datetime = end_time - (1 * TimeInterval.YEAR.timedelta)
+        IndicatorCache.get_instance().reset()
+        for long in [10, 20]:
+            portfolio: Portfolio = Portfolio("Test", {'USD': 1000.0, symbol: 0.0}, start_time, end_time)
+            portfolio.interval = TimeInterval.DAY
+            portfolio.add_adapter_class(MockDataAdapter)
+            SmaUp(symbol, portfolio, 4, long, 20).run()
+        self.assertEqual((IndicatorCache.get_instance().hits, IndicatorCache.get_instance().misses), (1, 3))
+        IndicatorCache.get_instance().reset()
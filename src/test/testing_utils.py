@@ -31,6 +31,8 @@ from main.application.converter import Converter
 from main.application.time_interval import TimeInterval
 from main.application.value_type import ValueType
 from main.common.locations import get_and_clean_timestamp_dir
+from main.portfolio.portfolio import Portfolio
+from main.strategies.buy_down_sell_up_trailing import BuyDownSellUpTrailing
 
 
 def configure_test_logging(log_level=logging.DEBUG):
@@ -272,6 +274,31 @@ class MockDataAdapter(Adapter):
     #     return self.get_series_response()
 
 
+class CountingAdapter(MockDataAdapter):
+    """
+    Counts the number of times that the data is retrieved.
+    """
+    retrievals: int
+
+    def __init__(self, symbol: str, asset_type: Optional[AssetType] = None):
+        super().__init__(symbol, asset_type)
+        self.retrievals = 0
+
+    def add_all_columns(self):
+        self.retrievals += 1
+        super().add_all_columns()
+
+
+def setup_counting_adapter(symbol: str, end_time: datetime) -> CountingAdapter:
+    adapter: CountingAdapter = CountingAdapter(symbol, AssetType.STOCK)
+    adapter.request_value_types = [ValueType.OPEN, ValueType.CLOSE]
+    adapter.add_argument(Argument(ArgumentKey.END_TIME, end_time))
+    adapter.add_argument(Argument(ArgumentKey.INTERVAL, TimeInterval.DAY))
+    adapter.cache_key_date = end_time
+    return adapter
+
+
+
 def setup_collection(symbols: List[str],
                      value_types=(ValueType.OPEN, ValueType.CLOSE, ValueType.HIGH, ValueType.LOW)):
     base_symbol: str = 'USD'
@@ -373,3 +400,27 @@ def create_test_collection() -> AdapterCollection:
     data: pandas.DataFrame = get_test_adapter_data()
     collection: AdapterCollection = create_test_collection_with_data(get_test_symbol(), data)
     return collection
+
+
+def create_portfolio(portfolio_class: type, symbol: str) -> Portfolio:
+    """
+    Create a portfolio of the given class that uses the mock data adapter.
+    :param portfolio_class: The Portfolio class (or subclass) to create
+    :param symbol: The symbol the portfolio will be trading
+    :return: The portfolio
+    """
+    end_time: datetime = datetime.now()
+    end_time = datetime(end_time.year, end_time.month, end_time.day)
+    start_time: datetime = end_time - (1 * TimeInterval.YEAR.timedelta)
+    portfolio: Portfolio = portfolio_class("Test", {'USD': 1000.0, symbol: 0.0}, start_time, end_time)
+    portfolio.interval = TimeInterval.DAY
+    portfolio.add_adapter_class(MockDataAdapter)
+    return portfolio
+
+
+def create_strategy() -> BuyDownSellUpTrailing:
+    """
+    Create a strategy that trades the mock data (with a Portfolio), so that it places orders when it is run.
+    :return: The strategy
+    """
+    return BuyDownSellUpTrailing('SINE50', create_portfolio(Portfolio, 'SINE50'), 0.97, 1.02)